@@ -7,12 +7,18 @@ import threading
 import time
 import sys
 import os
-import math
+import numpy as np
+
+# The maze engine (grid, generators) is shared with the escape maze v2 game
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'game', 'escape-maze-v2'))
+import maze_generators
+from maze_generators import ALGORITHMS, DEFAULT_ALGORITHM
+from maze_grid import WALL, MIN_MAZE_SIZE, MAX_MAZE_SIZE, fog_stencil
 
 class MazeGame:
     def __init__(self):
         # Game state
-        self.maze = []
+        self.maze = None  # MazeGrid once generated
         self.width = 0
         self.height = 0
         self.cell_size = 32  # Increased default cell size for zoomed view
@@ -22,6 +28,8 @@ class MazeGame:
         self.show_solution = False
         self.generating = False
         self.game_running = False
+        self.maze_seed = None  # Seed and algorithm of the current maze (regenerates the same layout)
+        self.maze_algorithm = DEFAULT_ALGORITHM
         
         # Camera system
         self.camera_x = 0
@@ -51,7 +59,7 @@ class MazeGame:
         self.UNEXPLORED_TILE_OPACITY = 15  # Nearly black for unexplored areas
         
         # Fog of war system
-        self.explored_map = None  # Stores exploration data as 2D array of opacity values
+        self.explored_map = None  # Stores exploration data as 2D uint8 array of opacity values (self.maze.explored)
         self.fog_surface = None  # Surface for rendering fog overlay
         self.visibility_surface = None  # Pre-rendered visibility gradient
         
@@ -173,9 +181,18 @@ class MazeGame:
         self.height_entry.bind('<FocusIn>', self.on_entry_focus_in)
         self.height_entry.bind('<FocusOut>', self.on_entry_focus_out)
         
-        tk.Label(settings_frame, text="(5-100, camera follows player)", 
+        tk.Label(settings_frame, text=f"({MIN_MAZE_SIZE}-{MAX_MAZE_SIZE}, camera follows player)", 
                 font=('Arial', 8), fg='#bdc3c7', bg='#34495e').pack(pady=2)
         
+        # Generation algorithm
+        tk.Label(settings_frame, text="Algorithm:", 
+                font=('Arial', 9), fg='#ecf0f1', bg='#34495e').pack()
+        
+        self.algorithm_var = tk.StringVar(value=DEFAULT_ALGORITHM)
+        algorithm_menu = tk.OptionMenu(settings_frame, self.algorithm_var, *ALGORITHMS)
+        algorithm_menu.config(font=('Arial', 9), width=12)
+        algorithm_menu.pack(pady=2)
+        
         # Instructions
         instructions = tk.Label(control_frame,
                                text="🎮 Controls:\nWASD or Arrow Keys\nL - Toggle Lighting\n\n🔴 Player (Camera Center)\n🟢 Goal\n🔵 Start\n🟡 Solution Path\n\n📍 Click minimap to expand\n🕯️ Dynamic lighting enabled\n🌫️ Fog of War minimap",
@@ -416,9 +433,7 @@ class MazeGame:
             col = int(px // self.cell_size)
             row = int(py // self.cell_size)
             
-            if (col < 0 or col >= self.width or 
-                row < 0 or row >= self.height or 
-                self.maze[row][col] == '#'):
+            if self.maze.is_wall(col, row):
                 return False
         return True
         
@@ -436,9 +451,12 @@ class MazeGame:
             start_row = max(0, int(self.camera_y // self.cell_size) - 1)
             end_row = min(self.height, int((self.camera_y + self.viewport_height) // self.cell_size) + 2)
             
+            # Pull the visible window out of the grid once instead of indexing cell by cell
+            visible_cells = self.maze.cells[start_row:end_row, start_col:end_col].tolist()
+            
             # Draw maze (only visible portion)
-            for row in range(start_row, end_row):
-                for col in range(start_col, end_col):
+            for row, row_cells in enumerate(visible_cells, start_row):
+                for col, cell in enumerate(row_cells, start_col):
                     # Calculate screen position
                     screen_x = col * self.cell_size - self.camera_x
                     screen_y = row * self.cell_size - self.camera_y
@@ -448,7 +466,7 @@ class MazeGame:
                         screen_y + self.cell_size < 0 or screen_y > self.viewport_height):
                         continue
                     
-                    if self.maze[row][col] == '#':
+                    if cell & WALL:
                         pygame.draw.rect(self.pygame_surface, (255, 255, 255),
                                        (screen_x, screen_y, self.cell_size, self.cell_size))
                     else:
@@ -509,8 +527,8 @@ class MazeGame:
             return
             
         # Initialize explored map - all areas start as unexplored (low opacity)
-        self.explored_map = [[self.UNEXPLORED_TILE_OPACITY for _ in range(self.width)] 
-                           for _ in range(self.height)]
+        self.maze.reset_explored(self.UNEXPLORED_TILE_OPACITY)
+        self.explored_map = self.maze.explored
         
         # Create fog surface for rendering
         # Size based on largest possible minimap
@@ -556,42 +574,17 @@ class MazeGame:
     
     def update_fog_of_war(self):
         """Update explored areas based on player position"""
-        if not self.maze or not self.explored_map:
+        if not self.maze or self.explored_map is None:
             return
             
         # Convert player position to grid coordinates
         player_grid_x = self.player_x // self.cell_size
         player_grid_y = self.player_y // self.cell_size
         
-        # Calculate visibility radius in grid cells
-        visibility_grid_radius = max(1, int(self.VISIBILITY_RADIUS_MINIMAP / max(self.cell_size, 1)))
-        
-        # Update exploration for areas within visibility radius
-        for dy in range(-visibility_grid_radius, visibility_grid_radius + 1):
-            for dx in range(-visibility_grid_radius, visibility_grid_radius + 1):
-                grid_x = player_grid_x + dx
-                grid_y = player_grid_y + dy
-                
-                # Check bounds
-                if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-                    # Calculate distance from player
-                    distance = math.sqrt(dx * dx + dy * dy) * max(self.cell_size, 1)
-                    
-                    if distance <= self.VISIBILITY_RADIUS_MINIMAP:
-                        # Currently visible area
-                        opacity = self.VISIBLE_TILE_OPACITY
-                    elif distance <= self.VISIBILITY_RADIUS_MINIMAP * self.FADE_SOFTNESS:
-                        # Fade zone - becomes explored
-                        fade_distance = distance - self.VISIBILITY_RADIUS_MINIMAP
-                        max_fade_distance = self.VISIBILITY_RADIUS_MINIMAP * (self.FADE_SOFTNESS - 1)
-                        fade_factor = 1.0 - (fade_distance / max_fade_distance)
-                        opacity = int(self.EXPLORED_TILE_OPACITY * fade_factor)
-                    else:
-                        # Keep current exploration level (don't reduce visibility)
-                        opacity = self.explored_map[grid_y][grid_x]
-                    
-                    # Update only if new opacity is higher (more visible)
-                    self.explored_map[grid_y][grid_x] = max(self.explored_map[grid_y][grid_x], opacity)
+        # Raise explored opacity under the precomputed stencil (never reduces visibility)
+        stencil = fog_stencil(self.VISIBILITY_RADIUS_MINIMAP, self.FADE_SOFTNESS, self.cell_size,
+                              self.VISIBLE_TILE_OPACITY, self.EXPLORED_TILE_OPACITY)
+        self.maze.reveal(player_grid_x, player_grid_y, stencil)
     
     def render_minimap(self):
         """Render minimap overlay with fog of war"""
@@ -603,6 +596,35 @@ class MazeGame:
         else:
             self.render_compact_minimap()
     
+    def build_minimap_image(self, step=1):
+        """Colour every step-th maze cell for the minimap in one vectorized pass (rows x cols x RGB)"""
+        cells = self.maze.cells[::step, ::step]
+        if self.explored_map is not None:
+            explored = self.explored_map[::step, ::step]
+        else:
+            explored = np.full(cells.shape, self.UNEXPLORED_TILE_OPACITY, dtype=np.uint8)
+        
+        # Base colours: explored wall or explored path
+        base = np.where((cells & WALL) != 0, 200, 60).astype(np.float32)
+        
+        # Dim by exploration opacity, unexplored tiles become fog
+        alpha_factor = explored.astype(np.float32) / self.VISIBLE_TILE_OPACITY
+        image = np.repeat((base * alpha_factor).astype(np.uint8)[..., None], 3, axis=2)
+        image[explored <= self.UNEXPLORED_TILE_OPACITY] = self.FOG_COLOR
+        return image
+    
+    def draw_minimap_cells(self, origin_x, origin_y, scale):
+        """Blit the minimap image scaled so each cell covers cell_size * scale pixels"""
+        target_size = (max(1, int(self.width * self.cell_size * scale)),
+                       max(1, int(self.height * self.cell_size * scale)))
+        
+        # Big mazes have more cells than minimap pixels - only colour the cells that can show up
+        step = max(1, min(self.width // target_size[0], self.height // target_size[1]))
+        image = self.build_minimap_image(step)
+        cell_surface = pygame.surfarray.make_surface(image.transpose(1, 0, 2))
+        self.pygame_surface.blit(pygame.transform.scale(cell_surface, target_size),
+                                 (origin_x, origin_y))
+    
     def render_compact_minimap(self):
         """Render small minimap in corner with fog of war"""
         # Minimap configuration
@@ -623,42 +645,12 @@ class MazeGame:
         scale = min(scale_x, scale_y)
         
         # Draw maze on minimap with fog of war
-        for row in range(self.height):
-            for col in range(self.width):
-                mini_x = minimap_x + 5 + col * self.cell_size * scale
-                mini_y = minimap_y + 5 + row * self.cell_size * scale
-                mini_size = max(1, int(self.cell_size * scale))
-                
-                # Get exploration opacity for this tile
-                if self.explored_map:
-                    tile_opacity = self.explored_map[row][col]
-                else:
-                    tile_opacity = self.UNEXPLORED_TILE_OPACITY
-                
-                # Draw based on exploration and maze structure
-                if tile_opacity <= self.UNEXPLORED_TILE_OPACITY:
-                    # Unexplored - draw fog
-                    color = self.FOG_COLOR
-                elif self.maze[row][col] == '#':
-                    # Explored wall
-                    base_color = 200
-                    alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                    color_value = int(base_color * alpha_factor)
-                    color = (color_value, color_value, color_value)
-                else:
-                    # Explored path
-                    base_color = 60
-                    alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                    color_value = int(base_color * alpha_factor)
-                    color = (color_value, color_value, color_value)
-                
-                pygame.draw.rect(self.pygame_surface, color,
-                               (mini_x, mini_y, mini_size, mini_size))
+        self.draw_minimap_cells(minimap_x + 5, minimap_y + 5, scale)
         
         # Draw player on minimap (only if explored)
         player_grid_x = self.player_x // self.cell_size
         player_grid_y = self.player_y // self.cell_size
-        if (self.explored_map and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
+        if (self.explored_map is not None and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
             self.explored_map[player_grid_y][player_grid_x] > self.UNEXPLORED_TILE_OPACITY):
             player_mini_x = minimap_x + 5 + (self.player_x * scale)
             player_mini_y = minimap_y + 5 + (self.player_y * scale)
@@ -675,14 +667,14 @@ class MazeGame:
                        (viewport_mini_x, viewport_mini_y, viewport_mini_w, viewport_mini_h), 1)
         
         # Draw goal and start on minimap (only if explored)
-        if (self.explored_map and self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
+        if (self.explored_map is not None and self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
             goal_mini_x = minimap_x + 5 + (1 * self.cell_size * scale)
             goal_mini_y = minimap_y + 5 + (1 * self.cell_size * scale)
             player_mini_size = max(2, int(self.cell_size * scale))
             pygame.draw.rect(self.pygame_surface, (0, 255, 0),
                            (goal_mini_x, goal_mini_y, player_mini_size, player_mini_size))
         
-        if (self.explored_map and self.height >= 2 and self.width >= 2 and 
+        if (self.explored_map is not None and self.height >= 2 and self.width >= 2 and 
             self.explored_map[self.height-2][self.width-2] > self.UNEXPLORED_TILE_OPACITY):
             start_mini_x = minimap_x + 5 + ((self.width - 2) * self.cell_size * scale)
             start_mini_y = minimap_y + 5 + ((self.height - 2) * self.cell_size * scale)
@@ -716,42 +708,12 @@ class MazeGame:
         scale = min(scale_x, scale_y)
         
         # Draw maze on expanded minimap with fog of war
-        for row in range(self.height):
-            for col in range(self.width):
-                mini_x = expanded_x + 10 + col * self.cell_size * scale
-                mini_y = expanded_y + 10 + row * self.cell_size * scale
-                mini_size = max(1, int(self.cell_size * scale))
-                
-                # Get exploration opacity for this tile
-                if self.explored_map:
-                    tile_opacity = self.explored_map[row][col]
-                else:
-                    tile_opacity = self.UNEXPLORED_TILE_OPACITY
-                
-                # Draw based on exploration and maze structure
-                if tile_opacity <= self.UNEXPLORED_TILE_OPACITY:
-                    # Unexplored - draw fog
-                    color = self.FOG_COLOR
-                elif self.maze[row][col] == '#':
-                    # Explored wall
-                    base_color = 200
-                    alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                    color_value = int(base_color * alpha_factor)
-                    color = (color_value, color_value, color_value)
-                else:
-                    # Explored path
-                    base_color = 60
-                    alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                    color_value = int(base_color * alpha_factor)
-                    color = (color_value, color_value, color_value)
-                
-                pygame.draw.rect(self.pygame_surface, color,
-                               (mini_x, mini_y, mini_size, mini_size))
+        self.draw_minimap_cells(expanded_x + 10, expanded_y + 10, scale)
         
         # Draw solution path if visible and explored
         if self.show_solution and self.solution_path:
             for col, row in self.solution_path:
-                if (self.explored_map and 0 <= row < self.height and 0 <= col < self.width and
+                if (self.explored_map is not None and 0 <= row < self.height and 0 <= col < self.width and
                     self.explored_map[row][col] > self.UNEXPLORED_TILE_OPACITY):
                     mini_x = expanded_x + 10 + col * self.cell_size * scale
                     mini_y = expanded_y + 10 + row * self.cell_size * scale
@@ -762,7 +724,7 @@ class MazeGame:
         # Draw player on expanded minimap (only if explored)
         player_grid_x = self.player_x // self.cell_size
         player_grid_y = self.player_y // self.cell_size
-        if (self.explored_map and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
+        if (self.explored_map is not None and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
             self.explored_map[player_grid_y][player_grid_x] > self.UNEXPLORED_TILE_OPACITY):
             player_mini_x = expanded_x + 10 + (self.player_x * scale)
             player_mini_y = expanded_y + 10 + (self.player_y * scale)
@@ -779,14 +741,14 @@ class MazeGame:
                        (viewport_mini_x, viewport_mini_y, viewport_mini_w, viewport_mini_h), 2)
         
         # Draw goal and start on expanded minimap (only if explored)
-        if (self.explored_map and self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
+        if (self.explored_map is not None and self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
             goal_mini_x = expanded_x + 10 + (1 * self.cell_size * scale)
             goal_mini_y = expanded_y + 10 + (1 * self.cell_size * scale)
             player_mini_size = max(3, int(self.cell_size * scale))
             pygame.draw.rect(self.pygame_surface, (0, 255, 0),
                            (goal_mini_x, goal_mini_y, player_mini_size, player_mini_size))
         
-        if (self.explored_map and self.height >= 2 and self.width >= 2 and 
+        if (self.explored_map is not None and self.height >= 2 and self.width >= 2 and 
             self.explored_map[self.height-2][self.width-2] > self.UNEXPLORED_TILE_OPACITY):
             start_mini_x = expanded_x + 10 + ((self.width - 2) * self.cell_size * scale)
             start_mini_y = expanded_y + 10 + ((self.height - 2) * self.cell_size * scale)
@@ -929,8 +891,9 @@ class MazeGame:
         try:
             width = int(self.width_var.get())
             height = int(self.height_var.get())
-            if width < 5 or width > 100 or height < 5 or height > 100:
-                self.status_label.config(text="Error: Size must be\nbetween 5 and 100")
+            if (width < MIN_MAZE_SIZE or width > MAX_MAZE_SIZE or
+                height < MIN_MAZE_SIZE or height > MAX_MAZE_SIZE):
+                self.status_label.config(text=f"Error: Size must be\nbetween {MIN_MAZE_SIZE} and {MAX_MAZE_SIZE}")
                 return
         except ValueError:
             self.status_label.config(text="Error: Please enter\nvalid numbers")
@@ -943,11 +906,12 @@ class MazeGame:
         self.status_label.config(text="Generating maze...")
         
         # Start generation thread
-        thread = threading.Thread(target=self.generate_maze, args=(width, height), daemon=True)
+        thread = threading.Thread(target=self.generate_maze,
+                                  args=(width, height, self.algorithm_var.get()), daemon=True)
         thread.start()
         
-    def generate_maze(self, w, h):
-        """Generate maze using Prim's algorithm"""
+    def generate_maze(self, w, h, algorithm=DEFAULT_ALGORITHM):
+        """Generate maze with the selected algorithm (see maze_generators)"""
         try:
             self.width, self.height = w, h
             if self.width % 2 == 0: self.width += 1
@@ -964,36 +928,13 @@ class MazeGame:
             
             self.cell_size = max(min_cell_size, min(max_cell_size, min(optimal_width_cell, optimal_height_cell)))
             
-            # Initialize maze
-            self.maze = [['#' for _ in range(self.width)] for _ in range(self.height)]
-            
-            # Prim's algorithm
-            start_x = random.randint(1, self.width // 2) * 2 - 1
-            start_y = random.randint(1, self.height // 2) * 2 - 1
-            self.maze[start_y][start_x] = ' '
-            walls = [(start_x, start_y)]
-            directions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
-            
-            while walls:
-                x, y = random.choice(walls)
-                walls.remove((x, y))
-                random.shuffle(directions)
-                for dx, dy in directions:
-                    nx, ny = x + dx, y + dy
-                    if (0 <= nx < self.width and 0 <= ny < self.height and 
-                        self.maze[ny][nx] == '#'):
-                        self.maze[(y + ny) // 2][(x + nx) // 2] = ' '
-                        self.maze[ny][nx] = ' '
-                        walls.append((nx, ny))
-                        
-                # Update status periodically
-                if len(walls) % 10 == 0:
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"Generating maze...\n{len(walls)} walls remaining"))
-            
-            # Ensure start and end are open
-            self.maze[self.height-2][self.width-2] = ' '  # Start (bottom-right)
-            self.maze[1][1] = ' '  # Goal (top-left)
+            # Generate off to the side so the render loop never sees a half-carved grid
+            self.maze_seed = random.randrange(2 ** 32)
+            self.maze_algorithm = algorithm
+            maze = maze_generators.generate_maze(self.width, self.height, algorithm, self.maze_seed,
+                                                 progress=self.report_generation_progress)
+            self.maze = maze
+            self.explored_map = maze.explored
             
             # Set player position at start
             self.player_x = (self.width - 2) * self.cell_size
@@ -1009,6 +950,12 @@ class MazeGame:
             print(f"Maze generation error: {e}")
             self.root.after(0, lambda: self.status_label.config(text=f"Error: {e}"))
             
+    def report_generation_progress(self, done, total):
+        """Progress callback from the generator thread (called about 100 times per maze)"""
+        percent = 100 * done // max(total, 1)
+        self.root.after(0, lambda: self.status_label.config(
+            text=f"Generating maze ({self.maze_algorithm})...\n{percent}% carved"))
+        
     def maze_generated(self):
         """Called when maze generation is complete"""
         self.generating = False
@@ -1047,6 +994,7 @@ class MazeGame:
         g_cost = {start: 0}
         parents = {start: None}
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        open_cells = self.maze.open_mask().tolist()
         
         while queue:
             _, current = heapq.heappop(queue)
@@ -1059,7 +1007,7 @@ class MazeGame:
                 nx, ny = neighbor
                 
                 if (0 <= nx < self.width and 0 <= ny < self.height and 
-                    self.maze[ny][nx] == ' '):
+                    open_cells[ny][nx]):
                     new_g = g_cost[current] + 1
                     
                     if neighbor not in g_cost or new_g < g_cost[neighbor]:
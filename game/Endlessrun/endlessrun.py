@@ -1,5 +1,21 @@
+import argparse
+import os
+import sys
+import numpy as np
 import pygame
 import random
+from entities import EntityStore, resolve_bullet_hits
+
+# The sound synth is shared with the Snake game
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Snake'))
+import synth
+from game_loop import FixedStepLoop
+
+parser = argparse.ArgumentParser(description="Endless Runner with Shooting")
+parser.add_argument("--bullet-hell", action="store_true",
+                    help="swarms of small obstacles and auto-fire (thousands of entities)")
+args = parser.parse_args()
+BULLET_HELL = args.bullet_hell
 
 # Initialize Pygame
 pygame.init()
@@ -18,12 +34,15 @@ GREEN = (0, 255, 0)
 
 # Clock for FPS
 clock = pygame.time.Clock()
+FPS = 60  # Drawing rate
+STEP_MS = 1000 / 30  # Simulation step; the speeds below are per step (the game was tuned at 30 FPS)
 
 # Player settings
 player_size = 50
 player_x = 100
 player_y = HEIGHT - player_size
 player_velocity_y = 0
+player_prev_y = player_y  # For drawing between simulation steps
 gravity = 1
 jump_height = -15
 
@@ -31,13 +50,28 @@ jump_height = -15
 obstacle_width = 50
 obstacle_height = 50
 obstacle_velocity = 5
-obstacle_list = []
+obstacle_interval = 60  # A new obstacle once more steps than this have passed
 
 # Bullet settings
 bullet_width = 10
 bullet_height = 5
 bullet_velocity = 10
-bullet_list = []
+
+# Bullet hell: every step a swarm of small obstacles comes in at random
+# heights and the player fires a spread; running into obstacles costs health
+if BULLET_HELL:
+    obstacle_width = obstacle_height = 12
+    obstacle_interval = 0
+swarm_size = 25  # Obstacles per step
+swarm_speed = (3, 9)
+spread_size = 9  # Bullets per auto-fire volley
+spread_vy = 3  # Vertical speed of the outermost bullets
+player_health = 100
+rng = np.random.default_rng()
+
+# Obstacles and bullets (struct-of-arrays stores, see entities.py)
+obstacles = EntityStore(obstacle_width, obstacle_height)
+bullets = EntityStore(bullet_width, bullet_height)
 
 # Score
 score = 0
@@ -46,62 +80,103 @@ font = pygame.font.Font(None, 36)
 # Pause flag
 paused = False
 
-def create_obstacle():
-    obstacle_x = WIDTH
-    obstacle_y = HEIGHT - obstacle_height
-    obstacle_hp = random.randint(1, 5)  # Assign random HP between 1 and 5
-    return [obstacle_x, obstacle_y, obstacle_hp]
-
-def move_obstacles(obstacles):
-    for obstacle in obstacles:
-        obstacle[0] -= obstacle_velocity
-    return [obs for obs in obstacles if obs[0] > -obstacle_width]  # Remove if off-screen
-
-def move_bullets(bullets):
-    for bullet in bullets:
-        bullet[0] += bullet_velocity
-    return [bul for bul in bullets if bul[0] < WIDTH]  # Remove if off-screen
-
-def check_collision(player_rect, obstacles):
-    for obstacle in obstacles:
-        obstacle_rect = pygame.Rect(obstacle[0], obstacle[1], obstacle_width, obstacle_height)
-        if player_rect.colliderect(obstacle_rect):
-            return True
-    return False
-
-def check_bullet_collision(bullets, obstacles):
+# Sound effects (rendered once, then loaded from the synth cache)
+RUNNER_SOUNDS = {
+    "jump": [synth.note(400, 0.12, wave="square", volume=0.06, slide_to=800)],
+    "shoot": [synth.note(1200, 0.06, wave="saw", volume=0.05, slide_to=600)],
+    "hit": [synth.note(220, 0.05, wave="noise", volume=0.08)],
+    "destroy": [synth.note(180, 0.2, wave="noise", volume=0.1, release=0.12)],
+    "game_over": [synth.note(392, 0.15), synth.note(330, 0.15), synth.note(262, 0.4, release=0.2)],
+}
+try:
+    sounds = synth.SoundBank(RUNNER_SOUNDS).load()
+except (pygame.error, ValueError):
+    sounds = {}
+
+def play_sound(name):
+    if name in sounds:
+        sounds[name].play()
+
+def create_obstacles():
+    if BULLET_HELL:
+        y = rng.uniform(0, HEIGHT - obstacle_height, swarm_size)
+        vx = -rng.uniform(*swarm_speed, swarm_size)
+        vy = rng.uniform(-1, 1, swarm_size)
+        obstacles.add(WIDTH, y, vx, vy, 1)
+    else:
+        obstacle_hp = random.randint(1, 5)  # Assign random HP between 1 and 5
+        obstacles.add(WIDTH, HEIGHT - obstacle_height, -obstacle_velocity, 0, obstacle_hp)
+
+def fire_bullets():
+    bullet_x = player_x + player_size
+    bullet_y = player_y + player_size // 2
+    if BULLET_HELL:
+        bullets.add(bullet_x, bullet_y, bullet_velocity, np.linspace(-spread_vy, spread_vy, spread_size))
+    else:
+        bullets.add(bullet_x, bullet_y, bullet_velocity)
+
+def move_entities():
+    obstacles.move()
+    bullets.move()
+    # Remove if off-screen
+    obstacles.cull(WIDTH, HEIGHT)
+    bullets.cull(WIDTH, HEIGHT)
+
+def check_collision(player_rect):
+    """Number of obstacles touching the player (bullet hell also removes them)"""
+    touching = obstacles.overlapping(*player_rect)
+    count = int(np.count_nonzero(touching))
+    if BULLET_HELL and count:
+        obstacles.keep(~touching)
+    return count
+
+def check_bullet_collision():
     global score  # Declare score as global to modify it
-    for bullet in bullets:
-        bullet_rect = pygame.Rect(bullet[0], bullet[1], bullet_width, bullet_height)
-        for obstacle in obstacles:
-            obstacle_rect = pygame.Rect(obstacle[0], obstacle[1], obstacle_width, obstacle_height)
-            if bullet_rect.colliderect(obstacle_rect):
-                obstacle[2] -= 1  # Decrease obstacle HP
-                if obstacle[2] <= 0:
-                    obstacles.remove(obstacle)  # Remove if HP <= 0
-                    score += 5  # Increase score for shooting down an obstacle
-                bullets.remove(bullet)  # Remove the bullet
-                break
-
-def draw_game(player_rect, obstacles, bullets, score):
+    hits, destroyed = resolve_bullet_hits(bullets, obstacles)
+    score += 5 * destroyed  # Increase score for shooting down obstacles
+    # One sound per step, however many bullets landed
+    if destroyed:
+        play_sound("destroy")
+    elif hits:
+        play_sound("hit")
+
+def lerp(previous, current, alpha):
+    return round(previous + (current - previous) * alpha)
+
+def block_sprite(color, width, height):
+    sprite = pygame.Surface((width, height))
+    sprite.fill(color)
+    return sprite
+
+obstacle_sprite = block_sprite(RED, obstacle_width, obstacle_height)
+bullet_sprite = block_sprite(GREEN, bullet_width, bullet_height)
+hp_labels = {}  # HP -> rendered "HP: n" text
+
+def draw_game(player_y, score, alpha=1.0):
+    # Moving things are drawn alpha of the way from their previous step to the latest one
     screen.fill(WHITE)
     
     # Draw player
-    pygame.draw.rect(screen, BLUE, player_rect)
+    pygame.draw.rect(screen, BLUE, (player_x, lerp(player_prev_y, player_y, alpha), player_size, player_size))
     
-    # Draw obstacles with HP
-    for obstacle in obstacles:
-        pygame.draw.rect(screen, RED, (obstacle[0], obstacle[1], obstacle_width, obstacle_height))
-        hp_text = font.render(f"HP: {obstacle[2]}", True, BLACK)
-        screen.blit(hp_text, (obstacle[0], obstacle[1] - 20))
+    # Draw obstacles (with HP, unless there is a swarm of them)
+    positions = obstacles.draw_positions(alpha)
+    screen.blits([(obstacle_sprite, position) for position in positions], doreturn=False)
+    if not BULLET_HELL:
+        for (x, y), hp in zip(positions, obstacles.hp.tolist()):
+            if hp not in hp_labels:
+                hp_labels[hp] = font.render(f"HP: {hp}", True, BLACK)
+            screen.blit(hp_labels[hp], (x, y - 20))
     
     # Draw bullets
-    for bullet in bullets:
-        pygame.draw.rect(screen, GREEN, (bullet[0], bullet[1], bullet_width, bullet_height))
+    screen.blits([(bullet_sprite, position) for position in bullets.draw_positions(alpha)], doreturn=False)
     
     # Draw score
     score_text = font.render(f"Score: {score}", True, BLACK)
     screen.blit(score_text, (10, 10))
+    if BULLET_HELL:
+        status = f"Health: {player_health}  Entities: {len(obstacles) + len(bullets)}  FPS: {clock.get_fps():.0f}"
+        screen.blit(font.render(status, True, BLACK), (10, 40))
 
     pygame.display.update()
 
@@ -120,66 +195,76 @@ def pause_game():
                 if event.key == pygame.K_p:
                     return  # Unpause the game
 
-# Main game loop
+# Main game loop: the simulation runs in fixed STEP_MS steps, drawing at FPS
 def game_loop():
-    global player_y, player_velocity_y, score, paused
     running = True
     obstacle_timer = 0
-    bullet_list = []  # Initialize bullet list
+    loop = FixedStepLoop(STEP_MS)
     
-    while running:
-        clock.tick(30)
-        
+    def handle_events():
+        global player_velocity_y, paused
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                return False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and player_y == HEIGHT - player_size:  # Jump if on the ground
                     player_velocity_y = jump_height
+                    play_sound("jump")
                 if event.key == pygame.K_UP:  # Shoot by pressing up arrow
-                    bullet_list.append([player_x + player_size, player_y + player_size // 2])
+                    fire_bullets()
+                    play_sound("shoot")
                 if event.key == pygame.K_p:  # Pause or unpause the game
                     paused = not paused
                     if paused:
                         pause_game()  # Show pause screen
+                        loop.reset()  # Do not catch up on the time spent paused
+        return running
+    
+    def update(step_ms):
+        global player_y, player_velocity_y, player_prev_y, player_health
+        nonlocal running, obstacle_timer
+        if paused or not running:
+            return
+        
+        # Gravity effect and player movement
+        player_prev_y = player_y
+        player_velocity_y += gravity
+        player_y += player_velocity_y
+        
+        # Prevent player from falling through the floor
+        if player_y >= HEIGHT - player_size:
+            player_y = HEIGHT - player_size
+            player_velocity_y = 0
         
-        if not paused:
-            # Gravity effect and player movement
-            player_velocity_y += gravity
-            player_y += player_velocity_y
-            
-            # Prevent player from falling through the floor
-            if player_y >= HEIGHT - player_size:
-                player_y = HEIGHT - player_size
-                player_velocity_y = 0
-            
-            player_rect = pygame.Rect(player_x, player_y, player_size, player_size)
-            
-            # Obstacle creation
-            if obstacle_timer > 60:
-                obstacle_list.append(create_obstacle())
-                obstacle_timer = 0
-            obstacle_timer += 1
-            
-            # Move bullets and obstacles
-            bullet_list = move_bullets(bullet_list)
-            obstacle_list[:] = move_obstacles(obstacle_list)
-            
-            # Check for collisions
-            if check_collision(player_rect, obstacle_list):
-                running = False  # End game if collision happens
-            
-            # Check bullet collisions with obstacles
-            check_bullet_collision(bullet_list, obstacle_list)
-            
-            # Update score for passing obstacles
-            for obstacle in obstacle_list:
-                if obstacle[0] < 0 and obstacle not in obstacle_list:
-                    score += 1  # Increase score for each obstacle that has been passed
-            
-        # Drawing
-        draw_game(player_rect, obstacle_list, bullet_list, score)
+        player_rect = pygame.Rect(player_x, player_y, player_size, player_size)
+        
+        # Obstacle creation
+        if obstacle_timer > obstacle_interval:
+            create_obstacles()
+            obstacle_timer = 0
+        obstacle_timer += 1
+        if BULLET_HELL:
+            fire_bullets()  # Auto-fire every step
+        
+        # Move bullets and obstacles
+        move_entities()
+        
+        # Check for collisions
+        hits_taken = check_collision(player_rect)
+        if BULLET_HELL:
+            player_health = max(0, player_health - hits_taken)
+        if hits_taken and (not BULLET_HELL or player_health == 0):
+            running = False  # End game if collision happens
+            play_sound("game_over")
+            pygame.time.wait(700)  # Let the game over sound play before quitting
+        
+        # Check bullet collisions with obstacles
+        check_bullet_collision()
+    
+    def draw(alpha):
+        draw_game(player_y, score, 1.0 if paused else alpha)
     
+    loop.run(handle_events, update, draw, FPS, clock)
     pygame.quit()
 
 # Run the game
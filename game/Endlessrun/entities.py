@@ -0,0 +1,172 @@
+"""Struct-of-arrays storage for the Endless Runner's obstacles and bullets.
+
+Every entity of a kind is a w x h rectangle. Positions, velocities and hit
+points live in NumPy arrays (one per field); the live entities are the
+first ``count`` rows, kept in the order they were added. Moving, culling
+and collision are whole-array operations, so a frame costs about the same
+with ten entities as with a few thousand.
+"""
+import numpy as np
+
+INITIAL_CAPACITY = 64
+
+
+class EntityStore:
+    FIELDS = ("x", "y", "prev_x", "prev_y", "vx", "vy", "hp")
+
+    def __init__(self, width, height, capacity=INITIAL_CAPACITY):
+        self.width = width
+        self.height = height
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = {name: getattr(self, "_" + name, None) for name in self.FIELDS}
+        for name in self.FIELDS:
+            array = np.zeros(capacity, dtype=np.int32 if name == "hp" else np.float32)
+            if old[name] is not None:
+                array[:self.count] = old[name][:self.count]
+            setattr(self, "_" + name, array)
+
+    def __len__(self):
+        return self.count
+
+    # Views of the live entities; writing to them changes the store
+    @property
+    def x(self):
+        return self._x[:self.count]
+
+    @property
+    def y(self):
+        return self._y[:self.count]
+
+    @property
+    def prev_x(self):
+        return self._prev_x[:self.count]
+
+    @property
+    def prev_y(self):
+        return self._prev_y[:self.count]
+
+    @property
+    def vx(self):
+        return self._vx[:self.count]
+
+    @property
+    def vy(self):
+        return self._vy[:self.count]
+
+    @property
+    def hp(self):
+        return self._hp[:self.count]
+
+    def add(self, x, y, vx=0.0, vy=0.0, hp=1):
+        """Add entities; every argument is a number or an array (broadcast together)"""
+        x, y, vx, vy, hp = np.broadcast_arrays(x, y, vx, vy, hp)
+        added = x.size
+        if self.count + added > self._x.size:
+            capacity = self._x.size
+            while capacity < self.count + added:
+                capacity *= 2
+            self._allocate(capacity)
+        rows = slice(self.count, self.count + added)
+        self._x[rows] = x.ravel()
+        self._y[rows] = y.ravel()
+        self._prev_x[rows] = x.ravel()
+        self._prev_y[rows] = y.ravel()
+        self._vx[rows] = vx.ravel()
+        self._vy[rows] = vy.ravel()
+        self._hp[rows] = hp.ravel()
+        self.count += added
+
+    def clear(self):
+        self.count = 0
+
+    def move(self):
+        """One simulation step: remember the old position (for drawing), add the velocity"""
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+        self.x[:] += self.vx
+        self.y[:] += self.vy
+
+    def keep(self, mask):
+        """Drop every entity where mask is False (the rest keep their order)"""
+        kept = int(np.count_nonzero(mask))
+        if kept == self.count:
+            return
+        for name in self.FIELDS:
+            array = getattr(self, "_" + name)
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def cull(self, screen_width, screen_height):
+        """Drop entities that are entirely off screen"""
+        x, y = self.x, self.y
+        self.keep((x + self.width > 0) & (x < screen_width) & (y + self.height > 0) & (y < screen_height))
+
+    def overlapping(self, left, top, width, height):
+        """Bool mask of the entities overlapping a rectangle (pygame.Rect.colliderect rules)"""
+        x, y = self.x, self.y
+        return (x < left + width) & (left < x + self.width) & (y < top + height) & (top < y + self.height)
+
+    def draw_positions(self, alpha=1.0):
+        """[[x, y], ...] ints, alpha of the way from the previous step to the latest one"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return np.stack((np.rint(x), np.rint(y)), axis=1).astype(np.int32).tolist()
+
+
+def overlapping_pairs(a, b):
+    """(i, j) index arrays of every entity a[i] overlapping b[j].
+
+    Sweep and prune: b is sorted by left edge once, then a binary search per
+    entity of a finds the b entities whose x range can overlap it, and only
+    those candidate pairs get the y test.
+    """
+    if not a.count or not b.count:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    order = np.argsort(b.x, kind="stable")
+    b_left = b.x[order]
+    # b[j] overlaps a[i] in x when a.left - b.width < b.left < a.left + a.width
+    first = np.searchsorted(b_left, a.x - b.width, side="right")
+    last = np.searchsorted(b_left, a.x + a.width, side="left")
+    counts = np.maximum(last - first, 0)
+    i = np.repeat(np.arange(a.count), counts)
+    # Position of each candidate within its run of b_left
+    starts = np.repeat(first - np.cumsum(counts) + counts, counts)
+    j = order[starts + np.arange(counts.sum())]
+    hit = (a.y[i] < b.y[j] + b.height) & (b.y[j] < a.y[i] + a.height)
+    return i[hit], j[hit]
+
+
+def resolve_bullet_hits(bullets, targets):
+    """Bullets that overlap a target take one hit point from it and are used up.
+
+    Each bullet, in store order, stops at the first target (in store order)
+    it overlaps that still has hit points, so a target absorbs at most as
+    many bullets as it has. Only the overlapping pairs from the sweep are
+    walked here, a handful per step. Removes the used bullets and destroyed
+    targets; returns (hits, destroyed).
+    """
+    i, j = overlapping_pairs(bullets, targets)
+    if not i.size:
+        return 0, 0
+    order = np.lexsort((j, i))  # By bullet, then by target
+    hp = targets.hp.tolist()
+    used = np.zeros(bullets.count, dtype=bool)
+    hits = 0
+    last_bullet = -1
+    for bullet, target in zip(i[order].tolist(), j[order].tolist()):
+        if bullet == last_bullet or hp[target] <= 0:
+            continue
+        hp[target] -= 1
+        used[bullet] = True
+        last_bullet = bullet
+        hits += 1
+    targets.hp[:] = hp
+    dead = targets.hp <= 0
+    destroyed = int(np.count_nonzero(dead))
+    targets.keep(~dead)
+    bullets.keep(~used)
+    return hits, destroyed
@@ -0,0 +1,73 @@
+"""Fixed-timestep game loop shared by the Snake and Endless Runner games.
+
+The simulation always advances in steps of exactly ``step_ms``, however long
+a frame took, so gameplay runs at the same speed at 30, 60 or 144 FPS and
+on a machine that stutters. Frame time is gathered in an accumulator and
+spent in whole steps; after a long stall at most ``max_steps`` are run in
+one frame and the rest of the time is dropped (the game slows down briefly
+instead of freezing while it catches up). What is left over, as a fraction
+of a step, is ``alpha``: drawing each moving thing at
+``previous + (current - previous) * alpha`` gives smooth motion between
+simulation steps.
+
+    loop = FixedStepLoop(1000 / 30)
+    loop.run(handle_events, update, draw, fps=60)   # update(step_ms), draw(alpha)
+
+or drive it from an existing loop with ``add_time(elapsed_ms)``.
+"""
+import time
+import pygame
+
+MAX_CATCH_UP_STEPS = 5  # Steps run in one frame before time is dropped
+
+
+class FixedStepLoop:
+    def __init__(self, step_ms: float, max_steps: int = MAX_CATCH_UP_STEPS):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0  # Time thrown away by the catch-up limit
+        self.last_time = None
+
+    @property
+    def alpha(self) -> float:
+        """How far the display is between the last two steps, 0 to 1"""
+        return self.accumulator / self.step_ms
+
+    def reset(self):
+        """Forget accumulated time (after a pause or a blocking dialog)"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def add_time(self, elapsed_ms: float) -> int:
+        """Add a frame's duration; returns the number of steps to simulate now"""
+        self.accumulator += max(0.0, elapsed_ms)
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            dropped_ms = (steps - self.max_steps) * self.step_ms
+            self.dropped_ms += dropped_ms
+            self.accumulator -= dropped_ms
+            steps = self.max_steps
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    def tick(self) -> int:
+        """add_time with the time since the previous tick (0 on the first call)"""
+        now = time.perf_counter()
+        elapsed_ms = 0.0 if self.last_time is None else (now - self.last_time) * 1000
+        self.last_time = now
+        return self.add_time(elapsed_ms)
+
+    def run(self, handle_events, update, draw, fps: int = 0, clock=None):
+        """Loop until handle_events() returns False: update(step_ms) per step, draw(alpha) per frame.
+
+        ``fps`` caps the frame rate (0 for uncapped); the simulation rate is
+        set by step_ms alone.
+        """
+        clock = clock or pygame.time.Clock()
+        self.reset()
+        while handle_events():
+            for _ in range(self.tick()):
+                update(self.step_ms)
+            draw(self.alpha)
+            clock.tick(fps)
@@ -1,12 +1,18 @@
 import pygame
+import argparse
 import math
 import time
-import random
 import json
 import os
+import sys
+import threading
+from collections import deque
 from enum import Enum
-from dataclasses import dataclass
 from typing import List, Tuple, Optional
+import snake_sim
+from snake_sim import Difficulty, PowerUpType, Position, Cell, SnakeSimulation
+import synth
+from game_loop import FixedStepLoop
 
 # Initialize Pygame
 pygame.init()
@@ -19,24 +25,6 @@ class GameState(Enum):
     GAME_OVER = "game_over"
     HOW_TO_PLAY = "how_to_play"
 
-class Difficulty(Enum):
-    EASY = {"speed": 8, "obstacles": 3, "name": "Easy"}
-    MEDIUM = {"speed": 12, "obstacles": 6, "name": "Medium"}
-    HARD = {"speed": 16, "obstacles": 10, "name": "Hard"}
-
-class PowerUpType(Enum):
-    SLOW_TIME = {"color": (0, 191, 255), "duration": 3000, "name": "Slow Time"}
-    SHRINK = {"color": (255, 165, 0), "duration": 5000, "name": "Shrink"}
-    BONUS_POINTS = {"color": (255, 215, 0), "duration": 0, "name": "Bonus Points"}
-
-@dataclass
-class Position:
-    x: float
-    y: float
-    
-    def to_grid(self, block_size: int) -> Tuple[int, int]:
-        return (int(self.x // block_size), int(self.y // block_size))
-
 class Theme:
     def __init__(self, dark_mode: bool = False):
         if dark_mode:
@@ -58,30 +46,22 @@ class Theme:
             self.button_hover = (100, 149, 237)
             self.obstacle_color = (139, 69, 19)
 
-class PowerUp:
-    def __init__(self, x: int, y: int, power_type: PowerUpType, block_size: int):
-        self.x = x
-        self.y = y
-        self.type = power_type
-        self.block_size = block_size
-        self.spawn_time = pygame.time.get_ticks()
-        self.lifetime = 10000  # 10 seconds
-        
-    def draw(self, screen, theme):
+class PowerUp(snake_sim.PowerUp):
+    def draw(self, screen, theme, offset=(0, 0)) -> pygame.Rect:
         color = self.type.value["color"]
         # Pulsing effect
         pulse = (math.sin(pygame.time.get_ticks() * 0.01) + 1) * 0.5
         size_offset = int(pulse * 5)
         
-        pygame.draw.rect(screen, color, 
-                        [self.x * self.block_size - size_offset//2, 
-                         self.y * self.block_size - size_offset//2, 
-                         self.block_size + size_offset, 
-                         self.block_size + size_offset])
+        rect = pygame.Rect(offset[0] + self.x * self.block_size - size_offset//2, 
+                           offset[1] + self.y * self.block_size - size_offset//2, 
+                           self.block_size + size_offset, 
+                           self.block_size + size_offset)
+        pygame.draw.rect(screen, color, rect)
         
         # Draw power-up symbol
-        center_x = self.x * self.block_size + self.block_size // 2
-        center_y = self.y * self.block_size + self.block_size // 2
+        center_x = offset[0] + self.x * self.block_size + self.block_size // 2
+        center_y = offset[1] + self.y * self.block_size + self.block_size // 2
         
         if self.type == PowerUpType.SLOW_TIME:
             pygame.draw.circle(screen, (255, 255, 255), (center_x, center_y), 5)
@@ -92,84 +72,11 @@ class PowerUp:
             pygame.draw.polygon(screen, (255, 255, 255),
                               [(center_x, center_y-6), (center_x-4, center_y+2), 
                                (center_x+4, center_y+2)])
-    
-    def is_expired(self) -> bool:
-        return pygame.time.get_ticks() - self.spawn_time > self.lifetime
+        return rect
 
-class Snake:
-    def __init__(self, start_x: float, start_y: float, block_size: int):
-        self.block_size = block_size
-        self.segments = [
-            Position(start_x - 2 * block_size, start_y),
-            Position(start_x - block_size, start_y),
-            Position(start_x, start_y)
-        ]
-        self.direction = Position(1, 0)
-        self.next_direction = Position(1, 0)
-        self.speed = 200.0  # pixels per second
-        self.move_timer = 0
-        self.move_interval = 1000 / 10  # 10 moves per second initially
-        self.growing = False
-        self.skin = 0  # Current skin index
-        
-    def update(self, delta_time: float):
-        self.move_timer += delta_time
-        
-        if self.move_timer >= self.move_interval:
-            # Update direction
-            if (self.next_direction.x != -self.direction.x or 
-                self.next_direction.y != -self.direction.y):
-                self.direction = self.next_direction
-            
-            # Move snake
-            head = self.segments[-1]
-            new_head = Position(
-                head.x + self.direction.x * self.block_size,
-                head.y + self.direction.y * self.block_size
-            )
-            self.segments.append(new_head)
-            
-            if not self.growing:
-                self.segments.pop(0)
-            else:
-                self.growing = False
-                
-            self.move_timer = 0
-    
-    def set_direction(self, direction: Position):
-        # Prevent moving into itself
-        if len(self.segments) > 1:
-            if (direction.x != -self.direction.x or direction.y != -self.direction.y):
-                self.next_direction = direction
-        else:
-            self.next_direction = direction
-    
-    def grow(self):
-        self.growing = True
-    
-    def shrink(self):
-        if len(self.segments) > 3:
-            self.segments.pop(0)
-    
-    def set_speed(self, speed: float):
-        self.move_interval = 1000 / speed
-    
-    def check_self_collision(self) -> bool:
-        head = self.segments[-1]
-        return any(segment.x == head.x and segment.y == head.y 
-                  for segment in self.segments[:-1])
-    
-    def check_wall_collision(self, width: int, height: int) -> bool:
-        head = self.segments[-1]
-        return (head.x < 0 or head.x >= width or 
-                head.y < 0 or head.y >= height)
-    
-    def check_obstacle_collision(self, obstacles: List[Tuple[int, int]]) -> bool:
-        head = self.segments[-1]
-        grid_pos = head.to_grid(self.block_size)
-        return grid_pos in obstacles
-    
-    def draw(self, screen, theme):
+class Snake(snake_sim.Snake):
+    # Rules live in snake_sim.Snake, this adds the drawing
+    def skin_color(self, theme):
         # Snake skins
         snake_colors = [
             theme.snake_color,  # Default
@@ -178,25 +85,33 @@ class Snake:
             (255, 255, 100),    # Yellow
             (100, 100, 255),    # Blue
         ]
-        
-        color = snake_colors[self.skin % len(snake_colors)]
-        
-        for i, segment in enumerate(self.segments):
-            # Head is slightly larger
-            size_offset = 3 if i == len(self.segments) - 1 else 0
-            
-            pygame.draw.rect(screen, color, 
-                           [segment.x - size_offset//2, segment.y - size_offset//2, 
-                            self.block_size + size_offset, self.block_size + size_offset])
-            
-            # Add eyes to head
-            if i == len(self.segments) - 1:
-                eye_offset = 5
-                pygame.draw.circle(screen, (255, 255, 255), 
-                                 (int(segment.x + eye_offset), int(segment.y + eye_offset)), 2)
-                pygame.draw.circle(screen, (255, 255, 255), 
-                                 (int(segment.x + self.block_size - eye_offset), 
-                                  int(segment.y + eye_offset)), 2)
+        return snake_colors[self.skin % len(snake_colors)]
+    
+    def segment_rect(self, segment: Position, is_head: bool = False, offset=(0, 0)) -> pygame.Rect:
+        # Head is slightly larger
+        size_offset = 3 if is_head else 0
+        return pygame.Rect(offset[0] + segment.x - size_offset//2, offset[1] + segment.y - size_offset//2,
+                           self.block_size + size_offset, self.block_size + size_offset)
+    
+    def draw_segment(self, screen, theme, segment: Position, is_head: bool = False, offset=(0, 0)) -> pygame.Rect:
+        rect = self.segment_rect(segment, is_head, offset)
+        pygame.draw.rect(screen, self.skin_color(theme), rect)
+        
+        # Add eyes to head
+        if is_head:
+            eye_offset = 5
+            x, y = offset[0] + segment.x, offset[1] + segment.y
+            pygame.draw.circle(screen, (255, 255, 255), 
+                             (int(x + eye_offset), int(y + eye_offset)), 2)
+            pygame.draw.circle(screen, (255, 255, 255), 
+                             (int(x + self.block_size - eye_offset), 
+                              int(y + eye_offset)), 2)
+        return rect
+    
+    def draw(self, screen, theme, offset=(0, 0)):
+        head = self.segments[-1]
+        for segment in self.segments:
+            self.draw_segment(screen, theme, segment, segment is head, offset)
 
 class Button:
     def __init__(self, x: int, y: int, width: int, height: int, text: str, font):
@@ -222,33 +137,26 @@ class Button:
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
+# Effects for synth.SoundBank: the original beeps, shaped so they do not click
+SNAKE_SOUNDS = {
+    "eat": [synth.note(800, 0.1)],
+    "game_over": [synth.note(300, 0.5, slide_to=150, release=0.15)],
+    "pause": [synth.note(600, 0.1)],
+    "powerup": [synth.note(1000, 0.07), synth.note(1250, 0.07), synth.chord([1000, 1500], 0.1)],
+}
+
 class SoundManager:
     def __init__(self):
         self.sounds = {}
         self.music_playing = False
         
-        # Create simple sound effects
+        # Rendered with NumPy on the first run, read from the synth cache after that
         try:
-            # You can replace these with actual sound files
-            self.create_beep_sound("eat", 800, 0.1)
-            self.create_beep_sound("game_over", 300, 0.5)
-            self.create_beep_sound("pause", 600, 0.1)
-            self.create_beep_sound("powerup", 1000, 0.2)
-        except:
+            self.sounds = synth.SoundBank(SNAKE_SOUNDS).load()
+        except (pygame.error, ValueError):
             # If sound creation fails, disable sounds
             pass
     
-    def create_beep_sound(self, name: str, frequency: int, duration: float):
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            wave = 4096 * math.sin(frequency * 2 * math.pi * i / sample_rate)
-            arr.append([int(wave), int(wave)])
-        
-        sound = pygame.sndarray.make_sound(pygame.array.array('i', arr))
-        self.sounds[name] = sound
-    
     def play_sound(self, name: str):
         if name in self.sounds:
             try:
@@ -260,49 +168,243 @@ class SoundManager:
         # You can add background music file here
         pass
 
+DATA_FILE = "game_data.json"
+DATA_VERSION = 2
+SAVE_DELAY = 1.0  # Seconds to gather changes into one write
+MAX_RETRY_DELAY = 30.0  # Longest wait before retrying a failed write
+HISTORY_LIMIT = 100  # Finished games kept per profile
+
+class WriteBehindFile:
+    """Writes a file from a background thread so saving never blocks a frame.
+
+    ``request`` only marks the data dirty; the thread waits SAVE_DELAY for more
+    changes, calls ``serialize`` and writes the result to a temporary file
+    that is renamed over the real one, so a crash mid-write leaves the old
+    file intact. A failed write stays pending and is retried with a growing
+    delay (up to MAX_RETRY_DELAY). ``flush`` skips the delay and can wait for
+    the write; ``close`` makes a last attempt at anything pending and stops
+    the thread. Both return False when the data did not reach the disk
+    (``error`` then holds the reason).
+    """
+    
+    def __init__(self, path: str, serialize, delay: float = SAVE_DELAY):
+        self.path = path
+        self.serialize = serialize
+        self.delay = delay
+        self.condition = threading.Condition()
+        self.requested = 0  # Changes requested so far
+        self.written = 0  # Changes on disk
+        self.failures = 0  # Failed writes since the last successful one
+        self.error = None  # Exception from the last failed write
+        self.urgent = False
+        self.closed = False
+        self.thread = None
+    
+    def request(self, urgent: bool = False):
+        with self.condition:
+            self.requested += 1
+            self.urgent = self.urgent or urgent
+            # Also replaces a writer thread that died, so no later save is lost
+            if (self.thread is None or not self.thread.is_alive()) and not self.closed:
+                self.thread = threading.Thread(target=self.run, name="game-data-writer", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+    
+    def flush(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        with self.condition:
+            target = self.requested
+            if self.written >= target:
+                return True
+            self.urgent = True
+            self.condition.notify_all()
+            if wait and self.thread is not None:
+                # Stop waiting at the first failed attempt too, it is retried later
+                failures = self.failures
+                self.condition.wait_for(lambda: (self.written >= target or self.failures > failures or
+                                                 not self.thread.is_alive()), timeout)
+            return self.written >= target
+    
+    def close(self, timeout: float = 5.0) -> bool:
+        with self.condition:
+            self.closed = True
+            self.urgent = True
+            self.condition.notify_all()
+            thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+        with self.condition:
+            return self.written >= self.requested
+    
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.requested > self.written or self.closed)
+                if self.requested == self.written:
+                    return  # Closed with nothing left to write
+                if self.failures:
+                    # Back off before retrying; closing cuts the wait short for a last attempt
+                    retry_delay = min(self.delay * 2 ** self.failures, MAX_RETRY_DELAY)
+                    self.condition.wait_for(lambda: self.closed, retry_delay)
+                else:
+                    # Changes arriving during the delay are written together
+                    self.condition.wait_for(lambda: self.urgent or self.closed, self.delay)
+                target = self.requested
+                closing = self.closed
+                self.urgent = False
+            try:
+                self.write(self.serialize())
+                error = None
+            except Exception as e:
+                error = e  # Keep the writer (and the game) running and try again
+            with self.condition:
+                if error is None:
+                    self.written = max(self.written, target)
+                    self.failures = 0
+                    self.error = None
+                else:
+                    self.failures += 1
+                    self.error = error
+                self.condition.notify_all()
+                if error is not None and closing:
+                    return  # The last attempt failed; close() reports it
+    
+    def write(self, text: str):
+        temp_path = f"{self.path}.tmp{os.getpid()}"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)  # Do not leave half-written temp files behind
+            raise
+
+def new_profile() -> dict:
+    return {
+        "high_score": 0,
+        "unlocked_skins": [0],  # Start with default skin unlocked
+        "stats": {"games_played": 0, "total_score": 0, "food_eaten": 0, "power_ups": 0,
+                  "time_played_ms": 0, "longest_snake": 0},
+        "history": [],  # Most recent last, at most HISTORY_LIMIT games
+    }
+
 class GameData:
-    def __init__(self):
-        self.high_score = 0
-        self.unlocked_skins = [0]  # Start with default skin unlocked
+    """High score, skins, stats and score history per profile, plus shared settings.
+
+    Changes are saved by a WriteBehindFile, so ``save_data`` returns at once.
+    Files from older versions (a single high score, skins and theme) load into
+    the "default" profile.
+    """
+    
+    def __init__(self, profile: str = "default", path: str = DATA_FILE):
+        self.path = path
+        self.profile = profile
+        self.profiles = {}
         self.dark_mode = False
+        self.lock = threading.Lock()  # Held while changing or serializing the data
         self.load_data()
+        self.writer = WriteBehindFile(path, self.to_json)
+    
+    @property
+    def current(self) -> dict:
+        return self.profiles[self.profile]
+    
+    @property
+    def high_score(self) -> int:
+        return self.current["high_score"]
+    
+    @high_score.setter
+    def high_score(self, value: int):
+        self.current["high_score"] = value
+    
+    @property
+    def unlocked_skins(self) -> List[int]:
+        return self.current["unlocked_skins"]
+    
+    @property
+    def stats(self) -> dict:
+        return self.current["stats"]
+    
+    @property
+    def history(self) -> List[dict]:
+        return self.current["history"]
     
     def load_data(self):
         try:
-            with open("game_data.json", "r") as f:
+            with open(self.path, "r") as f:
                 data = json.load(f)
-                self.high_score = data.get("high_score", 0)
-                self.unlocked_skins = data.get("unlocked_skins", [0])
-                self.dark_mode = data.get("dark_mode", False)
-        except:
-            pass
-    
-    def save_data(self):
-        data = {
-            "high_score": self.high_score,
-            "unlocked_skins": self.unlocked_skins,
-            "dark_mode": self.dark_mode
-        }
-        try:
-            with open("game_data.json", "w") as f:
-                json.dump(data, f)
-        except:
-            pass
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        
+        if "profiles" in data:
+            for name, stored in data["profiles"].items():
+                profile = new_profile()
+                profile.update(stored)
+                profile["stats"] = {**new_profile()["stats"], **stored.get("stats", {})}
+                self.profiles[name] = profile
+        elif data:
+            # Version 1 file: one player
+            profile = new_profile()
+            profile["high_score"] = data.get("high_score", 0)
+            profile["unlocked_skins"] = data.get("unlocked_skins", [0])
+            self.profiles["default"] = profile
+        self.dark_mode = data.get("dark_mode", False)
+        self.profiles.setdefault(self.profile, new_profile())
+    
+    def to_json(self) -> str:
+        with self.lock:
+            return json.dumps({
+                "version": DATA_VERSION,
+                "dark_mode": self.dark_mode,
+                "profiles": self.profiles,
+            })
+    
+    def save_data(self, urgent: bool = False):
+        self.writer.request(urgent)
+    
+    def record_game(self, score: int, difficulty: str, length: int, time_ms: float, food: int, power_ups: int):
+        """Add a finished game to the stats and history and write it out right away"""
+        with self.lock:
+            stats = self.stats
+            stats["games_played"] += 1
+            stats["total_score"] += score
+            stats["food_eaten"] += food
+            stats["power_ups"] += power_ups
+            stats["time_played_ms"] += int(time_ms)
+            stats["longest_snake"] = max(stats["longest_snake"], length)
+            self.history.append({"score": score, "difficulty": difficulty, "length": length,
+                                 "time_ms": int(time_ms), "ended": int(time.time())})
+            del self.history[:-HISTORY_LIMIT]
+        self.save_data(urgent=True)
     
     def unlock_skin(self, skin_id: int):
         if skin_id not in self.unlocked_skins:
-            self.unlocked_skins.append(skin_id)
+            with self.lock:
+                self.unlocked_skins.append(skin_id)
             self.save_data()
             return True
         return False
+    
+    def close(self) -> bool:
+        """Write anything pending (call before exiting); False if it could not be saved"""
+        saved = self.writer.close()
+        if not saved:
+            print(f"Could not save game data to {self.path}: {self.writer.error}", file=sys.stderr)
+        return saved
 
 class EnhancedSnakeGame:
-    def __init__(self):
+    def __init__(self, profile: str = "default"):
         self.SCREEN_WIDTH = 800
         self.SCREEN_HEIGHT = 600
         self.GAME_WIDTH = 640
         self.GAME_HEIGHT = 480
         self.BLOCK_SIZE = 20
+        self.SIM_STEP_MS = 10  # Fixed simulation step; moves land within one step of their time
+        self.FPS = 60  # Drawing rate only, gameplay speed does not depend on it
         
         self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), 
                                               pygame.RESIZABLE)
@@ -312,27 +414,59 @@ class EnhancedSnakeGame:
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
-        self.game_data = GameData()
+        self.game_data = GameData(profile)
         self.theme = Theme(self.game_data.dark_mode)
         self.sound_manager = SoundManager()
         
         self.state = GameState.MENU
         self.difficulty = Difficulty.MEDIUM
         
-        # Game variables
-        self.snake = None
-        self.food_pos = Position(0, 0)
-        self.score = 0
-        self.obstacles = []
-        self.power_ups = []
-        self.active_power_ups = {}
+        # Game rules and state (snake_sim.SnakeSimulation), None until a game starts
+        self.sim = None
+        self.food_eaten = 0  # For the profile stats
+        self.power_ups_taken = 0
+        
+        # Playfield layers: while playing only what changed is redrawn and sent to the display
+        self.static_layer = None  # Background, border and obstacles
+        self.backdrop = None  # static_layer plus the snake, updated a few cells per move
+        self.layers_for = None  # (sim, theme) the layers were built for
+        self.drawn_segments = deque()  # Snake segments as drawn on the backdrop, tail first
+        self.drawn_skin = None
+        self.sprite_rects = []  # Food and power-ups drawn over the backdrop last frame
+        self.ui_key = None  # Everything the UI bar shows, to spot changes
+        self.ui_rect = None
+        self.drawn_state = None
         
         # Timing
-        self.last_time = pygame.time.get_ticks()
-        self.power_up_spawn_timer = 0
+        self.loop = FixedStepLoop(self.SIM_STEP_MS)
         
         self.create_ui_elements()
         
+    # The playfield drawing reads the game state straight from the simulation
+    @property
+    def snake(self):
+        return self.sim.snake if self.sim else None
+    
+    @property
+    def score(self):
+        return self.sim.score if self.sim else 0
+    
+    @property
+    def food_pos(self):
+        return self.sim.food_pos
+    
+    @property
+    def obstacles(self):
+        return self.sim.obstacles
+    
+    @property
+    def power_ups(self):
+        return self.sim.power_ups
+    
+    @property
+    def active_power_ups(self):
+        return self.sim.active_power_ups
+        
     def create_ui_elements(self):
         # Menu buttons
         button_width, button_height = 200, 50
@@ -450,221 +584,203 @@ class EnhancedSnakeGame:
     
     def start_new_game(self):
         self.state = GameState.PLAYING
-        self.score = 0
-        
-        # Initialize snake
-        start_x = self.GAME_WIDTH // 2
-        start_y = self.GAME_HEIGHT // 2
-        self.snake = Snake(start_x, start_y, self.BLOCK_SIZE)
-        self.snake.set_speed(self.difficulty.value["speed"])
-        
-        # Generate obstacles
-        self.generate_obstacles()
-        
-        # Generate food
-        self.generate_food()
-        
-        # Reset power-ups
-        self.power_ups.clear()
-        self.active_power_ups.clear()
-        self.power_up_spawn_timer = 0
-    
-    def generate_obstacles(self):
-        self.obstacles = []
-        obstacle_count = self.difficulty.value["obstacles"]
-        
-        for _ in range(obstacle_count):
-            while True:
-                x = random.randint(0, self.GAME_WIDTH // self.BLOCK_SIZE - 1)
-                y = random.randint(0, self.GAME_HEIGHT // self.BLOCK_SIZE - 1)
-                
-                # Make sure obstacle doesn't spawn on snake or food
-                if (x, y) not in [(int(seg.x // self.BLOCK_SIZE), int(seg.y // self.BLOCK_SIZE)) 
-                                  for seg in self.snake.segments]:
-                    self.obstacles.append((x, y))
-                    break
-    
-    def generate_food(self):
-        while True:
-            x = random.randint(0, self.GAME_WIDTH // self.BLOCK_SIZE - 1)
-            y = random.randint(0, self.GAME_HEIGHT // self.BLOCK_SIZE - 1)
-            
-            # Make sure food doesn't spawn on snake or obstacles
-            snake_positions = [(int(seg.x // self.BLOCK_SIZE), int(seg.y // self.BLOCK_SIZE)) 
-                              for seg in self.snake.segments]
-            
-            if (x, y) not in snake_positions and (x, y) not in self.obstacles:
-                self.food_pos = Position(x * self.BLOCK_SIZE, y * self.BLOCK_SIZE)
-                break
-    
-    def spawn_power_up(self):
-        if len(self.power_ups) < 2:  # Max 2 power-ups at once
-            while True:
-                x = random.randint(0, self.GAME_WIDTH // self.BLOCK_SIZE - 1)
-                y = random.randint(0, self.GAME_HEIGHT // self.BLOCK_SIZE - 1)
-                
-                # Check if position is free
-                snake_positions = [(int(seg.x // self.BLOCK_SIZE), int(seg.y // self.BLOCK_SIZE)) 
-                                  for seg in self.snake.segments]
-                food_pos = (int(self.food_pos.x // self.BLOCK_SIZE), int(self.food_pos.y // self.BLOCK_SIZE))
-                
-                if ((x, y) not in snake_positions and (x, y) not in self.obstacles and 
-                    (x, y) != food_pos):
-                    power_type = random.choice(list(PowerUpType))
-                    self.power_ups.append(PowerUp(x, y, power_type, self.BLOCK_SIZE))
-                    break
-    
-    def apply_power_up(self, power_up: PowerUp):
-        current_time = pygame.time.get_ticks()
-        
-        if power_up.type == PowerUpType.SLOW_TIME:
-            self.snake.set_speed(self.difficulty.value["speed"] * 0.5)
-            self.active_power_ups["slow_time"] = current_time + power_up.type.value["duration"]
-            
-        elif power_up.type == PowerUpType.SHRINK:
-            self.snake.shrink()
-            self.active_power_ups["shrink"] = current_time + power_up.type.value["duration"]
-            
-        elif power_up.type == PowerUpType.BONUS_POINTS:
-            self.score += 5
-            # Check for skin unlocks
-            if self.score >= 20 and 1 not in self.game_data.unlocked_skins:
-                self.game_data.unlock_skin(1)
-            elif self.score >= 50 and 2 not in self.game_data.unlocked_skins:
-                self.game_data.unlock_skin(2)
-        
-        self.sound_manager.play_sound("powerup")
-    
-    def update_power_ups(self):
-        current_time = pygame.time.get_ticks()
-        
-        # Remove expired power-ups from world
-        self.power_ups = [pu for pu in self.power_ups if not pu.is_expired()]
-        
-        # Check active power-up expiration
-        expired_effects = []
-        for effect, end_time in self.active_power_ups.items():
-            if current_time > end_time:
-                expired_effects.append(effect)
-        
-        for effect in expired_effects:
-            del self.active_power_ups[effect]
-            if effect == "slow_time":
-                self.snake.set_speed(self.difficulty.value["speed"])
+        self.sim = SnakeSimulation(self.difficulty, self.GAME_WIDTH, self.GAME_HEIGHT, self.BLOCK_SIZE,
+                                   snake_class=Snake, power_up_class=PowerUp)
+        self.food_eaten = 0
+        self.power_ups_taken = 0
     
     def update_game(self, delta_time: float):
         if self.state != GameState.PLAYING:
             return
         
-        # Update snake
-        self.snake.update(delta_time)
-        
-        # Check collisions
-        if (self.snake.check_wall_collision(self.GAME_WIDTH, self.GAME_HEIGHT) or 
-            self.snake.check_self_collision() or 
-            self.snake.check_obstacle_collision(self.obstacles)):
-            self.game_over()
-            return
-        
-        # Check food collision
-        head = self.snake.segments[-1]
-        if (int(head.x) == int(self.food_pos.x) and int(head.y) == int(self.food_pos.y)):
-            self.snake.grow()
-            self.score += 1
-            self.sound_manager.play_sound("eat")
-            
-            if self.score > self.game_data.high_score:
-                self.game_data.high_score = self.score
-                self.game_data.save_data()
-            
-            self.generate_food()
-            
-            # Increase speed slightly
-            current_speed = self.difficulty.value["speed"] + (self.score // 5)
-            if "slow_time" not in self.active_power_ups:
-                self.snake.set_speed(min(current_speed, 25))
-        
-        # Check power-up collisions
-        head_grid = (int(head.x // self.BLOCK_SIZE), int(head.y // self.BLOCK_SIZE))
-        for power_up in self.power_ups[:]:
-            if head_grid == (power_up.x, power_up.y):
-                self.apply_power_up(power_up)
-                self.power_ups.remove(power_up)
-        
-        # Spawn power-ups
-        self.power_up_spawn_timer += delta_time
-        if self.power_up_spawn_timer > 15000:  # Every 15 seconds
-            self.spawn_power_up()
-            self.power_up_spawn_timer = 0
-        
-        # Update power-ups
-        self.update_power_ups()
+        # The simulation applies the rules, the game adds sound, scores and unlocks
+        for event in self.sim.update(delta_time):
+            if event[0] == "eat":
+                self.sound_manager.play_sound("eat")
+                self.food_eaten += 1
+                
+                if self.score > self.game_data.high_score:
+                    self.game_data.high_score = self.score
+                    self.game_data.save_data()
+                    
+            elif event[0] == "power_up":
+                self.power_ups_taken += 1
+                if event[1] == PowerUpType.BONUS_POINTS:
+                    # Check for skin unlocks
+                    if self.score >= 20 and 1 not in self.game_data.unlocked_skins:
+                        self.game_data.unlock_skin(1)
+                    elif self.score >= 50 and 2 not in self.game_data.unlocked_skins:
+                        self.game_data.unlock_skin(2)
+                self.sound_manager.play_sound("powerup")
+                
+            elif event[0] == "game_over":
+                self.game_over()
     
     def game_over(self):
         self.state = GameState.GAME_OVER
         self.sound_manager.play_sound("game_over")
+        self.game_data.record_game(self.score, self.difficulty.value["name"], len(self.snake.segments),
+                                   self.sim.time, self.food_eaten, self.power_ups_taken)
     
-    def draw_game_field(self):
-        # Calculate centering offset
+    def get_field_rect(self) -> pygame.Rect:
+        # Game area centred on the screen
         offset_x = (self.SCREEN_WIDTH - self.GAME_WIDTH) // 2
         offset_y = (self.SCREEN_HEIGHT - self.GAME_HEIGHT) // 2
+        return pygame.Rect(offset_x, offset_y, self.GAME_WIDTH, self.GAME_HEIGHT)
+    
+    def build_field_layers(self):
+        game_rect = self.get_field_rect()
+        self.static_layer = pygame.Surface(self.screen.get_size())
+        self.static_layer.fill((20, 20, 20))  # Dark background around game field
         
         # Draw game background
-        game_rect = pygame.Rect(offset_x, offset_y, self.GAME_WIDTH, self.GAME_HEIGHT)
-        pygame.draw.rect(self.screen, self.theme.bg_color, game_rect)
-        pygame.draw.rect(self.screen, self.theme.text_color, game_rect, 2)
-        
-        # Set up clipping for game area
-        old_clip = self.screen.get_clip()
-        self.screen.set_clip(game_rect)
+        pygame.draw.rect(self.static_layer, self.theme.bg_color, game_rect)
+        pygame.draw.rect(self.static_layer, self.theme.text_color, game_rect, 2)
         
         # Draw obstacles
+        self.static_layer.set_clip(game_rect)
         for obs_x, obs_y in self.obstacles:
-            pygame.draw.rect(self.screen, self.theme.obstacle_color,
-                           [offset_x + obs_x * self.BLOCK_SIZE, 
-                            offset_y + obs_y * self.BLOCK_SIZE,
+            pygame.draw.rect(self.static_layer, self.theme.obstacle_color,
+                           [game_rect.x + obs_x * self.BLOCK_SIZE, 
+                            game_rect.y + obs_y * self.BLOCK_SIZE,
                             self.BLOCK_SIZE, self.BLOCK_SIZE])
+        self.static_layer.set_clip(None)
+        
+        self.backdrop = self.static_layer.copy()
+        self.layers_for = (self.sim, self.theme)
+        self.redraw_snake_layer()
+    
+    def redraw_snake_layer(self):
+        game_rect = self.get_field_rect()
+        self.backdrop.blit(self.static_layer, game_rect, game_rect)
+        self.backdrop.set_clip(game_rect)
+        self.snake.draw(self.backdrop, self.theme, game_rect.topleft)
+        self.backdrop.set_clip(None)
+        self.drawn_segments = deque(self.snake.segments)
+        self.drawn_skin = self.snake.skin
+    
+    def update_field_layers(self) -> Optional[List[pygame.Rect]]:
+        # Bring the backdrop up to date with the simulation. Returns the screen
+        # rects that changed, or None when the layers were rebuilt from scratch
+        if (self.static_layer is None or self.static_layer.get_size() != self.screen.get_size() or
+                self.layers_for != (self.sim, self.theme)):
+            self.build_field_layers()
+            return None
+        
+        game_rect = self.get_field_rect()
+        snake = self.snake
+        segments, drawn = snake.segments, self.drawn_segments
+        
+        # The snake only grows at the head and leaves at the tail, so comparing
+        # the ends of the drawn and current segments finds every changed cell
+        left = []
+        while drawn and drawn[0] is not segments[0]:
+            left.append(drawn.popleft())
+        index = len(segments) - 1
+        while drawn and index >= 0 and segments[index] is not drawn[-1]:
+            index -= 1
+        if not drawn or index < 0 or snake.skin != self.drawn_skin:
+            self.redraw_snake_layer()
+            return [game_rect]
+        added = [segments[i] for i in range(index + 1, len(segments))]
+        if not left and not added:
+            return []
+        
+        offset = game_rect.topleft
+        rects = []
+        self.backdrop.set_clip(game_rect)
+        for segment in left:
+            rect = snake.segment_rect(segment, False, offset)
+            self.backdrop.blit(self.static_layer, rect, rect)
+            rects.append(rect)
+        if added:
+            # The old head turns into a body segment; its larger rect spilled
+            # onto the neighbouring cells, so redraw the snake cells around it
+            old_head = drawn[-1]
+            rect = snake.segment_rect(old_head, True, offset)
+            self.backdrop.blit(self.static_layer, rect, rect)
+            rects.append(rect)
+            head_x, head_y = old_head.to_grid(self.BLOCK_SIZE)
+            for y in range(head_y - 1, head_y + 2):
+                for x in range(head_x - 1, head_x + 2):
+                    if self.sim.board.in_bounds(x, y) and self.sim.board.get(x, y) == Cell.SNAKE:
+                        cell = Position(x * self.BLOCK_SIZE, y * self.BLOCK_SIZE)
+                        snake.draw_segment(self.backdrop, self.theme, cell, False, offset)
+            for segment in added[:-1]:
+                rects.append(snake.draw_segment(self.backdrop, self.theme, segment, False, offset))
+            drawn.extend(added)
+        # Always redraw the head last, the tail cells may have cut into it
+        rects.append(snake.draw_segment(self.backdrop, self.theme, segments[-1], True, offset))
+        self.backdrop.set_clip(None)
+        return [rect.clip(game_rect) for rect in rects]
+    
+    def draw_sprites(self) -> List[pygame.Rect]:
+        # Food and power-ups move or pulse every frame, so they stay off the cached layers
+        game_rect = self.get_field_rect()
+        old_clip = self.screen.get_clip()
+        self.screen.set_clip(game_rect)
         
         # Draw food with pulsing effect
         pulse = (math.sin(pygame.time.get_ticks() * 0.01) + 1) * 0.5
         food_size = self.BLOCK_SIZE + int(pulse * 4)
         food_offset = (self.BLOCK_SIZE - food_size) // 2
-        
-        pygame.draw.rect(self.screen, self.theme.food_color,
-                        [offset_x + self.food_pos.x + food_offset,
-                         offset_y + self.food_pos.y + food_offset,
-                         food_size, food_size])
+        food_rect = pygame.Rect(game_rect.x + self.food_pos.x + food_offset,
+                                game_rect.y + self.food_pos.y + food_offset,
+                                food_size, food_size)
+        pygame.draw.rect(self.screen, self.theme.food_color, food_rect)
+        rects = [food_rect]
         
         # Draw power-ups
         for power_up in self.power_ups:
-            power_up.draw(self.screen, self.theme)
-        
-        # Draw snake (adjust positions for centering)
-        if self.snake:
-            # Temporarily adjust snake positions
-            original_positions = [(seg.x, seg.y) for seg in self.snake.segments]
-            for seg in self.snake.segments:
-                seg.x += offset_x
-                seg.y += offset_y
-            
-            self.snake.draw(self.screen, self.theme)
-            
-            # Restore original positions
-            for i, (x, y) in enumerate(original_positions):
-                self.snake.segments[i].x = x
-                self.snake.segments[i].y = y
+            rects.append(power_up.draw(self.screen, self.theme, game_rect.topleft))
         
-        # Restore clipping
         self.screen.set_clip(old_clip)
+        return [rect.clip(game_rect) for rect in rects]
     
-    def draw_ui(self):
+    def draw_game_field(self):
+        # Full playfield: the cached layers plus the sprites
+        self.update_field_layers()
+        self.screen.blit(self.backdrop, (0, 0))
+        self.sprite_rects = self.draw_sprites()
+    
+    def get_ui_key(self):
+        return (self.score, self.game_data.high_score, tuple(self.active_power_ups), self.SCREEN_WIDTH)
+    
+    def draw_playing_frame(self, full: bool) -> Optional[List[pygame.Rect]]:
+        # Redraw only what changed since the last frame; returns the dirty
+        # rects for pygame.display.update, or None after a full redraw
+        changed = self.update_field_layers()
+        if full or changed is None:
+            self.draw_game_field()
+            self.ui_rect = self.draw_ui()
+            self.ui_key = self.get_ui_key()
+            return None
+        
+        dirty = changed + self.sprite_rects
+        # The UI bar is translucent: restore what is under it before drawing it again
+        ui_dirty = (self.get_ui_key() != self.ui_key or
+                    self.ui_rect.colliderect(self.get_field_rect()))
+        if ui_dirty:
+            dirty.append(self.ui_rect)
+        for rect in dirty:
+            self.screen.blit(self.backdrop, rect, rect)
+        self.sprite_rects = self.draw_sprites()
+        dirty += self.sprite_rects
+        if ui_dirty:
+            self.ui_rect = self.draw_ui()
+            self.ui_key = self.get_ui_key()
+            dirty.append(self.ui_rect)
+        return dirty
+    
+    def draw_ui(self) -> Optional[pygame.Rect]:
+        # Returns the screen area drawn on
         if self.state == GameState.PLAYING or self.state == GameState.PAUSED:
             # Draw overlay UI
             ui_height = 60
             ui_surface = pygame.Surface((self.SCREEN_WIDTH, ui_height))
             ui_surface.set_alpha(180)
             ui_surface.fill(self.theme.ui_bg[:3] if len(self.theme.ui_bg) == 3 else (40, 40, 40))
-            self.screen.blit(ui_surface, (0, 0))
+            ui_rect = self.screen.blit(ui_surface, (0, 0))
             
             # Draw score
             score_text = self.font.render(f"Score: {self.score}", True, self.theme.text_color)
@@ -690,8 +806,10 @@ class EnhancedSnakeGame:
                                                    True, (255, 255, 0))
                 effect_rect = effect_text.get_rect()
                 effect_rect.center = (self.SCREEN_WIDTH // 2, y_offset)
-                self.screen.blit(effect_text, effect_rect)
+                ui_rect.union_ip(self.screen.blit(effect_text, effect_rect))
                 y_offset += 20
+            return ui_rect
+        return None
     
     def draw_menu(self):
         self.screen.fill(self.theme.bg_color)
@@ -814,15 +932,15 @@ class EnhancedSnakeGame:
         # Back button
         self.how_to_play_button.draw(self.screen, self.theme)
     
-    def draw(self):
+    def draw(self) -> Optional[List[pygame.Rect]]:
+        # Returns the dirty rects while playing, None when the whole screen was drawn
+        full = self.state != self.drawn_state
+        self.drawn_state = self.state
         if self.state == GameState.MENU:
             self.draw_menu()
         elif self.state == GameState.PLAYING:
-            self.screen.fill((20, 20, 20))  # Dark background around game field
-            self.draw_game_field()
-            self.draw_ui()
+            return self.draw_playing_frame(full)
         elif self.state == GameState.PAUSED:
-            self.screen.fill((20, 20, 20))
             self.draw_game_field()
             self.draw_ui()
             self.draw_pause_screen()
@@ -832,24 +950,28 @@ class EnhancedSnakeGame:
             self.draw_how_to_play()
     
     def run(self):
-        running = True
-        
-        while running:
-            current_time = pygame.time.get_ticks()
-            delta_time = current_time - self.last_time
-            self.last_time = current_time
-            
-            running = self.handle_events()
-            self.update_game(delta_time)
-            self.draw()
-            
-            pygame.display.flip()
-            self.clock.tick(60)  # 60 FPS
-        
+        try:
+            self.main_loop()
+        finally:
+            self.game_data.close()  # Write pending changes before exiting
         pygame.quit()
+    
+    def main_loop(self):
+        self.loop.run(self.handle_events, self.update_game, self.present, self.FPS, self.clock)
+    
+    def present(self, alpha: float):
+        # Snake moves cell to cell, so frames show the latest step; alpha is unused
+        dirty = self.draw()
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
 
 def main():
-    game = EnhancedSnakeGame()
+    parser = argparse.ArgumentParser(description="Enhanced Snake Game")
+    parser.add_argument("--profile", default="default", help="player profile for scores, skins and stats")
+    args = parser.parse_args()
+    game = EnhancedSnakeGame(args.profile)
     game.run()
 
 if __name__ == "__main__":
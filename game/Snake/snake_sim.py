@@ -0,0 +1,537 @@
+import math
+import random
+from array import array
+from collections import deque
+from enum import Enum
+from dataclasses import dataclass
+from typing import List, Tuple, Optional
+import numpy as np
+
+# Snake game rules without pygame: no display, no sound and no wall clock.
+# Time only moves when update() is called, so a game can run as fast as the
+# CPU allows. SnakeSimulation plays one game exactly like EnhancedSnakeGame;
+# BatchSnakeSimulation plays thousands of boards at once with NumPy.
+
+class Difficulty(Enum):
+    EASY = {"speed": 8, "obstacles": 3, "name": "Easy"}
+    MEDIUM = {"speed": 12, "obstacles": 6, "name": "Medium"}
+    HARD = {"speed": 16, "obstacles": 10, "name": "Hard"}
+
+class PowerUpType(Enum):
+    SLOW_TIME = {"color": (0, 191, 255), "duration": 3000, "name": "Slow Time"}
+    SHRINK = {"color": (255, 165, 0), "duration": 5000, "name": "Shrink"}
+    BONUS_POINTS = {"color": (255, 215, 0), "duration": 0, "name": "Bonus Points"}
+
+MAX_SPEED = 25  # Moves per second that food speed-ups stop at
+SPEED_UP_EVERY = 5  # Points per speed step
+BONUS_POINTS = 5
+MAX_POWER_UPS = 2  # On the board at once
+POWER_UP_SPAWN_INTERVAL = 15000  # ms
+POWER_UP_LIFETIME = 10000  # ms
+
+@dataclass
+class Position:
+    x: float
+    y: float
+
+    def to_grid(self, block_size: int) -> Tuple[int, int]:
+        return (int(self.x // block_size), int(self.y // block_size))
+
+class Cell:
+    EMPTY = 0
+    SNAKE = 1
+    OBSTACLE = 2
+    FOOD = 3
+    POWER_UP = 4
+
+class Board:
+    # Occupancy grid: one byte per cell saying what is on it, plus every empty
+    # cell in a list (with each cell's slot in that list) so marking a cell and
+    # picking a random free one are O(1) however full the board is
+    def __init__(self, cols: int, rows: int):
+        self.cols = cols
+        self.rows = rows
+        self.cells = bytearray(cols * rows)
+        self.free = list(range(cols * rows))
+        self.slot = array('i', range(cols * rows))
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.cols + x
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def get(self, x: int, y: int) -> int:
+        return self.cells[y * self.cols + x]
+
+    def set(self, x: int, y: int, kind: int):
+        index = y * self.cols + x
+        was_empty = self.cells[index] == Cell.EMPTY
+        self.cells[index] = kind
+        if was_empty and kind != Cell.EMPTY:
+            # Swap the last free cell into this one's slot
+            slot = self.slot[index]
+            last = self.free.pop()
+            if last != index:
+                self.free[slot] = last
+                self.slot[last] = slot
+            self.slot[index] = -1
+        elif not was_empty and kind == Cell.EMPTY:
+            self.slot[index] = len(self.free)
+            self.free.append(index)
+
+    def clear(self, x: int, y: int, kind: Optional[int] = None):
+        # With a kind, only clear the cell if that is still what is on it
+        if kind is None or self.get(x, y) == kind:
+            self.set(x, y, Cell.EMPTY)
+
+    def random_free(self, rng=random) -> Optional[Tuple[int, int]]:
+        if not self.free:
+            return None
+        y, x = divmod(rng.choice(self.free), self.cols)
+        return x, y
+
+class PowerUp:
+    def __init__(self, x: int, y: int, power_type: PowerUpType, block_size: int, spawn_time: float = 0):
+        self.x = x
+        self.y = y
+        self.type = power_type
+        self.block_size = block_size
+        self.spawn_time = spawn_time
+        self.lifetime = POWER_UP_LIFETIME
+
+    def is_expired(self, now: float) -> bool:
+        return now - self.spawn_time > self.lifetime
+
+class Snake:
+    def __init__(self, start_x: float, start_y: float, block_size: int, board: Board):
+        self.block_size = block_size
+        self.board = board
+        # Tail first, head last; a deque so the tail leaves in O(1)
+        self.segments = deque([
+            Position(start_x - 2 * block_size, start_y),
+            Position(start_x - block_size, start_y),
+            Position(start_x, start_y)
+        ])
+        for segment in self.segments:
+            self.board.set(*segment.to_grid(block_size), Cell.SNAKE)
+        self.entered = Cell.EMPTY  # What was on the cell the head last moved onto
+        self.direction = Position(1, 0)
+        self.next_direction = Position(1, 0)
+        self.speed = 200.0  # pixels per second
+        self.move_timer = 0
+        self.move_interval = 1000 / 10  # 10 moves per second initially
+        self.growing = False
+        self.skin = 0  # Current skin index
+
+    def update(self, delta_time: float):
+        self.move_timer += delta_time
+
+        if self.move_timer >= self.move_interval:
+            # Update direction
+            if (self.next_direction.x != -self.direction.x or
+                self.next_direction.y != -self.direction.y):
+                self.direction = self.next_direction
+
+            # Move snake
+            head = self.segments[-1]
+            new_head = Position(
+                head.x + self.direction.x * self.block_size,
+                head.y + self.direction.y * self.block_size
+            )
+            # The tail moves out before the head moves in, so chasing the tail is safe
+            if not self.growing:
+                self.release(self.segments.popleft())
+            else:
+                self.growing = False
+
+            self.segments.append(new_head)
+            head_x, head_y = new_head.to_grid(self.block_size)
+            if self.board.in_bounds(head_x, head_y):
+                self.entered = self.board.get(head_x, head_y)
+                self.board.set(head_x, head_y, Cell.SNAKE)
+
+            # Keep the leftover time so the move rate does not drift with frame timing
+            self.move_timer %= self.move_interval
+
+    def set_direction(self, direction: Position):
+        # Prevent moving into itself
+        if len(self.segments) > 1:
+            if (direction.x != -self.direction.x or direction.y != -self.direction.y):
+                self.next_direction = direction
+        else:
+            self.next_direction = direction
+
+    def grow(self):
+        self.growing = True
+
+    def shrink(self):
+        if len(self.segments) > 3:
+            self.release(self.segments.popleft())
+
+    def release(self, segment: Position):
+        x, y = segment.to_grid(self.block_size)
+        if self.board.in_bounds(x, y):
+            self.board.clear(x, y, Cell.SNAKE)
+
+    def set_speed(self, speed: float):
+        self.move_interval = 1000 / speed
+
+    def check_self_collision(self) -> bool:
+        return self.entered == Cell.SNAKE
+
+    def check_wall_collision(self, width: int, height: int) -> bool:
+        head = self.segments[-1]
+        return (head.x < 0 or head.x >= width or
+                head.y < 0 or head.y >= height)
+
+    def check_obstacle_collision(self) -> bool:
+        return self.entered == Cell.OBSTACLE
+
+class SnakeSimulation:
+    # One game of Snake. update() advances it by some milliseconds and step()
+    # by exactly one snake move; both return the events that happened, as
+    # ("eat",), ("power_up", PowerUpType) and ("game_over",) tuples, so a
+    # front end can play sounds and save scores. snake_class and
+    # power_up_class let the pygame game plug in its drawable subclasses.
+    def __init__(self, difficulty: Difficulty = Difficulty.MEDIUM, width: int = 640, height: int = 480,
+                 block_size: int = 20, seed: Optional[int] = None, snake_class=Snake, power_up_class=PowerUp):
+        self.difficulty = difficulty
+        self.width = width
+        self.height = height
+        self.block_size = block_size
+        self.rng = random.Random(seed)
+        self.snake_class = snake_class
+        self.power_up_class = power_up_class
+        self.reset()
+
+    def reset(self):
+        self.time = 0.0  # Simulated ms since the game started
+        self.score = 0
+        self.over = False
+        self.steps = 0
+        self.events = []
+
+        # Initialize board and snake
+        self.board = Board(self.width // self.block_size, self.height // self.block_size)
+        start_x = self.width // 2
+        start_y = self.height // 2
+        self.snake = self.snake_class(start_x, start_y, self.block_size, self.board)
+        self.snake.set_speed(self.difficulty.value["speed"])
+
+        self.food_pos = Position(0, 0)
+        self.obstacles = []
+        self.power_ups = []
+        self.active_power_ups = {}
+        self.power_up_spawn_timer = 0
+
+        self.generate_obstacles()
+        self.generate_food()
+
+    def set_direction(self, dx: int, dy: int):
+        self.snake.set_direction(Position(dx, dy))
+
+    def generate_obstacles(self):
+        self.obstacles = []
+        # Obstacles, food and power-ups only ever spawn on free board cells
+        for _ in range(self.difficulty.value["obstacles"]):
+            cell = self.board.random_free(self.rng)
+            if cell:
+                self.board.set(*cell, Cell.OBSTACLE)
+                self.obstacles.append(cell)
+
+    def generate_food(self):
+        cell = self.board.random_free(self.rng)
+        if cell is None:
+            # The snake fills every free cell, nothing left to eat
+            self.end_game()
+            return
+        self.board.set(*cell, Cell.FOOD)
+        self.food_pos = Position(cell[0] * self.block_size, cell[1] * self.block_size)
+
+    def spawn_power_up(self):
+        if len(self.power_ups) < MAX_POWER_UPS:
+            cell = self.board.random_free(self.rng)
+            if cell:
+                self.board.set(*cell, Cell.POWER_UP)
+                power_type = self.rng.choice(list(PowerUpType))
+                self.power_ups.append(self.power_up_class(cell[0], cell[1], power_type, self.block_size,
+                                                          self.time))
+
+    def apply_power_up(self, power_up: PowerUp):
+        if power_up.type == PowerUpType.SLOW_TIME:
+            self.snake.set_speed(self.difficulty.value["speed"] * 0.5)
+            self.active_power_ups["slow_time"] = self.time + power_up.type.value["duration"]
+
+        elif power_up.type == PowerUpType.SHRINK:
+            self.snake.shrink()
+            self.active_power_ups["shrink"] = self.time + power_up.type.value["duration"]
+
+        elif power_up.type == PowerUpType.BONUS_POINTS:
+            self.score += BONUS_POINTS
+
+        self.events.append(("power_up", power_up.type))
+
+    def update_power_ups(self):
+        # Remove expired power-ups from world
+        for power_up in [pu for pu in self.power_ups if pu.is_expired(self.time)]:
+            self.board.clear(power_up.x, power_up.y, Cell.POWER_UP)
+            self.power_ups.remove(power_up)
+
+        # Check active power-up expiration
+        expired_effects = [effect for effect, end_time in self.active_power_ups.items() if self.time > end_time]
+        for effect in expired_effects:
+            del self.active_power_ups[effect]
+            if effect == "slow_time":
+                self.snake.set_speed(self.difficulty.value["speed"])
+
+    def end_game(self):
+        if not self.over:
+            self.over = True
+            self.events.append(("game_over",))
+
+    def update(self, delta_time: float) -> List[tuple]:
+        self.events = []
+        if self.over:
+            return self.events
+        self.time += delta_time
+
+        # Update snake
+        moves = self.snake.move_timer + delta_time >= self.snake.move_interval
+        self.snake.update(delta_time)
+        if moves:
+            self.steps += 1
+
+        # Check collisions
+        if (self.snake.check_wall_collision(self.width, self.height) or
+            self.snake.check_self_collision() or
+            self.snake.check_obstacle_collision()):
+            self.end_game()
+            return self.events
+
+        # Check food collision
+        head = self.snake.segments[-1]
+        if (int(head.x) == int(self.food_pos.x) and int(head.y) == int(self.food_pos.y)):
+            self.snake.grow()
+            self.score += 1
+            self.events.append(("eat",))
+
+            self.generate_food()
+
+            # Increase speed slightly
+            current_speed = self.difficulty.value["speed"] + (self.score // SPEED_UP_EVERY)
+            if "slow_time" not in self.active_power_ups:
+                self.snake.set_speed(min(current_speed, MAX_SPEED))
+
+        # Check power-up collisions
+        head_grid = (int(head.x // self.block_size), int(head.y // self.block_size))
+        for power_up in self.power_ups[:]:
+            if head_grid == (power_up.x, power_up.y):
+                self.apply_power_up(power_up)
+                self.power_ups.remove(power_up)
+
+        # Spawn power-ups
+        self.power_up_spawn_timer += delta_time
+        if self.power_up_spawn_timer > POWER_UP_SPAWN_INTERVAL:
+            self.spawn_power_up()
+            self.power_up_spawn_timer = 0
+
+        # Update power-ups
+        self.update_power_ups()
+        return self.events
+
+    def step(self, direction: Optional[Tuple[int, int]] = None) -> List[tuple]:
+        # Turn (optionally) and advance to the snake's next move
+        if direction:
+            self.set_direction(*direction)
+        delta = max(0.0, self.snake.move_interval - self.snake.move_timer)
+        # The subtraction can round so that move_timer + delta lands an ulp short
+        while self.snake.move_timer + delta < self.snake.move_interval:
+            delta = math.nextafter(delta, math.inf)
+        return self.update(delta)
+
+
+# Batched boards: directions are indices into DIRECTIONS (right, down, left,
+# up) and cells are flat indices y * cols + x
+DIRECTIONS = np.array([(1, 0), (0, 1), (-1, 0), (0, -1)], dtype=np.int32)
+KEEP_DIRECTION = -1
+_POWER_UP_TYPES = list(PowerUpType)
+_SLOW, _SHRINK, _BONUS = (_POWER_UP_TYPES.index(t) for t in
+                          (PowerUpType.SLOW_TIME, PowerUpType.SHRINK, PowerUpType.BONUS_POINTS))
+
+class BatchSnakeSimulation:
+    # Many independent Snake games stepped together, one snake move per
+    # step() on every live board. The rules are those of SnakeSimulation.step:
+    # timers (power-up spawning, lifetimes and effects) advance by each
+    # board's own move interval, so speed-ups and slow time play out in
+    # simulated milliseconds exactly as in a real game. Boards are NumPy
+    # arrays, so the cost per step hardly depends on how many there are.
+    def __init__(self, count: int, difficulty: Difficulty = Difficulty.MEDIUM, cols: int = 32, rows: int = 24,
+                 seed: Optional[int] = None):
+        self.count = count
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.difficulty = difficulty
+        self.rng = np.random.default_rng(seed)
+        n = count
+        self.grid = np.zeros((n, self.cells), dtype=np.uint8)
+        # Segment cells in a ring buffer per board, head at (tail + length - 1)
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.tail = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.growing = np.zeros(n, dtype=bool)
+        self.alive = np.zeros(n, dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.move_interval = np.zeros(n, dtype=np.float64)
+        self.time = np.zeros(n, dtype=np.float64)
+        self.spawn_timer = np.zeros(n, dtype=np.float64)
+        self.slow_until = np.full(n, -1.0)  # End time of slow time, -1 when not active
+        # Power-ups on the board: cell (-1 for an empty slot), type and spawn time
+        self.power_up_cell = np.full((n, MAX_POWER_UPS), -1, dtype=np.int64)
+        self.power_up_type = np.zeros((n, MAX_POWER_UPS), dtype=np.int64)
+        self.power_up_time = np.zeros((n, MAX_POWER_UPS), dtype=np.float64)
+        self.reset()
+
+    @property
+    def heads(self) -> np.ndarray:
+        return self.body[np.arange(self.count), (self.tail + self.length - 1) % self.cells]
+
+    def reset(self, boards: Optional[np.ndarray] = None):
+        # Start new games on the given boards (a bool mask or indices; default all)
+        if boards is None:
+            boards = np.arange(self.count)
+        boards = np.asarray(boards)
+        if boards.dtype == bool:
+            boards = np.flatnonzero(boards)
+        if len(boards) == 0:
+            return
+        self.grid[boards] = Cell.EMPTY
+        # Same start as SnakeSimulation: three cells heading right, head in the middle
+        head_x, head_y = self.cols // 2, self.rows // 2
+        start = head_y * self.cols + head_x + np.arange(-2, 1)
+        self.body[boards, :3] = start
+        self.grid[boards[:, None], start] = Cell.SNAKE
+        self.tail[boards] = 0
+        self.length[boards] = 3
+        self.direction[boards] = 0
+        self.growing[boards] = False
+        self.alive[boards] = True
+        self.score[boards] = 0
+        self.steps[boards] = 0
+        self.move_interval[boards] = 1000 / self.difficulty.value["speed"]
+        self.time[boards] = 0
+        self.spawn_timer[boards] = 0
+        self.slow_until[boards] = -1
+        self.power_up_cell[boards] = -1
+        for _ in range(self.difficulty.value["obstacles"]):
+            self.place(boards, Cell.OBSTACLE)
+        self.food[boards] = self.place(boards, Cell.FOOD)
+
+    def place(self, boards: np.ndarray, kind: int) -> np.ndarray:
+        # Put `kind` on a uniformly random free cell of each board; -1 where none is free
+        keys = self.rng.random((len(boards), self.cells))
+        keys[self.grid[boards] != Cell.EMPTY] = -1
+        cells = keys.argmax(axis=1)
+        full = keys[np.arange(len(boards)), cells] < 0
+        cells[full] = -1
+        placed = boards[~full]
+        self.grid[placed, cells[~full]] = kind
+        return cells
+
+    def release_tails(self, boards: np.ndarray):
+        cells = self.body[boards, self.tail[boards]]
+        self.grid[boards, cells] = Cell.EMPTY
+        self.tail[boards] = (self.tail[boards] + 1) % self.cells
+        self.length[boards] -= 1
+
+    def step(self, actions: Optional[np.ndarray] = None) -> np.ndarray:
+        # Move every live board once; actions are DIRECTIONS indices or KEEP_DIRECTION.
+        # Returns a bool mask of the boards whose game ended on this step.
+        live = np.flatnonzero(self.alive)
+        if actions is not None:
+            turn = np.asarray(actions)[live]
+            # A snake cannot reverse into itself
+            ok = (turn != KEEP_DIRECTION) & (turn != (self.direction[live] + 2) % 4)
+            self.direction[live[ok]] = turn[ok]
+
+        delta = self.move_interval[live]
+        self.time[live] += delta
+        self.steps[live] += 1
+        heads = self.body[live, (self.tail[live] + self.length[live] - 1) % self.cells]
+        step = DIRECTIONS[self.direction[live]]
+        x = heads % self.cols + step[:, 0]
+        y = heads // self.cols + step[:, 1]
+        inside = (x >= 0) & (x < self.cols) & (y >= 0) & (y < self.rows)
+        new_heads = np.where(inside, y * self.cols + x, 0)
+
+        # The tail moves out before the head moves in (unless the snake is growing)
+        self.release_tails(live[~self.growing[live]])
+        self.growing[live] = False
+        entered = self.grid[live, new_heads]
+        dead = ~inside | (entered == Cell.SNAKE) | (entered == Cell.OBSTACLE)
+        ended = np.zeros(self.count, dtype=bool)
+        ended[live[dead]] = True
+        self.alive[live[dead]] = False
+
+        moved, new_heads, entered, delta = live[~dead], new_heads[~dead], entered[~dead], delta[~dead]
+        self.body[moved, (self.tail[moved] + self.length[moved]) % self.cells] = new_heads
+        self.length[moved] += 1
+        self.grid[moved, new_heads] = Cell.SNAKE
+
+        # Food: grow on the next move, score, new food, speed up unless slowed
+        ate = entered == Cell.FOOD
+        eaters = moved[ate]
+        self.growing[eaters] = True
+        self.score[eaters] += 1
+        self.food[eaters] = self.place(eaters, Cell.FOOD)
+        full = eaters[self.food[eaters] < 0]
+        ended[full] = True
+        self.alive[full] = False
+        fast = eaters[self.slow_until[eaters] < 0]
+        speed = np.minimum(self.difficulty.value["speed"] + self.score[fast] // SPEED_UP_EVERY, MAX_SPEED)
+        self.move_interval[fast] = 1000 / speed
+
+        # Power-ups the head moved onto
+        picked = entered == Cell.POWER_UP
+        hits = moved[picked]
+        if len(hits):
+            slot = (self.power_up_cell[hits] == new_heads[picked][:, None]).argmax(axis=1)
+            kind = self.power_up_type[hits, slot]
+            self.power_up_cell[hits, slot] = -1
+            slowed = hits[kind == _SLOW]
+            self.move_interval[slowed] = 1000 / (self.difficulty.value["speed"] * 0.5)
+            self.slow_until[slowed] = self.time[slowed] + PowerUpType.SLOW_TIME.value["duration"]
+            shrunk = hits[(kind == _SHRINK) & (self.length[hits] > 3)]
+            self.release_tails(shrunk)
+            self.score[hits[kind == _BONUS]] += BONUS_POINTS
+
+        # Spawn power-ups every POWER_UP_SPAWN_INTERVAL ms, at most MAX_POWER_UPS at once
+        self.spawn_timer[moved] += delta
+        due = moved[self.spawn_timer[moved] > POWER_UP_SPAWN_INTERVAL]
+        self.spawn_timer[due] = 0
+        slots = self.power_up_cell[due] < 0
+        due, slot = due[slots.any(axis=1)], slots[slots.any(axis=1)].argmax(axis=1)
+        cells = self.place(due, Cell.POWER_UP)
+        placed = cells >= 0
+        due, slot, cells = due[placed], slot[placed], cells[placed]
+        self.power_up_cell[due, slot] = cells
+        self.power_up_type[due, slot] = self.rng.integers(len(_POWER_UP_TYPES), size=len(due))
+        self.power_up_time[due, slot] = self.time[due]
+
+        # Expire power-ups lying around too long, and slow time
+        expired = (self.power_up_cell[moved] >= 0) & (
+            self.time[moved, None] - self.power_up_time[moved] > POWER_UP_LIFETIME)
+        boards, slot = np.nonzero(expired)
+        boards = moved[boards]
+        cells = self.power_up_cell[boards, slot]
+        still = self.grid[boards, cells] == Cell.POWER_UP
+        self.grid[boards[still], cells[still]] = Cell.EMPTY
+        self.power_up_cell[boards, slot] = -1
+        recovered = moved[(self.slow_until[moved] >= 0) & (self.time[moved] > self.slow_until[moved])]
+        self.slow_until[recovered] = -1
+        self.move_interval[recovered] = 1000 / self.difficulty.value["speed"]
+        return ended
@@ -0,0 +1,212 @@
+"""Procedural sound effects rendered with NumPy for pygame.sndarray.
+
+A sound is a list of notes played one after another; a note is a tone or a
+chord with a waveform, a volume, an attack/release envelope and an optional
+pitch slide. ``render`` turns a sound into float samples in [-1, 1] and
+``SoundBank`` turns a dict of named sounds into pygame Sounds in the mixer's
+own format, caching the rendered samples on disk so the next start (or
+another game asking for the same bank) only reads one small file:
+
+    bank = SoundBank({"eat": [note(800, 0.1)], "win": [chord([523, 659, 784], 0.4)]})
+    sounds = bank.load()  # {"eat": pygame.mixer.Sound, "win": ...}
+
+Banks are cached by a hash of their notes and the mixer format, so editing a
+sound or opening the mixer at another rate simply renders a new file.
+Shared by the Snake, Endless Runner and escape maze games (the other games
+add this folder to sys.path).
+"""
+import hashlib
+import io
+import json
+import os
+import numpy as np
+
+DEFAULT_SAMPLE_RATE = 22050
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'game-synth')
+CACHE_VERSION = 1  # Bump when rendering changes so old banks are not reused
+WAVEFORMS = ("sine", "square", "triangle", "saw", "noise")
+
+# Mixer sample formats (pygame.mixer.get_init()[1]) and how to store them
+_FORMATS = {
+    -8: (np.int8, 127, 0),
+    8: (np.uint8, 127, 128),
+    -16: (np.int16, 32767, 0),
+    16: (np.uint16, 32767, 32768),
+    -32: (np.float32, 1.0, 0),
+    32: (np.float32, 1.0, 0),
+}
+
+
+def note(frequency, duration, wave="sine", volume=0.125, attack=0.005, release=0.02, slide_to=None):
+    """One tone; ``slide_to`` glides the pitch linearly to that frequency over the note"""
+    return chord([frequency], duration, wave, volume, attack, release, slide_to)
+
+
+def chord(frequencies, duration, wave="sine", volume=0.125, attack=0.005, release=0.02, slide_to=None):
+    """Several tones at once, mixed at equal level (``volume`` is for the whole chord)"""
+    if wave not in WAVEFORMS:
+        raise ValueError(f"unknown waveform {wave!r}, expected one of {', '.join(WAVEFORMS)}")
+    return {
+        "frequencies": [float(f) for f in frequencies],
+        "duration": float(duration),
+        "wave": wave,
+        "volume": float(volume),
+        "attack": float(attack),
+        "release": float(release),
+        "slide": None if slide_to is None else float(slide_to) / float(frequencies[0]),
+    }
+
+
+def rest(duration):
+    """Silence between notes"""
+    return chord([0], duration, volume=0.0)
+
+
+def oscillator(wave, frequency, count, sample_rate, slide=None, seed=0):
+    """``count`` samples of a waveform in [-1, 1]; ``slide`` multiplies the pitch by the end"""
+    if wave == "noise":
+        return np.random.default_rng(seed).uniform(-1.0, 1.0, count).astype(np.float32)
+    if slide is None:
+        phase = np.arange(count, dtype=np.float64) * (frequency / sample_rate)
+    else:
+        # Integrate the instantaneous frequency so the slide has no phase jumps
+        frequencies = np.linspace(frequency, frequency * slide, count)
+        phase = np.cumsum(frequencies / sample_rate) - frequencies[0] / sample_rate
+    phase %= 1.0
+    if wave == "sine":
+        samples = np.sin(2 * np.pi * phase)
+    elif wave == "square":
+        samples = np.where(phase < 0.5, 1.0, -1.0)
+    elif wave == "triangle":
+        samples = 1.0 - 4.0 * np.abs(phase - 0.5)
+    else:  # saw
+        samples = 2.0 * phase - 1.0
+    return samples.astype(np.float32)
+
+
+def envelope(count, sample_rate, attack, release):
+    """Linear fade in and out (keeps notes from clicking)"""
+    gain = np.ones(count, dtype=np.float32)
+    attack_count = min(count, int(attack * sample_rate))
+    release_count = min(count - attack_count, int(release * sample_rate))
+    if attack_count:
+        gain[:attack_count] = np.linspace(0.0, 1.0, attack_count, endpoint=False)
+    if release_count:
+        gain[count - release_count:] *= np.linspace(1.0, 0.0, release_count)
+    return gain
+
+
+def render_note(spec, sample_rate=DEFAULT_SAMPLE_RATE):
+    count = int(spec["duration"] * sample_rate)
+    samples = np.zeros(count, dtype=np.float32)
+    frequencies = [f for f in spec["frequencies"] if f > 0]
+    if not frequencies or not spec["volume"]:
+        return samples
+    for frequency in frequencies:
+        samples += oscillator(spec["wave"], frequency, count, sample_rate, spec["slide"])
+    samples *= envelope(count, sample_rate, spec["attack"], spec["release"])
+    samples *= spec["volume"] / len(frequencies)
+    return samples
+
+
+def render(sound, sample_rate=DEFAULT_SAMPLE_RATE):
+    """Float samples in [-1, 1] for a list of notes played in order"""
+    if not sound:
+        return np.zeros(0, dtype=np.float32)
+    samples = np.concatenate([render_note(spec, sample_rate) for spec in sound])
+    return np.clip(samples, -1.0, 1.0, out=samples)
+
+
+def to_mixer_format(samples, size=-16, channels=2):
+    """Mono float samples as an array pygame.sndarray.make_sound accepts for this mixer format"""
+    dtype, scale, offset = _FORMATS.get(size, _FORMATS[-16])
+    converted = samples * scale + offset
+    if np.issubdtype(dtype, np.integer):
+        converted = np.rint(converted)
+    converted = converted.astype(dtype)
+    if channels > 1:
+        converted = np.repeat(converted[:, None], channels, axis=1)
+    return np.ascontiguousarray(converted)
+
+
+class SoundBank:
+    """A dict of named sounds (name -> list of notes) rendered once and cached on disk.
+
+    ``load`` needs an initialized pygame.mixer and returns {} without one, so
+    games keep running silently when there is no audio device.
+    """
+
+    def __init__(self, sounds, directory=DEFAULT_CACHE_DIR, max_entries=32):
+        self.sounds = sounds
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def key(self, sample_rate, size, channels):
+        text = json.dumps([CACHE_VERSION, sample_rate, size, channels, self.sounds], sort_keys=True)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:20]
+
+    def path(self, sample_rate, size, channels):
+        return os.path.join(self.directory, f"{self.key(sample_rate, size, channels)}.npz")
+
+    def render_arrays(self, sample_rate, size, channels):
+        return {name: to_mixer_format(render(sound, sample_rate), size, channels)
+                for name, sound in self.sounds.items()}
+
+    def arrays(self, sample_rate=DEFAULT_SAMPLE_RATE, size=-16, channels=2):
+        """Rendered arrays for every sound, from the cache when it has this bank"""
+        path = self.path(sample_rate, size, channels)
+        try:
+            with np.load(path) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+            dtype = _FORMATS.get(size, _FORMATS[-16])[0]
+            frame_shape = (channels,) if channels > 1 else ()
+            if set(arrays) != set(self.sounds) or any(array.dtype != dtype or array.shape[1:] != frame_shape
+                                                      for array in arrays.values()):
+                raise ValueError(f"{path} does not hold this bank")
+            os.utime(path)  # Mark as recently used
+            return arrays
+        except FileNotFoundError:
+            pass
+        except Exception:
+            # A damaged or foreign file (truncated, not a zip, wrong arrays) must not stop a game starting
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        arrays = self.render_arrays(sample_rate, size, channels)
+        try:
+            self.store(path, arrays)
+        except OSError:
+            pass  # A read-only or full disk only costs the cache
+        return arrays
+
+    def store(self, path, arrays):
+        os.makedirs(self.directory, exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        # Write then rename, so another game starting up never reads half a bank
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(temp_path, path)
+        self.prune()
+
+    def prune(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith('.npz')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def load(self):
+        """{name: pygame.mixer.Sound} for the current mixer, or {} if the mixer is not running"""
+        import pygame
+
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            return {}
+        arrays = self.arrays(*mixer_format)
+        return {name: pygame.sndarray.make_sound(array) for name, array in arrays.items()}
@@ -1,15 +1,27 @@
 import turtle
 import random
-import heapq
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import threading
 import pygame
 import sys
+import os
 import time
+import queue
+import io
+import base64
+import numpy as np
+
+# The maze engine (grid, generators) is shared with the v2 game
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'escape-maze-v2'))
+from maze_generators import generate_maze
+from maze_solvers import solve, DistanceField
+from maze_grid import WALL
 
 # === GLOBALS ===
 maze = []
+maze_grid = None  # MazeGrid behind maze, used by the solver
+goal_distance = None  # DistanceField to the exit, auto-solve walks down it
 player_x = player_y = 0
 width = height = block_size = 0
 player_size = 0
@@ -17,7 +29,10 @@ run_pygame = False
 pygame_thread = None
 auto_solving = False
 solution_path = []
-pygame_initialized = False
+render_commands = queue.Queue()  # (command, *args) for the render worker: new_maze, reset, auto_solve, quit
+MAZE_AS_IMAGE = True  # Show the maze as one pre-rendered image (falls back to batched turtle drawing)
+maze_image = None  # PhotoImage currently on the turtle canvas (Tk needs the reference kept)
+maze_image_item = None
 
 # === TURTLE SETUP ===
 screen = turtle.Screen()
@@ -39,127 +54,145 @@ screen_width = screen.window_width()
 screen_height = screen.window_height()
 
 # === MAZE FUNCTIONS ===
-def draw_wall(x, y, size):
+def draw_wall(x, y, size, length=1):
+    """Outline of a run of `length` wall blocks starting at turtle position (x, y)"""
     maze_drawer.goto(x, y)
     maze_drawer.pendown()
-    for _ in range(4):
-        maze_drawer.forward(size)
+    for side in (size * length, size, size * length, size):
+        maze_drawer.forward(side)
         maze_drawer.right(90)
     maze_drawer.penup()
 
-def fill_path(x, y, size, scale_factor=0.8):
-    solver.goto(x + size * (1 - scale_factor) / 2, y - size * (1 - scale_factor) / 2)
+def fill_path(x, y, size, scale_factor=0.8, cols=1, rows=1):
+    """Filled marker over a `cols` x `rows` block of cells, inset by the scale factor"""
+    inset = size * (1 - scale_factor) / 2
+    solver.goto(x + inset, y - inset)
     solver.pendown()
-    reduced_size = size * scale_factor
     solver.begin_fill()
-    for _ in range(4):
-        solver.forward(reduced_size)
+    for side in (size * cols - 2 * inset, size * rows - 2 * inset) * 2:
+        solver.forward(side)
         solver.right(90)
     solver.end_fill()
     solver.penup()
 
-def prims_maze(w, h, bs):
-    global maze, start_x, start_y, width, height, block_size
-    width, height, block_size = w, h, bs
-    if width % 2 == 0: width += 1
-    if height % 2 == 0: height += 1
-    maze = [['#' for _ in range(width)] for _ in range(height)]
+def wall_runs(grid):
+    """(row, first column, length) of every horizontal run of wall cells"""
+    walls = ((grid.cells & WALL) != 0).astype(np.int8)
+    padded = np.zeros((grid.height, grid.width + 2), dtype=np.int8)
+    padded[:, 1:-1] = walls
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return zip(rows.tolist(), starts.tolist(), (ends - starts).tolist())
+
+def path_runs(path):
+    """Split a cell path into straight runs: (first cell, last cell) pairs"""
+    runs = []
+    if not path:
+        return runs
+    first = previous = path[0]
+    direction = None
+    for cell in path[1:]:
+        step = (cell[0] - previous[0], cell[1] - previous[1])
+        if direction is not None and step != direction:
+            runs.append((first, previous))
+            first = cell
+            step = None
+        direction = step
+        previous = cell
+    runs.append((first, previous))
+    return runs
+
+def render_maze_image(grid, bs):
+    """The turtle wall drawing (outlined blocks) rasterized with NumPy into a Tk PhotoImage"""
+    walls = (grid.cells & WALL) != 0
+    h, w = walls.shape
+    # An edge between two cells is drawn if a wall block is on either side of it
+    horizontal = np.zeros((h + 1, w), dtype=bool)
+    horizontal[:-1] |= walls
+    horizontal[1:] |= walls
+    vertical = np.zeros((h, w + 1), dtype=bool)
+    vertical[:, :-1] |= walls
+    vertical[:, 1:] |= walls
     
-    # Start from a random odd position
-    start_x = random.randint(1, width // 2) * 2 - 1
-    start_y = random.randint(1, height // 2) * 2 - 1
-    maze[start_y][start_x] = ' '
-    walls = [(start_x, start_y)]
-    directions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
+    # Lattice points touch up to four blocks
+    corners = np.zeros((h + 1, w + 1), dtype=bool)
+    corners[:-1, :-1] |= walls
+    corners[:-1, 1:] |= walls
+    corners[1:, :-1] |= walls
+    corners[1:, 1:] |= walls
     
-    while walls:
-        x, y = random.choice(walls)
-        walls.remove((x, y))
-        random.shuffle(directions)
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < width and 0 <= ny < height and maze[ny][nx] == '#':
-                maze[(y + ny) // 2][(x + nx) // 2] = ' '
-                maze[ny][nx] = ' '
-                walls.append((nx, ny))
+    pixels = np.zeros((h * bs + 1, w * bs + 1), dtype=bool)
+    pixels[::bs, :-1] |= np.repeat(horizontal, bs, axis=1)
+    pixels[:-1, ::bs] |= np.repeat(vertical, bs, axis=0)
+    pixels[::bs, ::bs] |= corners
     
-    # Ensure start and end positions are open
-    maze[height-2][width-2] = ' '  # Bottom-right (start)
-    maze[1][1] = ' '               # Top-left (end)
+    rgb = np.repeat((pixels * 255).astype(np.uint8)[..., None], 3, axis=2)
+    surface = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+    png = io.BytesIO()
+    pygame.image.save(surface, png, "maze.png")
+    return tk.PhotoImage(data=base64.b64encode(png.getvalue()), master=screen.getcanvas())
+
+def draw_maze():
+    """Show the maze: one image on the canvas, or one turtle rectangle per horizontal wall run"""
+    global maze_image, maze_image_item
+    canvas = screen.getcanvas()
+    if maze_image_item is not None:
+        canvas.delete(maze_image_item)
+        maze_image_item = maze_image = None
+    maze_drawer.clear()
+    left = -width * block_size // 2
+    top = height * block_size // 2
     
-    # Create paths to ensure connectivity
-    for i in range(1, width-1):
-        if maze[height-2][i] == '#' and maze[height-2][i-1] == ' ':
-            maze[height-2][i] = ' '
-            break
-    for i in range(1, height-1):
-        if maze[i][1] == '#' and maze[i-1][1] == ' ':
-            maze[i][1] = ' '
-            break
+    if MAZE_AS_IMAGE:
+        try:
+            maze_image = render_maze_image(maze_grid, block_size)
+            # Turtle y points up, canvas y points down
+            maze_image_item = canvas.create_image(left, -top, image=maze_image, anchor='nw')
+            canvas.tag_lower(maze_image_item)
+            screen.update()
+            return
+        except (tk.TclError, pygame.error) as e:
+            print(f"Maze image failed ({e}), drawing with turtle")
+            maze_image = None
     
-    maze_drawer.clear()
-    for row in range(height):
-        for col in range(width):
-            if maze[row][col] == '#':
-                x = -width * block_size // 2 + col * block_size
-                y = height * block_size // 2 - row * block_size
-                draw_wall(x, y, block_size)
+    screen.tracer(0, 0)
+    for row, col, length in wall_runs(maze_grid):
+        draw_wall(left + col * block_size, top - row * block_size, block_size, length)
     screen.update()
 
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+def prims_maze(w, h, bs, algorithm="prim", seed=None):
+    global maze, maze_grid, goal_distance, width, height, block_size
+    block_size = bs
+    
+    # Generated by the shared engine (O(1) frontier removal, start and goal always open)
+    grid = generate_maze(w, h, algorithm, seed)
+    width, height = grid.width, grid.height
+    maze_grid = grid
+    goal_distance = DistanceField(grid, (1, 1))
+    maze = [list(row) for row in grid.to_rows()]
+    draw_maze()
 
 def a_star_solve():
-    global maze, block_size, solution_path
-    width = len(maze[0])
-    height = len(maze)
+    global solution_path
     start = (width - 2, height - 2)  # Bottom-right
     end = (1, 1)                     # Top-left
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
     
-    queue = []
-    heapq.heappush(queue, (0, start))
-    g_cost = {start: 0}
-    parents = {start: None}
+    # Shared flat-index A* (maze_solvers); path runs from start to end
+    solution_path = solve(maze_grid, start, end, "astar")["path"]
     
-    while queue:
-        _, current = heapq.heappop(queue)
-        if current == end:
-            break
-        for dx, dy in directions:
-            neighbor = (current[0] + dx, current[1] + dy)
-            nx, ny = neighbor
-            if 0 <= nx < width and 0 <= ny < height and maze[ny][nx] == ' ':
-                new_g = g_cost[current] + 1
-                if neighbor not in g_cost or new_g < g_cost[neighbor]:
-                    g_cost[neighbor] = new_g
-                    f = new_g + heuristic(neighbor, end)
-                    heapq.heappush(queue, (f, neighbor))
-                    parents[neighbor] = current
-    
-    # Build solution path
-    solution_path = []
-    current = end
-    while current is not None:
-        solution_path.append(current)
-        current = parents.get(current)
-    solution_path.reverse()
-    
-    # Draw solution on turtle canvas
-    current = end
-    while current != start:
-        if current in parents:
-            x, y = current
-            px = -width * block_size // 2 + x * block_size
-            py = height * block_size // 2 - y * block_size
-            fill_path(px, py, block_size)
-            current = parents[current]
-        else:
-            break
+    # Draw solution on turtle canvas, one filled rectangle per straight run
+    screen.tracer(0, 0)
+    for (x0, y0), (x1, y1) in path_runs(solution_path[1:]):
+        px = -width * block_size // 2 + min(x0, x1) * block_size
+        py = height * block_size // 2 - min(y0, y1) * block_size
+        fill_path(px, py, block_size, cols=abs(x1 - x0) + 1, rows=abs(y1 - y0) + 1)
     screen.update()
 
-def is_valid_position(x, y, cell_size, margin=2):
+def is_valid_position(x, y, cell_size, margin=2, rows=None):
     """Check if the position is valid with proper collision detection"""
+    if rows is None:
+        rows = maze
     # Add margin to prevent clipping through walls
     left = x + margin
     right = x + cell_size - margin
@@ -178,100 +211,151 @@ def is_valid_position(x, y, cell_size, margin=2):
         row = int(py // cell_size)
         
         # Check boundaries
-        if col < 0 or col >= width or row < 0 or row >= height:
+        if row < 0 or row >= len(rows) or col < 0 or col >= len(rows[row]):
             return False
         
         # Check if any part touches a wall
-        if maze[row][col] == '#':
+        if rows[row][col] == '#':
             return False
     
     return True
 
+def drain_render_commands():
+    """Drop queued commands meant for a worker that is no longer running"""
+    while True:
+        try:
+            render_commands.get_nowait()
+        except queue.Empty:
+            return
+
+def send_command(name, *args):
+    """Queue a command for the render worker, starting the worker first if it is not running"""
+    global pygame_thread
+    if name == 'quit' and not (pygame_thread and pygame_thread.is_alive()):
+        return
+    if not (pygame_thread and pygame_thread.is_alive()):
+        # Anything queued after the last worker stopped reading (e.g. a 'quit') must not reach the new one
+        drain_render_commands()
+        if name != 'new_maze':
+            if not maze:
+                return
+            # A fresh worker has no window yet, give it the current maze first
+            render_commands.put(('new_maze', maze, maze_grid, goal_distance))
+        pygame_thread = threading.Thread(target=launch_player, daemon=False)
+        pygame_thread.start()
+    render_commands.put((name,) + args)
+
 def stop_pygame():
-    """Safely stop pygame"""
-    global run_pygame, pygame_thread
+    """Ask the render worker to close its window and wait for it"""
     print("Stopping pygame...")
-    run_pygame = False
-    
     if pygame_thread and pygame_thread.is_alive():
-        print("Waiting for pygame thread to stop...")
+        send_command('quit')
         pygame_thread.join(timeout=3)
         if pygame_thread.is_alive():
             print("Warning: Pygame thread didn't stop gracefully")
         else:
             print("Pygame thread stopped successfully")
+
+def render_walls(grid, cell_size):
+    """The maze walls drawn once onto their own surface, one rect per horizontal wall run"""
+    surface = pygame.Surface((grid.width * cell_size, grid.height * cell_size))
+    surface.fill((0, 0, 0))
+    for row, col, length in wall_runs(grid):
+        surface.fill((255, 255, 255), (col * cell_size, row * cell_size, length * cell_size, cell_size))
     
-    # Force quit pygame display
-    try:
-        pygame.display.quit()
-    except:
-        pass
+    # Start and end markers never move either
+    pygame.draw.rect(surface, (0, 255, 0), (cell_size + 2, cell_size + 2, cell_size - 4, cell_size - 4))
+    pygame.draw.rect(surface, (0, 0, 255), ((grid.width - 2) * cell_size + 2, (grid.height - 2) * cell_size + 2,
+                                            cell_size - 4, cell_size - 4))
+    return surface
 
 # === PYGAME PLAYER ===
 def launch_player():
-    global player_x, player_y, run_pygame, auto_solving, solution_path, pygame_initialized
+    """Render worker: owns the pygame window for the whole session and follows render_commands.
+
+    New mazes, resets and auto-solve arrive as commands between frames, so
+    switching mazes only redraws (and resizes the window if the size changed)
+    instead of tearing SDL down and starting a new thread.
+    """
+    global player_x, player_y, run_pygame, auto_solving
     
     try:
-        print(f"Launching pygame player for maze {width}x{height}")
-        
-        # Always reinitialize pygame for new window
-        try:
-            pygame.quit()
-        except:
-            pass
-        
-        pygame.init()
-        pygame_initialized = True
-        
-        win_size = 600
-        cell_size = min(win_size // width, win_size // height)
-        cell_size = max(cell_size, 15)  # Minimum cell size
+        print("Starting pygame render worker")
+        if not pygame.get_init():
+            pygame.init()
         
-        win = pygame.display.set_mode((width * cell_size, height * cell_size))
-        pygame.display.set_caption("Maze Player - Use WASD or Arrow Keys")
+        win = None
+        walls = None
+        rows, w, h, field = [], 0, 0, None
+        cell_size = 15
         
         player_color = (255, 0, 0)
-        # Start at bottom-right position
-        player_x = (width - 2) * cell_size
-        player_y = (height - 2) * cell_size
-        
         speed = 120  # Pixels per second
-        auto_speed = 200
         clock = pygame.time.Clock()
+        font = pygame.font.Font(None, 36)
         run_pygame = True
         
         # Auto-solving variables
-        path_index = 0
         last_move_time = 0
         move_delay = 0.2
-        
-        print(f"Pygame window launched: {width}x{height}, cell_size: {cell_size}")
 
         while run_pygame:
             dt = clock.tick(60) / 1000.0
             current_time = time.time()
             
+            # Apply everything the GUI asked for since the last frame
+            while True:
+                try:
+                    command, *args = render_commands.get_nowait()
+                except queue.Empty:
+                    break
+                if command == 'new_maze':
+                    rows, grid, field = args
+                    w, h = grid.width, grid.height
+                    cell_size = max(min(600 // w, 600 // h), 15)  # Minimum cell size
+                    size = (w * cell_size, h * cell_size)
+                    if win is None or win.get_size() != size:
+                        win = pygame.display.set_mode(size)
+                        pygame.display.set_caption("Maze Player - Use WASD or Arrow Keys")
+                    walls = render_walls(grid, cell_size)
+                    print(f"Pygame showing maze {w}x{h}, cell_size: {cell_size}")
+                if command in ('new_maze', 'reset'):
+                    # Start at bottom-right position
+                    player_x = (w - 2) * cell_size
+                    player_y = (h - 2) * cell_size
+                    auto_solving = False
+                elif command == 'auto_solve':
+                    auto_solving = True
+                elif command == 'quit':
+                    run_pygame = False
+            if not run_pygame:
+                break
+            if win is None:
+                continue
+            
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     run_pygame = False
                     return
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:  # Reset position
-                        player_x = (width - 2) * cell_size
-                        player_y = (height - 2) * cell_size
+                        player_x = (w - 2) * cell_size
+                        player_y = (h - 2) * cell_size
                         auto_solving = False
 
-            if auto_solving and solution_path and len(solution_path) > 1:
-                # Auto-solving mode
-                if current_time - last_move_time > move_delay and path_index < len(solution_path) - 1:
-                    path_index += 1
-                    target_col, target_row = solution_path[path_index]
-                    player_x = target_col * cell_size
-                    player_y = target_row * cell_size
-                    last_move_time = current_time
+            if auto_solving and field:
+                # Auto-solving mode: step downhill on the distance field from wherever the player is
+                if current_time - last_move_time > move_delay:
+                    col = int((player_x + cell_size // 2) // cell_size)
+                    row = int((player_y + cell_size // 2) // cell_size)
+                    target = field.next_step(col, row)
+                    if target:
+                        player_x = target[0] * cell_size
+                        player_y = target[1] * cell_size
+                        last_move_time = current_time
                     
                     # Check if reached the end
-                    if path_index >= len(solution_path) - 1:
+                    if not target or field.distance(*target) == 0:
                         auto_solving = False
                         print("Maze solved!")
             else:
@@ -291,38 +375,21 @@ def launch_player():
                 # Move in X direction
                 if move_x != 0:
                     test_x = player_x + move_x * step_size
-                    if is_valid_position(test_x, player_y, cell_size):
+                    if is_valid_position(test_x, player_y, cell_size, rows=rows):
                         new_x = test_x
                 
                 # Move in Y direction
                 if move_y != 0:
                     test_y = player_y + move_y * step_size
-                    if is_valid_position(new_x, test_y, cell_size):
+                    if is_valid_position(new_x, test_y, cell_size, rows=rows):
                         new_y = test_y
                 
                 player_x = new_x
                 player_y = new_y
 
-            # Draw everything
-            win.fill((0, 0, 0))
-            
-            # Draw maze walls
-            for r in range(height):
-                for c in range(width):
-                    if maze[r][c] == '#':
-                        pygame.draw.rect(win, (255, 255, 255), 
-                                       (c * cell_size, r * cell_size, cell_size, cell_size))
-            
-            # Draw start and end markers
-            end_rect = pygame.Rect(1 * cell_size + 2, 1 * cell_size + 2, 
-                                 cell_size - 4, cell_size - 4)
-            pygame.draw.rect(win, (0, 255, 0), end_rect)  # Green goal
+            # Draw everything: the pre-rendered maze, then the player
+            win.blit(walls, (0, 0))
             
-            start_rect = pygame.Rect((width-2) * cell_size + 2, (height-2) * cell_size + 2, 
-                                   cell_size - 4, cell_size - 4)
-            pygame.draw.rect(win, (0, 0, 255), start_rect)  # Blue start
-            
-            # Draw player
             player_rect = pygame.Rect(int(player_x) + 1, int(player_y) + 1, 
                                     cell_size - 2, cell_size - 2)
             pygame.draw.rect(win, player_color, player_rect)
@@ -332,9 +399,8 @@ def launch_player():
             player_grid_y = int((player_y + cell_size//2) // cell_size)
             if player_grid_x == 1 and player_grid_y == 1:
                 # Draw win message
-                font = pygame.font.Font(None, 36)
                 text = font.render("YOU WIN! Press R to reset", True, (255, 255, 0))
-                text_rect = text.get_rect(center=(width * cell_size // 2, height * cell_size // 2))
+                text_rect = text.get_rect(center=(w * cell_size // 2, h * cell_size // 2))
                 win.blit(text, text_rect)
             
             pygame.display.flip()
@@ -344,8 +410,9 @@ def launch_player():
         import traceback
         traceback.print_exc()
     finally:
-        print("Pygame loop ended")
+        print("Pygame render worker ended")
         run_pygame = False
+        drain_render_commands()
         try:
             pygame.display.quit()
         except:
@@ -361,13 +428,8 @@ def setup_gui():
     root.resizable(True, True)
 
     def generate_action():
-        global pygame_thread, run_pygame, auto_solving, maze
-        
         print("Generate action started...")
         
-        # Stop auto-solving
-        auto_solving = False
-        
         # Get dimensions
         w = simpledialog.askinteger("Width", "Maze width (5-51, odd recommended)", 
                                   minvalue=5, maxvalue=51, initialvalue=21)
@@ -383,12 +445,6 @@ def setup_gui():
         
         print(f"Generating maze {w}x{h}...")
         
-        # Stop previous pygame completely
-        stop_pygame()
-        
-        # Wait a bit more for complete cleanup
-        time.sleep(0.5)
-        
         # Generate new maze
         bs = min(screen_width // (w + 2), screen_height // (h + 2))
         bs = max(bs, 10)
@@ -397,24 +453,16 @@ def setup_gui():
         prims_maze(w, h, bs)
         print("Maze generated successfully")
         
-        # Start new pygame with more delay
-        root.after(500, start_new_pygame)
+        # The running player window just switches to the new maze
+        start_new_pygame()
 
     def start_new_pygame():
-        global pygame_thread, run_pygame
-        print("Starting new pygame...")
-        
         if not maze:
             print("No maze available!")
             return
-            
-        run_pygame = True
-        pygame_thread = threading.Thread(target=launch_player, daemon=False)
-        pygame_thread.start()
-        print("New pygame thread started")
+        send_command('new_maze', maze, maze_grid, goal_distance)
 
     def solve_action():
-        global auto_solving, solution_path
         if not maze:
             messagebox.showwarning("Warning", "Please generate a maze first!")
             return
@@ -423,21 +471,16 @@ def setup_gui():
         a_star_solve()
         
         if solution_path and len(solution_path) > 1:
-            auto_solving = True
+            send_command('auto_solve')
             print("Auto-solving started!")
         else:
             messagebox.showinfo("Info", "No solution found!")
 
     def reset_player():
-        global player_x, player_y, auto_solving
-        auto_solving = False
-        if width > 0 and height > 0:
-            cell_size = min(600 // width, 600 // height)
-            player_x = (width - 2) * cell_size
-            player_y = (height - 2) * cell_size
+        if maze:
+            send_command('reset')
 
     def quit_application():
-        global run_pygame
         print("Quitting application...")
         stop_pygame()
         try:
@@ -470,6 +513,7 @@ def setup_gui():
         print(f"Debug - pygame_thread alive: {pygame_thread.is_alive() if pygame_thread else 'None'}")
         print(f"Debug - maze size: {len(maze)}x{len(maze[0]) if maze else 0}")
         print(f"Debug - width x height: {width}x{height}")
+        print(f"Debug - queued render commands: {render_commands.qsize()}")
         if not run_pygame and maze:
             print("Manually starting pygame...")
             start_new_pygame()
@@ -1,14 +1,35 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 import pygame
 import random
-import heapq
 import threading
 import time
 import sys
 import os
 import math
 import json
+from collections import deque
+import numpy as np
+import maze_generators
+import maze_solvers
+from maze_generators import ALGORITHMS, DEFAULT_ALGORITHM
+from maze_grid import WALL, JUNCTION, OPEN_LEFT, OPEN_RIGHT, OPEN_UP, OPEN_DOWN, MIN_MAZE_SIZE, MAX_MAZE_SIZE, fog_stencil
+from maze_render import MazeTileCache, MinimapSurface, radial_alpha, alpha_surface
+from maze_stream import StreamingMaze
+from maze_jobs import GenerationJob
+from maze_io import MazeCache, save_maze, load_maze
+
+# The sound synth is shared with the Snake game
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Snake'))
+import synth
+
+MAZE_SOUNDS = {
+    "question": [synth.note(660, 0.08), synth.note(880, 0.1)],
+    "correct": [synth.note(523, 0.08), synth.chord([659, 784], 0.2, release=0.08)],
+    "wrong": [synth.note(200, 0.3, wave="square", volume=0.05, slide_to=140, release=0.1)],
+    "win": [synth.note(523, 0.12), synth.note(659, 0.12), synth.note(784, 0.12),
+            synth.chord([523, 659, 784, 1047], 0.6, release=0.3)],
+}
 
 class QuestionSystem:
     def __init__(self):
@@ -190,10 +211,26 @@ class QuestionSystem:
         """Get a random question from the pool"""
         return random.choice(self.questions)
 
+# Connectivity bit that must be set on the current cell to move in each direction
+DIRECTION_BITS = {
+    'left': OPEN_LEFT,
+    'right': OPEN_RIGHT,
+    'forward': OPEN_UP,
+    'backward': OPEN_DOWN
+}
+
+# Movement keys (Tk keysyms) and the direction each one moves
+KEY_DIRECTIONS = {
+    'Left': 'left', 'a': 'left', 'A': 'left',
+    'Right': 'right', 'd': 'right', 'D': 'right',
+    'Up': 'forward', 'w': 'forward', 'W': 'forward',
+    'Down': 'backward', 's': 'backward', 'S': 'backward',
+}
+
 class MazeGame:
     def __init__(self):
         # Game state
-        self.maze = []
+        self.maze = None  # MazeGrid once generated
         self.width = 0
         self.height = 0
         self.cell_size = 32  # Increased default cell size for zoomed view
@@ -202,7 +239,40 @@ class MazeGame:
         self.solution_path = []
         self.show_solution = False
         self.generating = False
+        self.generation_job = None  # maze_jobs.GenerationJob while a maze is being built
+        self.maze_cache = MazeCache()  # Big generated mazes on disk, reused when the seed repeats
+        self.solving = False  # A solver thread is running (see solve_maze)
+        self.solve_stats = None  # Result dict of the last solve, without the path
+        self.distance_field = None  # maze_solvers.DistanceField to the goal (None in endless mode)
         self.game_running = False
+        self.maze_seed = None  # Seed and algorithm of the current maze (regenerates the same layout)
+        self.maze_algorithm = DEFAULT_ALGORITHM
+        self.endless_mode = False  # Maze is a StreamingMaze window that grows downward forever
+        
+        # Redraw scheduler: frames are only rendered when something asked for one
+        self.FRAME_INTERVAL_MS = 16  # Frame rate cap (~60 FPS) while things change
+        self.IDLE_POLL_MS = 250  # Pygame event poll interval when nothing needs drawing
+        self.redraw_reasons = set()  # Why the next frame is needed (see request_redraw)
+        self.frame_after_id = None
+        self.frame_idle = False  # The pending tick is the slow idle poll
+        self.last_frame_time = 0.0
+        self.frame_times = deque(maxlen=600)  # render_game durations in ms
+        self.frames_rendered = 0
+        self.idle_ticks = 0
+        
+        # Input buffer: key events only record which directions are held, and
+        # process_input applies at most one movement step per tick
+        self.INPUT_TICK_MS = 16  # Simulation tick while movement keys are held
+        self.MOVE_REPEAT_DELAY_MS = 170  # Holding a direction repeats after this long...
+        self.MOVE_REPEAT_MS = 90  # ...then moves one cell every MOVE_REPEAT_MS
+        self.MOVE_ANIMATION_MS = 80  # Glide time between cells (0 jumps straight there)
+        self.held_directions = []  # Held movement directions, most recently pressed last
+        self.queued_moves = deque(maxlen=2)  # Presses not applied yet, so a quick tap still moves
+        self.key_release_times = {}  # Last release per direction (X11 key repeat sends release+press)
+        self.next_repeat_time = 0.0
+        self.input_after_id = None
+        self.move_from = (0, 0)  # Pixel position the player is gliding from
+        self.move_started = 0.0
         
         # Camera system
         self.camera_x = 0
@@ -215,8 +285,9 @@ class MazeGame:
         self.light_radius = 200
         self.darkness_color = (0, 0, 0, 255)  # RGBA - semi-transparent black
         self.light_fade = 1.5  # Controls smooth gradient spread
-        self.light_overlay = None
+        self.light_overlay = None  # Viewport-sized darkness, blitted only outside the light
         self.light_surface = None
+        self.darkness_patch = None  # Darkness with the light cut out, blitted around the player
         
         # Minimap system
         self.minimap_expanded = False
@@ -232,8 +303,12 @@ class MazeGame:
         self.UNEXPLORED_TILE_OPACITY = 15  # Nearly black for unexplored areas
         
         # Fog of war system
-        self.explored_map = None  # Stores exploration data as 2D array of opacity values
+        self.explored_map = None  # Stores exploration data as 2D uint8 array of opacity values (self.maze.explored)
         self.fog_surface = None  # Surface for rendering fog overlay
+        
+        # Pre-rendered maze chunks and minimap (rebuilt lazily whenever self.maze is replaced)
+        self.tile_cache = None
+        self.minimap_surface = None
         self.visibility_surface = None  # Pre-rendered visibility gradient
         
         # Focus management
@@ -243,6 +318,7 @@ class MazeGame:
         self.pygame_surface = None
         self.game_canvas = None
         self.clock = None
+        self.sounds = {}
         
         # QUESTION SYSTEM
         self.question_system = QuestionSystem()
@@ -269,6 +345,7 @@ class MazeGame:
         
         # Bind global key events to the root window
         self.root.bind('<Key>', self.handle_tkinter_key_event)
+        self.root.bind('<KeyRelease>', self.handle_tkinter_key_release)
         self.root.focus_set()
         
         # Main container
@@ -326,6 +403,26 @@ class MazeGame:
                                   state='disabled')
         self.reset_btn.pack(pady=10)
         
+        # Save / load buttons
+        file_frame = tk.Frame(control_frame, bg='#34495e')
+        file_frame.pack(pady=5)
+        self.save_btn = tk.Button(file_frame,
+                                 text="💾 Save",
+                                 command=self.save_maze_clicked,
+                                 font=('Arial', 10, 'bold'),
+                                 bg='#8e44ad', fg='white',
+                                 relief='raised', bd=3,
+                                 width=9,
+                                 state='disabled')
+        self.save_btn.pack(side='left', padx=5)
+        tk.Button(file_frame,
+                  text="📂 Load",
+                  command=self.load_maze_clicked,
+                  font=('Arial', 10, 'bold'),
+                  bg='#8e44ad', fg='white',
+                  relief='raised', bd=3,
+                  width=9).pack(side='left', padx=5)
+        
         # Status label
         self.status_label = tk.Label(control_frame,
                                     text="Ready to generate maze...",
@@ -365,12 +462,55 @@ class MazeGame:
         self.height_entry.bind('<FocusIn>', self.on_entry_focus_in)
         self.height_entry.bind('<FocusOut>', self.on_entry_focus_out)
         
-        tk.Label(settings_frame, text="(5-100, camera follows player)", 
+        tk.Label(settings_frame, text=f"({MIN_MAZE_SIZE}-{MAX_MAZE_SIZE}, camera follows player)", 
                 font=('Arial', 8), fg='#bdc3c7', bg='#34495e').pack(pady=2)
         
+        # Seed (same seed, size and algorithm = same maze)
+        tk.Label(settings_frame, text="Seed (blank = random):", 
+                font=('Arial', 9), fg='#ecf0f1', bg='#34495e').pack()
+        
+        self.seed_var = tk.StringVar(value="")
+        self.seed_entry = tk.Entry(settings_frame, textvariable=self.seed_var,
+                              width=12, justify='center')
+        self.seed_entry.pack(pady=2)
+        self.seed_entry.bind('<FocusIn>', self.on_entry_focus_in)
+        self.seed_entry.bind('<FocusOut>', self.on_entry_focus_out)
+        
+        # Generation algorithm
+        tk.Label(settings_frame, text="Algorithm:", 
+                font=('Arial', 9), fg='#ecf0f1', bg='#34495e').pack()
+        
+        self.algorithm_var = tk.StringVar(value=DEFAULT_ALGORITHM)
+        algorithm_menu = tk.OptionMenu(settings_frame, self.algorithm_var, *ALGORITHMS)
+        algorithm_menu.config(font=('Arial', 9), width=12)
+        algorithm_menu.pack(pady=2)
+        
+        # Build big mazes in a separate process so Tk keeps the GIL
+        self.process_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(settings_frame, text="Generate in background process",
+                      variable=self.process_var,
+                      font=('Arial', 9), fg='#ecf0f1', bg='#34495e',
+                      selectcolor='#2c3e50', activebackground='#34495e').pack(pady=2)
+        
+        # Endless mode streams rows as you go (height is ignored)
+        self.endless_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(settings_frame, text="Endless mode",
+                      variable=self.endless_var,
+                      font=('Arial', 9), fg='#ecf0f1', bg='#34495e',
+                      selectcolor='#2c3e50', activebackground='#34495e').pack(pady=2)
+        
+        # Solver ("auto" picks by maze size, see maze_solvers.pick_solver)
+        tk.Label(settings_frame, text="Solver:", 
+                font=('Arial', 9), fg='#ecf0f1', bg='#34495e').pack()
+        
+        self.solver_var = tk.StringVar(value="auto")
+        solver_menu = tk.OptionMenu(settings_frame, self.solver_var, "auto", *maze_solvers.SOLVERS)
+        solver_menu.config(font=('Arial', 9), width=12)
+        solver_menu.pack(pady=2)
+        
         # Instructions
         instructions = tk.Label(control_frame,
-                               text="🎮 Controls:\nWASD or Arrow Keys\nL - Toggle Lighting\n\n🔴 Player (Camera Center)\n🟢 Goal\n🔵 Start\n🟡 Solution Path\n\n📍 Click minimap to expand\n🕯️ Dynamic lighting enabled\n🌫️ Fog of War minimap\n\n🧠 NEW: Programming Questions\nat junctions test your knowledge!\n\n❓ Answer correctly to choose\nyour path direction!",
+                               text="🎮 Controls:\nWASD or Arrow Keys\nL - Toggle Lighting\nH - Hint toward exit\n\n🔴 Player (Camera Center)\n🟢 Goal\n🔵 Start\n🟡 Solution Path\n\n📍 Click minimap to expand\n🕯️ Dynamic lighting enabled\n🌫️ Fog of War minimap\n\n🧠 NEW: Programming Questions\nat junctions test your knowledge!\n\n❓ Answer correctly to choose\nyour path direction!",
                                font=('Arial', 9),
                                fg='#bdc3c7', bg='#34495e',
                                justify='left')
@@ -398,6 +538,7 @@ class MazeGame:
         # Make pygame container focusable and bind click events
         self.pygame_container.focus_set()
         self.pygame_container.bind('<Button-1>', self.on_pygame_click)
+        self.pygame_container.bind('<Expose>', lambda event: self.request_redraw('expose'))
         
         # Minimap will be created later
         self.minimap_canvas = None
@@ -432,6 +573,7 @@ class MazeGame:
     def toggle_minimap(self):
         """Toggle between normal and expanded minimap"""
         self.minimap_expanded = not self.minimap_expanded
+        self.request_redraw('minimap')
         if self.minimap_expanded:
             self.status_label.config(text="Expanded minimap view\nClick close button to return")
         else:
@@ -445,10 +587,18 @@ class MazeGame:
         # Initialize pygame
         pygame.init()
         self.clock = pygame.time.Clock()
+        try:
+            self.sounds = synth.SoundBank(MAZE_SOUNDS).load()
+        except (pygame.error, ValueError):
+            self.sounds = {}  # No audio device: play silently
         
         # Start game loop
         self.root.after(100, self.setup_pygame_surface)
         
+    def play_sound(self, name):
+        if name in self.sounds:
+            self.sounds[name].play()
+        
     def setup_pygame_surface(self):
         """Setup pygame surface after container is ready"""
         try:
@@ -508,14 +658,16 @@ class MazeGame:
         # Force update
         self.root.update_idletasks()
         
-    def update_camera(self):
-        """Update camera position to follow player"""
+    def update_camera(self, x=None, y=None):
+        """Update camera position to follow the player (or the pixel position x, y)"""
         if not self.maze:
             return
             
         # Center camera on player
-        self.camera_x = self.player_x - self.viewport_width // 2
-        self.camera_y = self.player_y - self.viewport_height // 2
+        if x is None:
+            x, y = self.player_x, self.player_y
+        self.camera_x = x - self.viewport_width // 2
+        self.camera_y = y - self.viewport_height // 2
         
         # Keep camera within maze bounds
         max_camera_x = self.width * self.cell_size - self.viewport_width
@@ -530,24 +682,11 @@ class MazeGame:
     
     def is_junction(self, grid_x, grid_y):
         """Check if current position is a junction (more than 2 open paths)"""
-        if not self.maze or grid_x < 0 or grid_x >= self.width or grid_y < 0 or grid_y >= self.height:
-            return False
-            
-        if self.maze[grid_y][grid_x] == '#':  # Wall
+        if not self.maze:
             return False
             
-        # Check all four directions
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # left, right, up, down
-        open_paths = 0
-        
-        for dx, dy in directions:
-            nx, ny = grid_x + dx, grid_y + dy
-            if (0 <= nx < self.width and 0 <= ny < self.height and 
-                self.maze[ny][nx] == ' '):
-                open_paths += 1
-        
-        # Junction if more than 2 open paths
-        return open_paths > 2
+        # Junction flags are precomputed once per maze by MazeGrid.build_connectivity
+        return self.maze.is_junction(grid_x, grid_y)
     
     def show_question_modal(self):
         """Display question modal and pause game"""
@@ -556,6 +695,7 @@ class MazeGame:
             
         self.question_active = True
         self.current_question = self.question_system.get_random_question()
+        self.play_sound('question')
         
         # Create modal window
         self.question_modal = tk.Toplevel(self.root)
@@ -678,6 +818,7 @@ class MazeGame:
         
         # Check if answer is correct
         is_correct = selected_answer == self.current_question['correct_answer']
+        self.play_sound('correct' if is_correct else 'wrong')
         
         # Show result
         result_text = f"{'✅ Correct!' if is_correct else '❌ Wrong!'}\n"
@@ -715,97 +856,171 @@ class MazeGame:
             self.status_label.config(text="No answer given\nMovement restricted!")
             
     def handle_tkinter_key_event(self, event):
-        """Handle key events from Tkinter and forward to game logic"""
+        """Handle key events from Tkinter: movement keys go to the input buffer"""
         # Handle lighting toggle
         if event.keysym in ['l', 'L']:
             self.toggle_lighting()
             return "break"
             
+        if event.keysym in ['h', 'H']:
+            self.show_hint()
+            return "break"
+            
         # Only handle keys if pygame is focused and maze exists and no question active
-        if (not self.pygame_focused or not self.maze or self.show_solution or 
-            self.minimap_expanded or self.question_active):
+        if not self.can_take_input():
             # Allow ESC to close expanded minimap
             if event.keysym == 'Escape' and self.minimap_expanded:
                 self.toggle_minimap()
             return
             
-        # Store previous position
-        old_x, old_y = self.player_x, self.player_y
+        direction = KEY_DIRECTIONS.get(event.keysym)
+        if not direction:
+            return
+            
+        # OS key repeat re-sends presses of a held key (on X11 right after a release);
+        # those keep the key held but are not new moves
+        repeat = (direction in self.held_directions or
+                  time.perf_counter() - self.key_release_times.get(direction, 0) < 0.03)
+        if direction in self.held_directions:
+            self.held_directions.remove(direction)
+        self.held_directions.append(direction)
+        if not repeat:
+            self.queued_moves.append(direction)
+            
+        # Apply it now unless a tick is already pending
+        if self.input_after_id is None:
+            self.process_input()
         
-        # Map tkinter key events to movement
-        moved = False
+        # Prevent event from propagating to entry widgets
+        return "break"
+    
+    def handle_tkinter_key_release(self, event):
+        direction = KEY_DIRECTIONS.get(event.keysym)
+        if direction in self.held_directions:
+            self.held_directions.remove(direction)
+            self.key_release_times[direction] = time.perf_counter()
+            
+    def can_take_input(self):
+        return (self.pygame_focused and self.maze is not None and not self.show_solution and
+                not self.minimap_expanded and not self.question_active)
+        
+    def clear_input(self):
+        """Forget held and queued movement (a modal or focus change may swallow the key releases)"""
+        self.held_directions.clear()
+        self.queued_moves.clear()
+        if self.input_after_id is not None:
+            self.root.after_cancel(self.input_after_id)
+            self.input_after_id = None
+            
+    def process_input(self):
+        """Simulation tick: apply at most one buffered movement step, then tick again while keys are held"""
+        self.input_after_id = None
+        if not self.can_take_input():
+            self.clear_input()
+            return
+            
+        now = time.perf_counter()
+        if self.queued_moves:
+            self.next_repeat_time = now + self.MOVE_REPEAT_DELAY_MS / 1000
+            self.move_player(self.queued_moves.popleft())
+        elif self.held_directions and now >= self.next_repeat_time:
+            self.next_repeat_time = now + self.MOVE_REPEAT_MS / 1000
+            self.move_player(self.held_directions[-1])
+            
+        if self.queued_moves or self.held_directions:
+            self.input_after_id = self.root.after(self.INPUT_TICK_MS, self.process_input)
+            
+    def move_player(self, direction_attempted):
+        """One step in a direction ('left', 'right', 'forward', 'backward') if walls and junction rules allow"""
         new_x, new_y = self.player_x, self.player_y
-        direction_attempted = None
         
-        if event.keysym in ['Left', 'a', 'A']:
+        if direction_attempted == 'left':
             new_x = max(0, self.player_x - self.cell_size)
-            direction_attempted = 'left'
-        elif event.keysym in ['Right', 'd', 'D']:
+        elif direction_attempted == 'right':
             new_x = min((self.width - 1) * self.cell_size, self.player_x + self.cell_size)
-            direction_attempted = 'right'
-        elif event.keysym in ['Up', 'w', 'W']:
+        elif direction_attempted == 'forward':
             new_y = max(0, self.player_y - self.cell_size)
-            direction_attempted = 'forward'
-        elif event.keysym in ['Down', 's', 'S']:
+        elif direction_attempted == 'backward':
             new_y = min((self.height - 1) * self.cell_size, self.player_y + self.cell_size)
-            direction_attempted = 'backward'
+        
+        # One lookup in the connectivity index answers both the wall and the junction checks
+        current_grid_x, current_grid_y = self.get_grid_pos(self.player_x, self.player_y)
+        current_cell = int(self.maze.cells[current_grid_y, current_grid_x])
         
         # Check if movement is valid (not hitting walls)
-        if direction_attempted and self.can_move_to(new_x, new_y):
-            # Check if we're at a junction and need to restrict movement
-            current_grid_x, current_grid_y = self.get_grid_pos(self.player_x, self.player_y)
-            
-            # If we have an allowed direction restriction, check it
-            if (self.allowed_direction and 
-                self.allowed_direction != direction_attempted and
-                self.is_junction(current_grid_x, current_grid_y)):
-                # Movement blocked - show message
-                self.status_label.config(text=f"❌ Direction blocked!\nYou can only move: {self.allowed_direction.upper()}")
-                return "break"
-            
-            # Valid movement
-            self.player_x = new_x
-            self.player_y = new_y
-            moved = True
-            
-            # Clear allowed direction restriction after successful move
-            if self.allowed_direction:
-                self.allowed_direction = None
-            
-            # Update camera to follow player
-            self.update_camera()
+        if not current_cell & DIRECTION_BITS[direction_attempted]:
+            return False
             
-            # Update fog of war when player moves
-            self.update_fog_of_war()
+        # If we have an allowed direction restriction, check it
+        if (self.allowed_direction and 
+            self.allowed_direction != direction_attempted and
+            current_cell & JUNCTION):
+            # Movement blocked - show message
+            self.status_label.config(text=f"❌ Direction blocked!\nYou can only move: {self.allowed_direction.upper()}")
+            return False
+        
+        # Valid movement: glide from wherever the player is drawn right now
+        self.move_from = self.get_player_draw_position()[:2]
+        self.move_started = time.perf_counter()
+        self.player_x = new_x
+        self.player_y = new_y
+        
+        # Clear allowed direction restriction after successful move
+        if self.allowed_direction:
+            self.allowed_direction = None
+        
+        # Update camera to follow player
+        self.update_camera()
+        
+        # Stream in rows ahead of the player in endless mode
+        self.scroll_endless_window()
+        
+        # Update fog of war when player moves
+        self.update_fog_of_war()
+        
+        # Check for junctions AFTER moving
+        if self.questions_enabled:
+            new_grid_x, new_grid_y = self.get_grid_pos(self.player_x, self.player_y)
+            junction_key = (new_grid_x, new_grid_y)
             
-            # Check for junctions AFTER moving
-            if self.questions_enabled and moved:
-                new_grid_x, new_grid_y = self.get_grid_pos(self.player_x, self.player_y)
-                junction_key = (new_grid_x, new_grid_y)
+            # Check if we're at a new junction we haven't visited
+            if (self.maze.cells[new_grid_y, new_grid_x] & JUNCTION and 
+                junction_key not in self.visited_junctions):
                 
-                # Check if we're at a new junction we haven't visited
-                if (self.is_junction(new_grid_x, new_grid_y) and 
-                    junction_key not in self.visited_junctions):
-                    
-                    # Add to visited junctions
-                    self.visited_junctions.add(junction_key)
-                    
-                    # Show question modal
-                    self.root.after(500, self.show_question_modal)  # Small delay for smooth experience
+                # Add to visited junctions
+                self.visited_junctions.add(junction_key)
+                self.get_tile_cache().invalidate_cell(new_grid_x, new_grid_y, self.visited_junctions)
+                self.get_minimap_surface().mark_dirty(new_grid_x, new_grid_y, new_grid_x + 1, new_grid_y + 1)
+                
+                # Stop here instead of running past the junction while the question opens
+                self.clear_input()
+                
+                # Show question modal
+                self.root.after(500, self.show_question_modal)  # Small delay for smooth experience
         
         # Check win condition after movement
-        if moved:
-            player_grid_x = self.player_x // self.cell_size
-            player_grid_y = self.player_y // self.cell_size
-            if player_grid_x == 1 and player_grid_y == 1:
-                self.status_label.config(text="🎉 Congratulations!\nYou solved the maze!\nGreat programming knowledge!")
+        self.request_redraw('player')
+        player_grid_x = self.player_x // self.cell_size
+        player_grid_y = self.player_y // self.cell_size
+        if not self.endless_mode and player_grid_x == 1 and player_grid_y == 1:
+            self.status_label.config(text="🎉 Congratulations!\nYou solved the maze!\nGreat programming knowledge!")
+            self.play_sound('win')
+        return True
         
-        # Prevent event from propagating to entry widgets
-        if moved or direction_attempted:
-            return "break"
+    def get_player_draw_position(self):
+        """(x, y, gliding): pixel position to draw the player at, between move_from and the player cell"""
+        elapsed_ms = (time.perf_counter() - self.move_started) * 1000
+        from_x, from_y = self.move_from
+        # Jumps (reset, endless scrolling, a new maze) are not animated
+        if (elapsed_ms >= self.MOVE_ANIMATION_MS or
+                abs(self.player_x - from_x) + abs(self.player_y - from_y) > 2 * self.cell_size):
+            return self.player_x, self.player_y, False
+        t = elapsed_ms / self.MOVE_ANIMATION_MS
+        return (round(from_x + (self.player_x - from_x) * t),
+                round(from_y + (self.player_y - from_y) * t), True)
     
     def game_loop(self):
-        """Main game loop"""
+        """Main game loop: renders only when a redraw was requested, at most every FRAME_INTERVAL_MS"""
         if not self.game_running:
             return
             
@@ -815,14 +1030,51 @@ class MazeGame:
                 self.game_running = False
                 return
                 
-        # Render game
-        self.render_game()
-        
-        # Schedule next frame
-        self.root.after(16, self.game_loop)  # ~60 FPS
+        if self.redraw_reasons:
+            self.redraw_reasons.clear()
+            began = time.perf_counter()
+            self.render_game()
+            self.last_frame_time = time.perf_counter()
+            self.frame_times.append((self.last_frame_time - began) * 1000)
+            self.frames_rendered += 1
+            self.frame_idle = False
+            self.frame_after_id = self.root.after(self.FRAME_INTERVAL_MS, self.game_loop)
+        else:
+            # Nothing changed: no render, and poll slowly until request_redraw wakes us
+            self.idle_ticks += 1
+            self.frame_idle = True
+            self.frame_after_id = self.root.after(self.IDLE_POLL_MS, self.game_loop)
+            
+    def request_redraw(self, reason='state'):
+        """Mark the view dirty (player moved, lighting toggled, ...); must be called on the Tk thread"""
+        self.redraw_reasons.add(reason)
+        if not self.game_running or not self.frame_idle:
+            return
+        # Pull the slow idle poll forward, keeping the frame rate cap
+        self.root.after_cancel(self.frame_after_id)
+        since_last_ms = (time.perf_counter() - self.last_frame_time) * 1000
+        self.frame_idle = False
+        self.frame_after_id = self.root.after(max(1, int(self.FRAME_INTERVAL_MS - since_last_ms)),
+                                              self.game_loop)
+        
+    def get_frame_stats(self):
+        """Render time statistics over the last frames, plus how often the loop stayed idle"""
+        stats = {"frames": self.frames_rendered, "idle_ticks": self.idle_ticks}
+        if self.frame_times:
+            times = sorted(self.frame_times)
+            stats.update({
+                "mean_ms": sum(times) / len(times),
+                "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+                "max_ms": times[-1],
+            })
+        return stats
         
     def can_move_to(self, x, y):
         """Check if player can move to position"""
+        # Grid-aligned positions (every keyboard step) need just one cell lookup
+        if x % self.cell_size == 0 and y % self.cell_size == 0:
+            return self.maze.is_open(x // self.cell_size, y // self.cell_size)
+            
         margin = 1
         
         # Check all corners of the player rectangle
@@ -838,9 +1090,7 @@ class MazeGame:
             col = int(px // self.cell_size)
             row = int(py // self.cell_size)
             
-            if (col < 0 or col >= self.width or 
-                row < 0 or row >= self.height or 
-                self.maze[row][col] == '#'):
+            if self.maze.is_wall(col, row):
                 return False
         return True
         
@@ -852,43 +1102,18 @@ class MazeGame:
         self.pygame_surface.fill((40, 40, 40))
         
         if self.maze:
-            # Calculate visible range based on camera position
-            start_col = max(0, int(self.camera_x // self.cell_size) - 1)
-            end_col = min(self.width, int((self.camera_x + self.viewport_width) // self.cell_size) + 2)
-            start_row = max(0, int(self.camera_y // self.cell_size) - 1)
-            end_row = min(self.height, int((self.camera_y + self.viewport_height) // self.cell_size) + 2)
-            
-            # Draw maze (only visible portion)
-            for row in range(start_row, end_row):
-                for col in range(start_col, end_col):
-                    # Calculate screen position
-                    screen_x = col * self.cell_size - self.camera_x
-                    screen_y = row * self.cell_size - self.camera_y
-                    
-                    # Skip if outside viewport
-                    if (screen_x + self.cell_size < 0 or screen_x > self.viewport_width or
-                        screen_y + self.cell_size < 0 or screen_y > self.viewport_height):
-                        continue
-                    
-                    if self.maze[row][col] == '#':
-                        pygame.draw.rect(self.pygame_surface, (255, 255, 255),
-                                       (screen_x, screen_y, self.cell_size, self.cell_size))
-                    else:
-                        # Color code junctions differently
-                        if self.is_junction(col, row):
-                            # Highlight junctions with a subtle purple tint
-                            if (col, row) in self.visited_junctions:
-                                # Visited junction - darker purple
-                                pygame.draw.rect(self.pygame_surface, (80, 60, 100),
-                                               (screen_x, screen_y, self.cell_size, self.cell_size))
-                            else:
-                                # Unvisited junction - brighter purple
-                                pygame.draw.rect(self.pygame_surface, (100, 80, 120),
-                                               (screen_x, screen_y, self.cell_size, self.cell_size))
-                        else:
-                            # Normal path
-                            pygame.draw.rect(self.pygame_surface, (60, 60, 60),
-                                           (screen_x, screen_y, self.cell_size, self.cell_size))
+            # Between cells the player (and the camera with it) glides; keep frames coming until it lands
+            draw_x, draw_y, gliding = self.get_player_draw_position()
+            if gliding:
+                self.update_camera(draw_x, draw_y)
+                self.request_redraw('glide')
+            else:
+                self.update_camera()
+                
+            # Blit the pre-rendered maze chunks under the camera
+            self.get_tile_cache().draw(self.pygame_surface, self.camera_x, self.camera_y,
+                                       self.viewport_width, self.viewport_height,
+                                       self.visited_junctions)
             
             # Draw solution path if visible
             if self.show_solution and self.solution_path:
@@ -902,55 +1127,34 @@ class MazeGame:
                         pygame.draw.rect(self.pygame_surface, (255, 255, 0),
                                        (screen_x + 4, screen_y + 4, self.cell_size - 8, self.cell_size - 8))
             
-            # Draw start and goal
-            start_screen_x = (self.width - 2) * self.cell_size - self.camera_x
-            start_screen_y = (self.height - 2) * self.cell_size - self.camera_y
-            if (0 <= start_screen_x <= self.viewport_width - self.cell_size and
-                0 <= start_screen_y <= self.viewport_height - self.cell_size):
-                pygame.draw.rect(self.pygame_surface, (0, 0, 255),
-                               (start_screen_x + 2, start_screen_y + 2, self.cell_size - 4, self.cell_size - 4))
-            
-            goal_screen_x = 1 * self.cell_size - self.camera_x
-            goal_screen_y = 1 * self.cell_size - self.camera_y
-            if (0 <= goal_screen_x <= self.viewport_width - self.cell_size and
-                0 <= goal_screen_y <= self.viewport_height - self.cell_size):
-                pygame.draw.rect(self.pygame_surface, (0, 255, 0),
-                               (goal_screen_x + 2, goal_screen_y + 2, self.cell_size - 4, self.cell_size - 4))
+            # Draw start and goal (endless mode has neither)
+            if not self.endless_mode:
+                start_screen_x = (self.width - 2) * self.cell_size - self.camera_x
+                start_screen_y = (self.height - 2) * self.cell_size - self.camera_y
+                if (0 <= start_screen_x <= self.viewport_width - self.cell_size and
+                    0 <= start_screen_y <= self.viewport_height - self.cell_size):
+                    pygame.draw.rect(self.pygame_surface, (0, 0, 255),
+                                   (start_screen_x + 2, start_screen_y + 2, self.cell_size - 4, self.cell_size - 4))
+            
+                goal_screen_x = 1 * self.cell_size - self.camera_x
+                goal_screen_y = 1 * self.cell_size - self.camera_y
+                if (0 <= goal_screen_x <= self.viewport_width - self.cell_size and
+                    0 <= goal_screen_y <= self.viewport_height - self.cell_size):
+                    pygame.draw.rect(self.pygame_surface, (0, 255, 0),
+                                   (goal_screen_x + 2, goal_screen_y + 2, self.cell_size - 4, self.cell_size - 4))
             
             # Draw player (always centered when camera follows)
             if not self.show_solution:
-                player_screen_x = self.player_x - self.camera_x
-                player_screen_y = self.player_y - self.camera_y
+                player_screen_x = draw_x - self.camera_x
+                player_screen_y = draw_y - self.camera_y
                 pygame.draw.rect(self.pygame_surface, (255, 0, 0),
                                (player_screen_x + 1, player_screen_y + 1, 
                                 self.cell_size - 2, self.cell_size - 2))
             
-            # Draw junction indicators on visible junctions
-            current_grid_x, current_grid_y = self.get_grid_pos(self.player_x, self.player_y)
-            for row in range(start_row, end_row):
-                for col in range(start_col, end_col):
-                    if self.is_junction(col, row):
-                        screen_x = col * self.cell_size - self.camera_x
-                        screen_y = row * self.cell_size - self.camera_y
-                        
-                        if (0 <= screen_x <= self.viewport_width - self.cell_size and
-                            0 <= screen_y <= self.viewport_height - self.cell_size):
-                            
-                            # Draw question mark for unvisited junctions
-                            if (col, row) not in self.visited_junctions:
-                                center_x = screen_x + self.cell_size // 2
-                                center_y = screen_y + self.cell_size // 2
-                                
-                                # Draw question mark
-                                font = pygame.font.Font(None, max(16, self.cell_size // 2))
-                                text = font.render("?", True, (255, 255, 0))
-                                text_rect = text.get_rect(center=(center_x, center_y))
-                                self.pygame_surface.blit(text, text_rect)
-            
             # Apply lighting effect if enabled
             if self.lighting_enabled:
-                player_screen_x = self.player_x - self.camera_x
-                player_screen_y = self.player_y - self.camera_y
+                player_screen_x = draw_x - self.camera_x
+                player_screen_y = draw_y - self.camera_y
                 player_center = (player_screen_x + self.cell_size // 2, 
                                player_screen_y + self.cell_size // 2)
                 self.draw_light_overlay(self.pygame_surface, player_center)
@@ -960,14 +1164,21 @@ class MazeGame:
         
         pygame.display.flip()
         
+    def get_tile_cache(self):
+        """Tile cache for the current maze, created on first use after a new maze"""
+        if self.tile_cache is None or self.tile_cache.grid is not self.maze:
+            self.tile_cache = MazeTileCache(self.maze, self.cell_size)
+        return self.tile_cache
+        
     def init_fog_of_war(self):
         """Initialize fog of war system for new maze"""
         if not self.maze:
             return
             
         # Initialize explored map - all areas start as unexplored (low opacity)
-        self.explored_map = [[self.UNEXPLORED_TILE_OPACITY for _ in range(self.width)] 
-                           for _ in range(self.height)]
+        self.maze.reset_explored(self.UNEXPLORED_TILE_OPACITY)
+        self.explored_map = self.maze.explored
+        self.get_minimap_surface().mark_all_dirty()
         
         # Create fog surface for rendering
         # Size based on largest possible minimap
@@ -975,8 +1186,6 @@ class MazeGame:
         self.fog_surface = pygame.Surface((max_minimap_size, max_minimap_size), pygame.SRCALPHA)
         
         # Create visibility gradient surface
-        visibility_diameter = int(self.VISIBILITY_RADIUS_MINIMAP * 2 * self.FADE_SOFTNESS)
-        self.visibility_surface = pygame.Surface((visibility_diameter, visibility_diameter), pygame.SRCALPHA)
         self.create_visibility_gradient()
         
         # Update initial position
@@ -984,71 +1193,28 @@ class MazeGame:
     
     def create_visibility_gradient(self):
         """Create a radial gradient for minimap visibility"""
-        if not self.visibility_surface:
-            return
-            
         visibility_diameter = int(self.VISIBILITY_RADIUS_MINIMAP * 2 * self.FADE_SOFTNESS)
-        center = visibility_diameter // 2
-        
-        # Clear the surface
-        self.visibility_surface.fill((0, 0, 0, 0))
-        
-        # Create radial gradient from center outward
-        for radius in range(int(self.VISIBILITY_RADIUS_MINIMAP * self.FADE_SOFTNESS), 0, -1):
-            # Calculate opacity based on distance from center
-            if radius <= self.VISIBILITY_RADIUS_MINIMAP:
-                # Full visibility in the center
-                opacity = self.VISIBLE_TILE_OPACITY
-            else:
-                # Fade out gradually
-                fade_distance = radius - self.VISIBILITY_RADIUS_MINIMAP
-                max_fade_distance = self.VISIBILITY_RADIUS_MINIMAP * (self.FADE_SOFTNESS - 1)
-                fade_factor = 1.0 - (fade_distance / max_fade_distance)
-                opacity = int(self.EXPLORED_TILE_OPACITY * fade_factor)
-            
-            # Draw circle with calculated opacity
-            color = (255, 255, 255, opacity)
-            if opacity > 0:
-                pygame.draw.circle(self.visibility_surface, color, (center, center), radius)
+        alpha = radial_alpha(visibility_diameter, self.VISIBILITY_RADIUS_MINIMAP,
+                             self.VISIBILITY_RADIUS_MINIMAP * self.FADE_SOFTNESS,
+                             self.VISIBLE_TILE_OPACITY, self.EXPLORED_TILE_OPACITY)
+        self.visibility_surface = alpha_surface(alpha, (255, 255, 255))
     
     def update_fog_of_war(self):
         """Update explored areas based on player position"""
-        if not self.maze or not self.explored_map:
+        if not self.maze or self.explored_map is None:
             return
             
         # Convert player position to grid coordinates
         player_grid_x = self.player_x // self.cell_size
         player_grid_y = self.player_y // self.cell_size
         
-        # Calculate visibility radius in grid cells
-        visibility_grid_radius = max(1, int(self.VISIBILITY_RADIUS_MINIMAP / max(self.cell_size, 1)))
+        # Raise explored opacity under the precomputed stencil (never reduces visibility)
+        stencil = fog_stencil(self.VISIBILITY_RADIUS_MINIMAP, self.FADE_SOFTNESS, self.cell_size,
+                              self.VISIBLE_TILE_OPACITY, self.EXPLORED_TILE_OPACITY)
+        touched = self.maze.reveal(player_grid_x, player_grid_y, stencil)
         
-        # Update exploration for areas within visibility radius
-        for dy in range(-visibility_grid_radius, visibility_grid_radius + 1):
-            for dx in range(-visibility_grid_radius, visibility_grid_radius + 1):
-                grid_x = player_grid_x + dx
-                grid_y = player_grid_y + dy
-                
-                # Check bounds
-                if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-                    # Calculate distance from player
-                    distance = math.sqrt(dx * dx + dy * dy) * max(self.cell_size, 1)
-                    
-                    if distance <= self.VISIBILITY_RADIUS_MINIMAP:
-                        # Currently visible area
-                        opacity = self.VISIBLE_TILE_OPACITY
-                    elif distance <= self.VISIBILITY_RADIUS_MINIMAP * self.FADE_SOFTNESS:
-                        # Fade zone - becomes explored
-                        fade_distance = distance - self.VISIBILITY_RADIUS_MINIMAP
-                        max_fade_distance = self.VISIBILITY_RADIUS_MINIMAP * (self.FADE_SOFTNESS - 1)
-                        fade_factor = 1.0 - (fade_distance / max_fade_distance)
-                        opacity = int(self.EXPLORED_TILE_OPACITY * fade_factor)
-                    else:
-                        # Keep current exploration level (don't reduce visibility)
-                        opacity = self.explored_map[grid_y][grid_x]
-                    
-                    # Update only if new opacity is higher (more visible)
-                    self.explored_map[grid_y][grid_x] = max(self.explored_map[grid_y][grid_x], opacity)
+        # Only the revealed square needs recolouring on the minimap
+        self.get_minimap_surface().mark_dirty(*touched)
     
     def render_minimap(self):
         """Render minimap overlay with fog of war"""
@@ -1060,6 +1226,21 @@ class MazeGame:
         else:
             self.render_compact_minimap()
     
+    def get_minimap_surface(self):
+        """Per-cell minimap surface for the current maze, created on first use after a new maze"""
+        if self.minimap_surface is None or self.minimap_surface.grid is not self.maze:
+            self.minimap_surface = MinimapSurface(self.maze, self.FOG_COLOR,
+                                                  self.UNEXPLORED_TILE_OPACITY,
+                                                  self.VISIBLE_TILE_OPACITY)
+        return self.minimap_surface
+    
+    def draw_minimap_cells(self, origin_x, origin_y, scale):
+        """Blit the minimap surface scaled so each cell covers cell_size * scale pixels"""
+        target_size = (max(1, int(self.width * self.cell_size * scale)),
+                       max(1, int(self.height * self.cell_size * scale)))
+        self.pygame_surface.blit(self.get_minimap_surface().scaled(target_size, self.visited_junctions),
+                                 (origin_x, origin_y))
+    
     def render_compact_minimap(self):
         """Render small minimap in corner with fog of war"""
         # Minimap configuration
@@ -1080,53 +1261,12 @@ class MazeGame:
         scale = min(scale_x, scale_y)
         
         # Draw maze on minimap with fog of war
-        for row in range(self.height):
-            for col in range(self.width):
-                mini_x = minimap_x + 5 + col * self.cell_size * scale
-                mini_y = minimap_y + 5 + row * self.cell_size * scale
-                mini_size = max(1, int(self.cell_size * scale))
-                
-                # Get exploration opacity for this tile
-                if self.explored_map:
-                    tile_opacity = self.explored_map[row][col]
-                else:
-                    tile_opacity = self.UNEXPLORED_TILE_OPACITY
-                
-                # Draw based on exploration and maze structure
-                if tile_opacity <= self.UNEXPLORED_TILE_OPACITY:
-                    # Unexplored - draw fog
-                    color = self.FOG_COLOR
-                elif self.maze[row][col] == '#':
-                    # Explored wall
-                    base_color = 200
-                    alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                    color_value = int(base_color * alpha_factor)
-                    color = (color_value, color_value, color_value)
-                else:
-                    # Explored path - highlight junctions
-                    if self.is_junction(col, row):
-                        if (col, row) in self.visited_junctions:
-                            # Visited junction - purple
-                            base_color = (80, 60, 100)
-                        else:
-                            # Unvisited junction - bright purple
-                            base_color = (120, 100, 140)
-                        alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                        color = tuple(int(c * alpha_factor) for c in base_color)
-                    else:
-                        # Normal path
-                        base_color = 60
-                        alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                        color_value = int(base_color * alpha_factor)
-                        color = (color_value, color_value, color_value)
-                
-                pygame.draw.rect(self.pygame_surface, color,
-                               (mini_x, mini_y, mini_size, mini_size))
+        self.draw_minimap_cells(minimap_x + 5, minimap_y + 5, scale)
         
         # Draw player on minimap (only if explored)
         player_grid_x = self.player_x // self.cell_size
         player_grid_y = self.player_y // self.cell_size
-        if (self.explored_map and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
+        if (self.explored_map is not None and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
             self.explored_map[player_grid_y][player_grid_x] > self.UNEXPLORED_TILE_OPACITY):
             player_mini_x = minimap_x + 5 + (self.player_x * scale)
             player_mini_y = minimap_y + 5 + (self.player_y * scale)
@@ -1143,14 +1283,15 @@ class MazeGame:
                        (viewport_mini_x, viewport_mini_y, viewport_mini_w, viewport_mini_h), 1)
         
         # Draw goal and start on minimap (only if explored)
-        if (self.explored_map and self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
+        if (not self.endless_mode and self.explored_map is not None and
+            self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
             goal_mini_x = minimap_x + 5 + (1 * self.cell_size * scale)
             goal_mini_y = minimap_y + 5 + (1 * self.cell_size * scale)
             player_mini_size = max(2, int(self.cell_size * scale))
             pygame.draw.rect(self.pygame_surface, (0, 255, 0),
                            (goal_mini_x, goal_mini_y, player_mini_size, player_mini_size))
         
-        if (self.explored_map and self.height >= 2 and self.width >= 2 and 
+        if (not self.endless_mode and self.explored_map is not None and self.height >= 2 and self.width >= 2 and 
             self.explored_map[self.height-2][self.width-2] > self.UNEXPLORED_TILE_OPACITY):
             start_mini_x = minimap_x + 5 + ((self.width - 2) * self.cell_size * scale)
             start_mini_y = minimap_y + 5 + ((self.height - 2) * self.cell_size * scale)
@@ -1184,53 +1325,12 @@ class MazeGame:
         scale = min(scale_x, scale_y)
         
         # Draw maze on expanded minimap with fog of war and junction highlights
-        for row in range(self.height):
-            for col in range(self.width):
-                mini_x = expanded_x + 10 + col * self.cell_size * scale
-                mini_y = expanded_y + 10 + row * self.cell_size * scale
-                mini_size = max(1, int(self.cell_size * scale))
-                
-                # Get exploration opacity for this tile
-                if self.explored_map:
-                    tile_opacity = self.explored_map[row][col]
-                else:
-                    tile_opacity = self.UNEXPLORED_TILE_OPACITY
-                
-                # Draw based on exploration and maze structure
-                if tile_opacity <= self.UNEXPLORED_TILE_OPACITY:
-                    # Unexplored - draw fog
-                    color = self.FOG_COLOR
-                elif self.maze[row][col] == '#':
-                    # Explored wall
-                    base_color = 200
-                    alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                    color_value = int(base_color * alpha_factor)
-                    color = (color_value, color_value, color_value)
-                else:
-                    # Explored path - highlight junctions
-                    if self.is_junction(col, row):
-                        if (col, row) in self.visited_junctions:
-                            # Visited junction - purple
-                            base_color = (80, 60, 100)
-                        else:
-                            # Unvisited junction - bright purple
-                            base_color = (120, 100, 140)
-                        alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                        color = tuple(int(c * alpha_factor) for c in base_color)
-                    else:
-                        # Normal path
-                        base_color = 60
-                        alpha_factor = tile_opacity / self.VISIBLE_TILE_OPACITY
-                        color_value = int(base_color * alpha_factor)
-                        color = (color_value, color_value, color_value)
-                
-                pygame.draw.rect(self.pygame_surface, color,
-                               (mini_x, mini_y, mini_size, mini_size))
+        self.draw_minimap_cells(expanded_x + 10, expanded_y + 10, scale)
         
         # Draw solution path if visible and explored
         if self.show_solution and self.solution_path:
             for col, row in self.solution_path:
-                if (self.explored_map and 0 <= row < self.height and 0 <= col < self.width and
+                if (self.explored_map is not None and 0 <= row < self.height and 0 <= col < self.width and
                     self.explored_map[row][col] > self.UNEXPLORED_TILE_OPACITY):
                     mini_x = expanded_x + 10 + col * self.cell_size * scale
                     mini_y = expanded_y + 10 + row * self.cell_size * scale
@@ -1241,7 +1341,7 @@ class MazeGame:
         # Draw player on expanded minimap (only if explored)
         player_grid_x = self.player_x // self.cell_size
         player_grid_y = self.player_y // self.cell_size
-        if (self.explored_map and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
+        if (self.explored_map is not None and 0 <= player_grid_x < self.width and 0 <= player_grid_y < self.height and
             self.explored_map[player_grid_y][player_grid_x] > self.UNEXPLORED_TILE_OPACITY):
             player_mini_x = expanded_x + 10 + (self.player_x * scale)
             player_mini_y = expanded_y + 10 + (self.player_y * scale)
@@ -1258,14 +1358,15 @@ class MazeGame:
                        (viewport_mini_x, viewport_mini_y, viewport_mini_w, viewport_mini_h), 2)
         
         # Draw goal and start on expanded minimap (only if explored)
-        if (self.explored_map and self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
+        if (not self.endless_mode and self.explored_map is not None and
+            self.explored_map[1][1] > self.UNEXPLORED_TILE_OPACITY):
             goal_mini_x = expanded_x + 10 + (1 * self.cell_size * scale)
             goal_mini_y = expanded_y + 10 + (1 * self.cell_size * scale)
             player_mini_size = max(3, int(self.cell_size * scale))
             pygame.draw.rect(self.pygame_surface, (0, 255, 0),
                            (goal_mini_x, goal_mini_y, player_mini_size, player_mini_size))
         
-        if (self.explored_map and self.height >= 2 and self.width >= 2 and 
+        if (not self.endless_mode and self.explored_map is not None and self.height >= 2 and self.width >= 2 and 
             self.explored_map[self.height-2][self.width-2] > self.UNEXPLORED_TILE_OPACITY):
             start_mini_x = expanded_x + 10 + ((self.width - 2) * self.cell_size * scale)
             start_mini_y = expanded_y + 10 + ((self.height - 2) * self.cell_size * scale)
@@ -1295,69 +1396,60 @@ class MazeGame:
         # Create overlay surface for darkness
         self.light_overlay = pygame.Surface((self.viewport_width, self.viewport_height), pygame.SRCALPHA)
         
-        # Create light surface for the radial gradient
-        light_diameter = int(self.light_radius * 2 * self.light_fade)
-        self.light_surface = pygame.Surface((light_diameter, light_diameter), pygame.SRCALPHA)
-        
         # Pre-render the radial gradient light
         self.create_light_gradient()
         
     def create_light_gradient(self):
-        """Create a radial gradient for the light effect"""
-        if not self.light_surface:
-            return
-            
+        """Create the radial light and the darkness patch around it (cheap enough for live sliders)"""
         light_diameter = int(self.light_radius * 2 * self.light_fade)
-        center = light_diameter // 2
-        
-        # Clear the surface
-        self.light_surface.fill((0, 0, 0, 0))
-        
-        # Create radial gradient
-        for radius in range(int(self.light_radius * self.light_fade), 0, -1):
-            # Calculate alpha based on distance from center
-            if radius <= self.light_radius:
-                # Full brightness in the center
-                alpha = 255
-            else:
-                # Fade out gradually
-                fade_distance = radius - self.light_radius
-                max_fade_distance = self.light_radius * (self.light_fade - 1)
-                alpha = max(0, 255 - int(255 * fade_distance / max_fade_distance))
-            
-            # Draw circle with calculated alpha
-            color = (255, 255, 255, alpha)
-            if alpha > 0:
-                pygame.draw.circle(self.light_surface, color, (center, center), radius)
+        alpha = radial_alpha(light_diameter, self.light_radius, self.light_radius * self.light_fade, 255, 255)
+        self.light_surface = alpha_surface(alpha, (255, 255, 255))
+        
+        # What subtracting the light from the darkness used to produce every frame
+        darkness_alpha = self.darkness_color[3]
+        patch_alpha = np.clip(darkness_alpha - alpha.astype(np.int16), 0, 255).astype(np.uint8)
+        self.darkness_patch = alpha_surface(patch_alpha, self.darkness_color[:3])
+        if self.light_overlay:
+            self.light_overlay.fill(self.darkness_color)
     
     def draw_light_overlay(self, surface, light_center):
-        """Draw the lighting overlay effect"""
-        if not self.lighting_enabled or not self.light_overlay or not self.light_surface:
+        """Darken the view: the light patch around the player, plain darkness everywhere else"""
+        if not self.lighting_enabled or not self.light_overlay or not self.darkness_patch:
             return
         
-        # Fill overlay with darkness
-        self.light_overlay.fill(self.darkness_color)
-        
-        # Calculate light position on overlay
-        light_diameter = int(self.light_radius * 2 * self.light_fade)
-        light_x = light_center[0] - light_diameter // 2
-        light_y = light_center[1] - light_diameter // 2
-        
-        # Subtract (blend) the light from the darkness using BLEND_RGBA_SUB
-        self.light_overlay.blit(self.light_surface, (light_x, light_y), 
-                              special_flags=pygame.BLEND_RGBA_SUB)
-        
-        # Apply the overlay to the main surface
-        surface.blit(self.light_overlay, (0, 0))
+        # Calculate light position on the view
+        light_diameter = self.darkness_patch.get_width()
+        light_rect = pygame.Rect(light_center[0] - light_diameter // 2, light_center[1] - light_diameter // 2,
+                                 light_diameter, light_diameter)
+        view = surface.get_rect()
+        lit = light_rect.clip(view)
+        surface.blit(self.darkness_patch, light_rect)
+        
+        # Only the border around the light gets the static darkness
+        if lit.width and lit.height:
+            border = [pygame.Rect(0, 0, view.width, lit.top),
+                      pygame.Rect(0, lit.bottom, view.width, view.height - lit.bottom),
+                      pygame.Rect(0, lit.top, lit.left, lit.height),
+                      pygame.Rect(lit.right, lit.top, view.width - lit.right, lit.height)]
+        else:
+            border = [view]
+        opaque = self.darkness_color[3] == 255
+        for rect in border:
+            if rect.width > 0 and rect.height > 0:
+                if opaque:
+                    surface.fill(self.darkness_color[:3], rect)
+                else:
+                    surface.blit(self.light_overlay, rect, area=rect)
     
     def toggle_lighting(self):
         """Toggle lighting system on/off"""
         self.lighting_enabled = not self.lighting_enabled
+        self.request_redraw('lighting')
         
         if self.lighting_enabled:
             self.status_label.config(text="🕯️ Lighting enabled\nUse WASD to move")
             # Recreate lighting surfaces if needed
-            if not self.light_overlay or not self.light_surface:
+            if not self.light_overlay or not self.darkness_patch:
                 self.init_lighting_system()
         else:
             self.status_label.config(text="💡 Lighting disabled\nUse WASD to move")
@@ -1370,19 +1462,19 @@ class MazeGame:
             self.light_radius = radius
             settings_changed = True
             
-        if darkness_alpha is not None:
+        if darkness_alpha is not None and darkness_alpha != self.darkness_color[3]:
             self.darkness_color = (self.darkness_color[0], self.darkness_color[1], 
                                  self.darkness_color[2], darkness_alpha)
+            settings_changed = True
             
         if fade is not None and fade != self.light_fade:
             self.light_fade = fade
             settings_changed = True
         
-        # Recreate light surface if radius or fade changed
-        if settings_changed and self.lighting_enabled:
-            light_diameter = int(self.light_radius * 2 * self.light_fade)
-            self.light_surface = pygame.Surface((light_diameter, light_diameter), pygame.SRCALPHA)
+        # Rebuild the light and darkness patch if anything changed
+        if settings_changed:
             self.create_light_gradient()
+        self.request_redraw('lighting')
         
     def generate_maze_clicked(self):
         """Handle generate maze button click"""
@@ -1400,86 +1492,94 @@ class MazeGame:
         self.reset_player()
         
     def generate_maze_threaded(self):
-        """Start maze generation in separate thread"""
-        if self.generating:
-            return
-            
+        """Start maze generation in a worker job; clicking again cancels and restarts it"""
         # Validate input
         try:
             width = int(self.width_var.get())
             height = int(self.height_var.get())
-            if width < 5 or width > 100 or height < 5 or height > 100:
-                self.status_label.config(text="Error: Size must be\nbetween 5 and 100")
+            if (width < MIN_MAZE_SIZE or width > MAX_MAZE_SIZE or
+                height < MIN_MAZE_SIZE or height > MAX_MAZE_SIZE):
+                self.status_label.config(text=f"Error: Size must be\nbetween {MIN_MAZE_SIZE} and {MAX_MAZE_SIZE}")
                 return
+            seed_text = self.seed_var.get().strip()
+            seed = int(seed_text) if seed_text else random.randrange(2 ** 32)
+            if not 0 <= seed < 2 ** 63:
+                raise ValueError
         except ValueError:
             self.status_label.config(text="Error: Please enter\nvalid numbers")
             return
             
+        if self.generation_job:
+            self.generation_job.cancel()
+            self.generation_job = None
+            
         self.generating = True
-        self.generate_btn.config(state='disabled')
         self.solve_btn.config(state='disabled')
         self.reset_btn.config(state='disabled')
-        self.status_label.config(text="Generating maze...")
+        self.status_label.config(text="Generating maze...\nClick Generate again to restart")
         
-        # Start generation thread
-        thread = threading.Thread(target=self.generate_maze, args=(width, height), daemon=True)
-        thread.start()
+        # Endless mode only builds one window of rows, no need for a worker
+        if self.endless_var.get():
+            self.generate_maze(width, height, endless=True, seed=seed)
+            return
+            
+        # A maze generated before with this seed opens straight from the disk cache
+        algorithm = self.algorithm_var.get()
+        cached = self.maze_cache.load(width, height, seed, algorithm) if self.maze_cache.wants(width, height) else None
+        if cached:
+            self.maze_seed, self.maze_algorithm = seed, algorithm
+            self.install_maze(cached[0], cached[1], endless=False)
+            self.maze_generated()
+            return
+            
+        self.generation_job = GenerationJob(width, height, algorithm, seed,
+                                            use_process=self.process_var.get(),
+                                            cache=self.maze_cache).start()
+        self.poll_generation_job(self.generation_job, algorithm)
+        
+    def poll_generation_job(self, job, algorithm):
+        """Drain the job's message queue on the Tk thread (progress arrives at most ~10 times a second)"""
+        if job is not self.generation_job:
+            return  # Cancelled and replaced by a newer job
+            
+        for message in job.poll():
+            kind = message[0]
+            if kind == 'progress':
+                percent = 100 * message[1] // max(message[2], 1)
+                self.status_label.config(text=f"Generating maze ({algorithm})...\n{percent}% carved\n"
+                                              "Click Generate again to restart")
+            elif kind == 'done':
+                self.generation_job = None
+                self.maze_seed = job.args[3]
+                self.maze_algorithm = algorithm
+                self.install_maze(message[1], message[2], endless=False)
+                self.maze_generated()
+                return
+            else:
+                self.generation_job = None
+                self.generating = False
+                if kind == 'error':
+                    print(f"Maze generation error: {message[1]}")
+                    self.status_label.config(text=f"Error: {message[1]}")
+                return
+                
+        self.root.after(100, lambda: self.poll_generation_job(job, algorithm))
         
-    def generate_maze(self, w, h):
-        """Generate maze using Prim's algorithm"""
+    def generate_maze(self, w, h, algorithm=DEFAULT_ALGORITHM, endless=False, seed=None):
+        """Generate a maze on the calling thread with the selected algorithm, or start an endless one"""
         try:
-            self.width, self.height = w, h
-            if self.width % 2 == 0: self.width += 1
-            if self.height % 2 == 0: self.height += 1
-            
-            # Calculate optimal cell size for camera view
-            # Make cells larger for better zoomed experience
-            min_cell_size = 16
-            max_cell_size = 48
-            
-            # Calculate based on viewport size
-            optimal_width_cell = self.viewport_width // (self.width // 3)  # Show about 1/3 of maze width
-            optimal_height_cell = self.viewport_height // (self.height // 3)  # Show about 1/3 of maze height
-            
-            self.cell_size = max(min_cell_size, min(max_cell_size, min(optimal_width_cell, optimal_height_cell)))
-            
-            # Initialize maze
-            self.maze = [['#' for _ in range(self.width)] for _ in range(self.height)]
-            
-            # Prim's algorithm
-            start_x = random.randint(1, self.width // 2) * 2 - 1
-            start_y = random.randint(1, self.height // 2) * 2 - 1
-            self.maze[start_y][start_x] = ' '
-            walls = [(start_x, start_y)]
-            directions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
-            
-            while walls:
-                x, y = random.choice(walls)
-                walls.remove((x, y))
-                random.shuffle(directions)
-                for dx, dy in directions:
-                    nx, ny = x + dx, y + dy
-                    if (0 <= nx < self.width and 0 <= ny < self.height and 
-                        self.maze[ny][nx] == '#'):
-                        self.maze[(y + ny) // 2][(x + nx) // 2] = ' '
-                        self.maze[ny][nx] = ' '
-                        walls.append((nx, ny))
-                        
-                # Update status periodically
-                if len(walls) % 10 == 0:
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"Generating maze...\n{len(walls)} walls remaining"))
-            
-            # Ensure start and end are open
-            self.maze[self.height-2][self.width-2] = ' '  # Start (bottom-right)
-            self.maze[1][1] = ' '  # Goal (top-left)
-            
-            # Set player position at start
-            self.player_x = (self.width - 2) * self.cell_size
-            self.player_y = (self.height - 2) * self.cell_size
-            
-            # Initialize camera to follow player
-            self.update_camera()
+            self.maze_seed = random.randrange(2 ** 32) if seed is None else seed
+            if endless:
+                self.maze_algorithm = "eller"
+                self.width, self.height = maze_generators.odd_size(w, h)
+                self.cell_size = self.get_cell_size(self.width, self.height)
+                maze, field = self.create_endless_maze(), None
+            else:
+                self.maze_algorithm = algorithm
+                maze = maze_generators.generate_maze(w, h, algorithm, self.maze_seed)
+                # Distances to the exit from every cell, for hints and solving from anywhere
+                field = maze_solvers.DistanceField(maze, (1, 1))
+            self.install_maze(maze, field, endless)
             
             # Update UI
             self.root.after(0, self.maze_generated)
@@ -1488,13 +1588,111 @@ class MazeGame:
             print(f"Maze generation error: {e}")
             self.root.after(0, lambda: self.status_label.config(text=f"Error: {e}"))
             
+    def get_cell_size(self, width, height):
+        """Optimal cell size for the camera view (about a third of the maze on screen)"""
+        # Make cells larger for better zoomed experience
+        min_cell_size = 16
+        max_cell_size = 48
+        
+        # Calculate based on viewport size
+        optimal_width_cell = self.viewport_width // (width // 3)  # Show about 1/3 of maze width
+        optimal_height_cell = self.viewport_height // (height // 3)  # Show about 1/3 of maze height
+        
+        return max(min_cell_size, min(max_cell_size, min(optimal_width_cell, optimal_height_cell)))
+        
+    def install_maze(self, maze, distance_field, endless):
+        """Swap in a finished maze in one go, so rendering never sees a half-built state"""
+        self.width, self.height = maze.width, maze.height
+        if not endless:
+            # Endless windows are sized from the cell size, which is already set
+            self.cell_size = self.get_cell_size(self.width, self.height)
+        self.distance_field = distance_field
+        self.endless_mode = endless
+        self.maze = maze
+        self.explored_map = maze.explored
+        
+        # Set player position at start
+        self.player_x, self.player_y = self.get_start_position()
+        
+        # Initialize camera to follow player
+        self.update_camera()
+        
+    def create_endless_maze(self):
+        """Streaming maze window: one screen of rows behind the player and two ahead"""
+        visible_rows = self.viewport_height // self.cell_size + 2
+        return StreamingMaze(self.width, visible_rows * 3, self.maze_seed,
+                             self.UNEXPLORED_TILE_OPACITY, behind_rows=visible_rows)
+        
+    def get_start_position(self):
+        """Pixel position of the start cell (bottom-right, or top-left in endless mode)"""
+        if self.endless_mode:
+            return self.cell_size, self.cell_size
+        return (self.width - 2) * self.cell_size, (self.height - 2) * self.cell_size
+        
+    def scroll_endless_window(self):
+        """Drop rows far behind the player and generate new ones ahead of the camera"""
+        if not self.endless_mode:
+            return
+            
+        shift = self.maze.scroll_for(self.player_y // self.cell_size)
+        if not shift:
+            return
+            
+        # Everything stored in window coordinates moves up with the rows
+        self.player_y -= shift * self.cell_size
+        self.visited_junctions = {(x, y - shift) for x, y in self.visited_junctions if y >= shift}
+        if self.tile_cache:
+            self.tile_cache.clear()
+        if self.minimap_surface:
+            self.minimap_surface.mark_all_dirty()
+        self.update_camera()
+        
+        depth = self.maze.absolute_row(self.player_y // self.cell_size) // 2
+        self.status_label.config(text=f"♾️ Endless mode\nDepth: {depth} rows\nKeep heading down!")
+        
+    def save_maze_clicked(self):
+        """Save the current maze (walls, seed, algorithm and distance field) to a .maze file"""
+        if not self.maze or self.endless_mode:
+            self.status_label.config(text="Nothing to save\n(endless mazes never end)")
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.maze',
+                                            filetypes=[("Maze files", "*.maze")],
+                                            initialfile=f"maze-{self.width}x{self.height}-{self.maze_seed}.maze")
+        if not path:
+            return
+        try:
+            save_maze(path, self.maze, self.maze_seed, self.maze_algorithm, self.distance_field)
+            self.status_label.config(text=f"Maze saved!\n{os.path.basename(path)}")
+        except OSError as e:
+            self.status_label.config(text=f"Error saving maze:\n{e}")
+        self.ensure_game_focus()
+        
+    def load_maze_clicked(self):
+        """Open a .maze file (memory-mapped, so even huge mazes load instantly)"""
+        path = filedialog.askopenfilename(filetypes=[("Maze files", "*.maze"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            grid, field, info = load_maze(path)
+        except (OSError, ValueError) as e:
+            self.status_label.config(text=f"Error loading maze:\n{e}")
+            return
+        if self.generation_job:
+            self.generation_job.cancel()
+            self.generation_job = None
+        if field is None:
+            field = maze_solvers.DistanceField(grid, (1, 1))
+        self.maze_seed, self.maze_algorithm = info["seed"], info["algorithm"] or DEFAULT_ALGORITHM
+        self.install_maze(grid, field, endless=False)
+        self.maze_generated()
+        
     def maze_generated(self):
         """Called when maze generation is complete"""
         self.generating = False
         self.show_solution = False
         self.minimap_expanded = False
         self.generate_btn.config(state='normal')
-        self.solve_btn.config(state='normal')
+        self.solve_btn.config(state='disabled' if self.endless_mode else 'normal')
         self.reset_btn.config(state='normal')
         
         # Reset question system for new maze
@@ -1505,7 +1703,8 @@ class MazeGame:
             self.question_modal.destroy()
             self.question_modal = None
         
-        self.status_label.config(text="Maze generated!\n🧠 Programming questions\nat junctions!\nUse WASD to move\nPress L for lighting")
+        self.save_btn.config(state='disabled' if self.endless_mode else 'normal')
+        self.status_label.config(text=f"Maze generated! (seed {self.maze_seed})\n🧠 Programming questions\nat junctions!\nUse WASD to move\nPress L for lighting, H for a hint")
         
         # Initialize/update lighting system for new maze
         if self.pygame_surface:
@@ -1513,69 +1712,112 @@ class MazeGame:
         
         # Initialize fog of war system
         self.init_fog_of_war()
+        self.request_redraw('maze')
         
         # Ensure game focus is set with a small delay
         self.root.after(200, self.ensure_game_focus)
         
     def solve_maze(self):
-        """Solve maze using A* algorithm"""
-        if not self.maze:
+        """Solve the maze on a worker thread; the game stays playable meanwhile"""
+        if not self.maze or self.solving:
             return
             
-        self.status_label.config(text="Solving maze...")
-        
-        # A* algorithm
-        start = (self.width - 2, self.height - 2)
+        if self.endless_mode:
+            self.status_label.config(text="♾️ Endless mode has no exit\nto solve - keep exploring!")
+            return
+            
+        # Solve from wherever the player stands
+        start = self.get_grid_pos(self.player_x + self.cell_size // 2, self.player_y + self.cell_size // 2)
         goal = (1, 1)
+        method = self.solver_var.get()
+        if method not in maze_solvers.SOLVERS:
+            if self.distance_field:
+                # Walking down the distance field needs no search at all
+                began = time.perf_counter()
+                path = self.distance_field.path_from(*start)
+                self.maze_solved(self.maze, {
+                    "solver": "distance field",
+                    "path": path,
+                    "path_length": len(path),
+                    "nodes_expanded": len(path),
+                    "time_ms": (time.perf_counter() - began) * 1000,
+                })
+                return
+            method = maze_solvers.pick_solver(self.maze)
         
-        def heuristic(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-        
-        queue = [(0, start)]
-        g_cost = {start: 0}
-        parents = {start: None}
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        self.solving = True
+        self.solve_btn.config(state='disabled')
+        thread = threading.Thread(target=self.run_solver,
+                                  args=(self.maze, start, goal, method),
+                                  daemon=True)
+        thread.start()
+        self.show_solving_status(method, 0)
         
-        while queue:
-            _, current = heapq.heappop(queue)
-            
-            if current == goal:
-                break
-                
-            for dx, dy in directions:
-                neighbor = (current[0] + dx, current[1] + dy)
-                nx, ny = neighbor
-                
-                if (0 <= nx < self.width and 0 <= ny < self.height and 
-                    self.maze[ny][nx] == ' '):
-                    new_g = g_cost[current] + 1
-                    
-                    if neighbor not in g_cost or new_g < g_cost[neighbor]:
-                        g_cost[neighbor] = new_g
-                        f = new_g + heuristic(neighbor, goal)
-                        heapq.heappush(queue, (f, neighbor))
-                        parents[neighbor] = current
+    def run_solver(self, grid, start, goal, method):
+        """Solver thread body; hands the result back to the Tk thread"""
+        result = maze_solvers.solve(grid, start, goal, method)
+        self.root.after(0, lambda: self.maze_solved(grid, result))
         
-        # Build solution path
-        self.solution_path = []
-        current = goal
-        while current is not None:
-            self.solution_path.append(current)
-            current = parents.get(current)
+    def show_solving_status(self, method, tick):
+        """Animated "Solving..." status while the solver thread runs"""
+        if not self.solving:
+            return
+        self.status_label.config(text=f"Solving maze ({method}){'.' * (tick % 4)}")
+        self.root.after(250, lambda: self.show_solving_status(method, tick + 1))
+        
+    def maze_solved(self, grid, result):
+        """Called on the Tk thread when a solver finishes"""
+        self.solving = False
+        # A new maze (or endless mode) may have replaced the one that was solved
+        if grid is not self.maze:
+            return
+        self.solve_btn.config(state='normal')
+        self.solve_stats = {key: value for key, value in result.items() if key != 'path'}
         
+        if not result['path']:
+            self.status_label.config(text=f"No path found ({result['solver']})")
+            return
+            
+        self.solution_path = result['path']
         self.show_solution = True
-        self.status_label.config(text="Maze solved!\nYellow path shows solution\nClick minimap to see junctions\n🧠 Questions disabled in solve mode")
+        self.request_redraw('solution')
+        self.status_label.config(text=(
+            f"Maze solved with {result['solver']}!\n"
+            f"Path: {result['path_length']} cells\n"
+            f"Expanded: {result['nodes_expanded']} nodes in {result['time_ms']:.0f} ms\n"
+            "Yellow path shows solution\nClick minimap to see junctions\n🧠 Questions disabled in solve mode"))
+        
+    def show_hint(self):
+        """Status hint: which way is one step closer to the exit and how far along the player is"""
+        if not self.maze or not self.distance_field or self.question_active:
+            return
+        x, y = self.get_grid_pos(self.player_x + self.cell_size // 2, self.player_y + self.cell_size // 2)
+        step = self.distance_field.next_step(x, y)
+        if step is None:
+            return
+        direction = {(-1, 0): 'left', (1, 0): 'right', (0, -1): 'forward', (0, 1): 'backward'}[
+            (step[0] - x, step[1] - y)]
+        progress = self.distance_field.progress(x, y, (self.width - 2, self.height - 2))
+        self.status_label.config(text=f"💡 Hint: go {direction.upper()}\n"
+                                      f"{self.distance_field.distance(x, y)} steps to the exit\n"
+                                      f"{progress:.0%} of the way there")
         
     def reset_player(self):
         """Reset player to start position and clear exploration"""
         if self.maze:
-            self.player_x = (self.width - 2) * self.cell_size
-            self.player_y = (self.height - 2) * self.cell_size
+            # Endless mode restarts the same stream from the top
+            if self.endless_mode:
+                self.maze = self.create_endless_maze()
+                self.explored_map = self.maze.explored
+                
+            self.player_x, self.player_y = self.get_start_position()
             self.show_solution = False
             self.minimap_expanded = False
             
             # Reset question system
             self.visited_junctions.clear()
+            if self.tile_cache:
+                self.tile_cache.clear()
             self.question_active = False
             self.allowed_direction = None
             if self.question_modal:
@@ -1587,6 +1829,7 @@ class MazeGame:
             
             # Reset fog of war - clear all exploration
             self.init_fog_of_war()
+            self.request_redraw('reset')
             
             self.status_label.config(text="Player reset!\nJunctions reset!\nExploration cleared!\n🧠 Questions reactivated!")
             
@@ -1602,6 +1845,10 @@ class MazeGame:
         """Handle window closing"""
         self.game_running = False
         
+        # Stop a maze that is still being generated
+        if self.generation_job:
+            self.generation_job.cancel()
+        
         # Close question modal if open
         if self.question_modal:
             try:
@@ -0,0 +1,361 @@
+"""Benchmarks for the maze engine and the games built on it.
+
+Everything runs headless (SDL dummy video driver) and the report is JSON, so
+runs can be saved and compared over time. Run from this folder:
+
+    python maze_bench.py
+    python maze_bench.py --sizes 51 101 --algorithms prim eller --frames 100
+    python maze_bench.py --output before.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Keep stdout pure JSON
+
+import numpy as np
+import pygame
+import maze_solvers
+from maze_generators import generate_maze, ALGORITHMS, DEFAULT_ALGORITHM
+from maze_grid import JUNCTION, STEP_BITS
+
+VIEWPORT = (950, 600)
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (51, 101, 501, 1001)
+V1_DRAW_MAX_SIZE = 101  # Turtle draws one square per wall, bigger mazes take minutes
+
+
+def scan_is_junction(rows, width, height, x, y):
+    """The pre-index MazeGame.is_junction: re-scan four neighbours on every call"""
+    if x < 0 or x >= width or y < 0 or y >= height or rows[y][x] == '#':
+        return False
+    open_paths = 0
+    for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height and rows[ny][nx] == ' ':
+            open_paths += 1
+    return open_paths > 2
+
+
+def scan_can_move_to(rows, width, height, x, y, cell_size):
+    """The pre-index MazeGame.can_move_to: five divide-and-lookups per call"""
+    margin = 1
+    for px, py in ((x + margin, y + margin), (x + cell_size - margin, y + margin),
+                   (x + margin, y + cell_size - margin),
+                   (x + cell_size - margin, y + cell_size - margin),
+                   (x + cell_size // 2, y + cell_size // 2)):
+        col, row = int(px // cell_size), int(py // cell_size)
+        if col < 0 or col >= width or row < 0 or row >= height or rows[row][col] == '#':
+            return False
+    return True
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def bench_connectivity(size=101, cell_size=16, repeats=50, seed=1):
+    """Per-frame junction lookups and per-keypress movement checks, scan vs index"""
+    grid = generate_maze(size, size, seed=seed)
+    rows = grid.to_rows()
+    width, height = grid.width, grid.height
+    cols = min(width, VIEWPORT[0] // cell_size + 3)
+    lines = min(height, VIEWPORT[1] // cell_size + 3)
+
+    # render_game used to call is_junction twice for every visible cell
+    def frame_scan():
+        for row in range(lines):
+            for col in range(cols):
+                scan_is_junction(rows, width, height, col, row)
+                scan_is_junction(rows, width, height, col, row)
+
+    def frame_index():
+        for row_cells in grid.cells[:lines, :cols].tolist():
+            for cell in row_cells:
+                cell & JUNCTION
+                cell & JUNCTION
+
+    open_cells = [(x, y) for y in range(1, height - 1) for x in range(1, width - 1)
+                  if rows[y][x] == ' '][:2000]
+
+    def moves_scan():
+        for x, y in open_cells:
+            scan_can_move_to(rows, width, height, (x + 1) * cell_size, y * cell_size, cell_size)
+
+    def moves_index():
+        cells = grid.cells
+        bit = STEP_BITS[(1, 0)]
+        for x, y in open_cells:
+            cells[y, x] & bit
+
+    frame_scan_ms = timed(frame_scan, repeats)
+    frame_index_ms = timed(frame_index, repeats)
+    moves_scan_ms = timed(moves_scan, repeats) / len(open_cells)
+    moves_index_ms = timed(moves_index, repeats) / len(open_cells)
+    return {
+        "size": size,
+        "visible_cells": cols * lines,
+        "frame_junctions_scan_ms": round(frame_scan_ms, 3),
+        "frame_junctions_index_ms": round(frame_index_ms, 3),
+        "move_check_scan_us": round(moves_scan_ms * 1000, 3),
+        "move_check_index_us": round(moves_index_ms * 1000, 3),
+    }
+
+
+def load_script(path, name):
+    """Import one of the games' hyphen-named scripts as a module"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def summarize(samples_ms):
+    """Mean, percentiles and worst case of a list of timings in ms"""
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": len(samples),
+        "mean_ms": round(float(samples.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(samples.max()), 3),
+    }
+
+
+def bench_generation(sizes, algorithms, repeats=1, seed=1):
+    results = []
+    for size in sizes:
+        for algorithm in algorithms:
+            ms = timed(lambda: generate_maze(size, size, algorithm, seed), repeats)
+            results.append({"size": size, "algorithm": algorithm, "ms": round(ms, 3)})
+    return results
+
+
+def bench_solving(sizes, algorithm=DEFAULT_ALGORITHM, seed=1):
+    """Every solver from start to goal, plus building and walking the distance field"""
+    results = []
+    for size in sizes:
+        grid = generate_maze(size, size, algorithm, seed)
+        start, goal = (grid.width - 2, grid.height - 2), (1, 1)
+        for method in maze_solvers.SOLVERS:
+            result = maze_solvers.solve(grid, start, goal, method)
+            results.append({"size": size, "algorithm": algorithm, "solver": method,
+                            "ms": round(result["time_ms"], 3),
+                            "nodes_expanded": result["nodes_expanded"],
+                            "path_length": result["path_length"]})
+        began = time.perf_counter()
+        field = maze_solvers.DistanceField(grid, goal)
+        build_ms = (time.perf_counter() - began) * 1000
+        began = time.perf_counter()
+        path = field.path_from(*start)
+        path_ms = (time.perf_counter() - began) * 1000
+        results.append({"size": size, "algorithm": algorithm, "solver": "distance_field",
+                        "build_ms": round(build_ms, 3), "ms": round(path_ms, 3),
+                        "path_length": len(path)})
+    return results
+
+
+class HeadlessWidget:
+    """Stands in for the Tk root, widgets and variables MazeGame talks to.
+
+    ``after(0, fn)`` runs fn right away (that is how worker threads hand results
+    to the UI); delayed callbacks are dropped since the benchmark drives frames
+    itself. ``config`` keeps the last options so the status text can be read.
+    """
+
+    def __init__(self, value=None):
+        self.value = value
+        self.options = {}
+
+    def get(self):
+        return self.value
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def after(self, delay, callback=None, *args):
+        if callback and delay == 0:
+            callback(*args)
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def make_headless_game(module, algorithm=DEFAULT_ALGORITHM):
+    """A MazeGame from maze-with-question.py with no Tk window, drawing to the dummy display"""
+
+    class HeadlessMazeGame(module.MazeGame):
+        def setup_ui(self):
+            self.root = HeadlessWidget()
+            self.status_label = HeadlessWidget()
+            self.generate_btn = HeadlessWidget()
+            self.solve_btn = HeadlessWidget()
+            self.reset_btn = HeadlessWidget()
+            self.width_var = HeadlessWidget()
+            self.height_var = HeadlessWidget()
+            self.width_entry = HeadlessWidget()
+            self.height_entry = HeadlessWidget()
+            self.algorithm_var = HeadlessWidget(algorithm)
+            self.endless_var = HeadlessWidget(False)
+            self.solver_var = HeadlessWidget("auto")
+            self.process_var = HeadlessWidget(False)
+            self.seed_var = HeadlessWidget("")
+            self.seed_entry = HeadlessWidget()
+            self.save_btn = HeadlessWidget()
+
+        def init_pygame(self):
+            pygame.init()
+            self.clock = pygame.time.Clock()
+            self.pygame_surface = pygame.display.set_mode((self.viewport_width, self.viewport_height))
+            self.init_lighting_system()
+
+    return HeadlessMazeGame()
+
+
+def bench_game(sizes, algorithm=DEFAULT_ALGORITHM, frames=300, seed=1):
+    """MazeGame generation, fog updates and frames while walking toward the exit"""
+    module = load_script(os.path.join(HERE, 'maze-with-question.py'), 'maze_with_question')
+    game = make_headless_game(module, algorithm)
+    results = []
+    for size in sizes:
+        began = time.perf_counter()
+        game.generate_maze(size, size, algorithm, seed=seed)
+        generate_ms = (time.perf_counter() - began) * 1000
+
+        path = game.distance_field.path_from(game.width - 2, game.height - 2)
+        fog_ms, frame_ms, minimap_ms = [], [], []
+        for i in range(frames):
+            x, y = path[min(i, len(path) - 1)]
+            game.player_x, game.player_y = x * game.cell_size, y * game.cell_size
+            game.update_camera()
+            began = time.perf_counter()
+            game.update_fog_of_war()
+            fog_ms.append((time.perf_counter() - began) * 1000)
+            began = time.perf_counter()
+            game.render_game()
+            frame_ms.append((time.perf_counter() - began) * 1000)
+            began = time.perf_counter()
+            game.render_minimap()
+            minimap_ms.append((time.perf_counter() - began) * 1000)
+
+        game.minimap_expanded = True
+        expanded_ms = []
+        for _ in range(max(1, frames // 10)):
+            began = time.perf_counter()
+            game.render_minimap()
+            expanded_ms.append((time.perf_counter() - began) * 1000)
+        game.minimap_expanded = False
+
+        game.solve_maze()
+        results.append({
+            "size": size,
+            "algorithm": algorithm,
+            "cell_size": game.cell_size,
+            "generate_ms": round(generate_ms, 3),
+            "fog_update": summarize(fog_ms),
+            "frame": summarize(frame_ms),
+            "minimap": summarize(minimap_ms),
+            "expanded_minimap": summarize(expanded_ms),
+            "solve": game.solve_stats,
+            "tile_cache": {"hits": game.tile_cache.hits, "misses": game.tile_cache.misses},
+        })
+    return results
+
+
+def bench_v1(sizes, seed=1):
+    """v1 prims_maze and a_star_solve; without a display only their engine calls are timed"""
+    try:
+        module = load_script(os.path.join(HERE, '..', 'escape-maze-v1', 'maze-generator.py'), 'maze_generator_v1')
+    except Exception as e:
+        # The v1 script opens a turtle window at import time
+        module = None
+        reason = f"turtle unavailable: {str(e).splitlines()[0]}"
+    results = []
+    for size in sizes:
+        if module and size <= V1_DRAW_MAX_SIZE:
+            block_size = max(2, 600 // size)
+            generate_ms = timed(lambda: module.prims_maze(size, size, block_size, seed=seed), 1)
+            solve_ms = timed(module.a_star_solve, 1)
+            results.append({"size": size, "turtle": True, "prims_maze_ms": round(generate_ms, 3),
+                            "a_star_solve_ms": round(solve_ms, 3),
+                            "path_length": len(module.solution_path)})
+            continue
+
+        # Same engine work prims_maze/a_star_solve do, minus the turtle drawing
+        def prims_maze():
+            grid = generate_maze(size, size, seed=seed)
+            rows = [list(row) for row in grid.to_rows()]
+            return grid, rows, maze_solvers.DistanceField(grid, (1, 1))
+
+        began = time.perf_counter()
+        grid, _, _ = prims_maze()
+        generate_ms = (time.perf_counter() - began) * 1000
+        result = maze_solvers.solve(grid, (grid.width - 2, grid.height - 2), (1, 1), "astar")
+        results.append({"size": size, "turtle": False,
+                        "reason": reason if not module else f"turtle drawing skipped above {V1_DRAW_MAX_SIZE}",
+                        "prims_maze_ms": round(generate_ms, 3),
+                        "a_star_solve_ms": round(result["time_ms"], 3),
+                        "path_length": result["path_length"]})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless maze benchmarks with a JSON report")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=list(ALGORITHMS),
+                        help="generators to time (the game and solvers use --algorithm)")
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default=DEFAULT_ALGORITHM)
+    parser.add_argument('--frames', type=int, default=300, help="frames rendered per game size")
+    parser.add_argument('--repeats', type=int, default=1, help="generation repeats per size/algorithm")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip', nargs='+', default=[],
+                        choices=['generation', 'solving', 'game', 'v1', 'connectivity'])
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "frames": args.frames,
+            "seed": args.seed,
+        }
+    }
+    if 'generation' not in args.skip:
+        report["generation"] = bench_generation(args.sizes, args.algorithms, args.repeats, args.seed)
+    if 'solving' not in args.skip:
+        report["solving"] = bench_solving(args.sizes, args.algorithm, args.seed)
+    if 'game' not in args.skip:
+        report["game"] = bench_game(args.sizes, args.algorithm, args.frames, args.seed)
+    if 'v1' not in args.skip:
+        report["v1"] = bench_v1(args.sizes, args.seed)
+    if 'connectivity' not in args.skip:
+        report["connectivity"] = bench_connectivity(seed=args.seed)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
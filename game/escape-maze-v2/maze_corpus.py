@@ -0,0 +1,193 @@
+"""Generate a corpus of seeded mazes and write per-maze difficulty statistics.
+
+Mazes are built and solved in a process pool (one worker per core by
+default) and every row is written as soon as its maze is done, so big runs
+stream to disk instead of piling up in memory. Run from this folder:
+
+    python maze_corpus.py --count 10000 --size 101 --output corpus.csv
+    python maze_corpus.py --count 500 --size 51 --algorithm kruskal --solver bfs --output stats.csv
+    python maze_corpus.py --count 10000 --size 101 --output corpus.parquet   # needs pyarrow
+
+The same --first-seed, --count, --size and --algorithm always give the same
+mazes (and the same seeds regenerate them in the game).
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import time
+import maze_solvers
+from maze_generators import generate_maze, odd_size, ALGORITHMS, DEFAULT_ALGORITHM
+from maze_grid import WALL, JUNCTION, DEGREE
+
+GOAL = (1, 1)
+COLUMNS = (
+    "seed", "algorithm", "width", "height", "open_cells", "dead_ends", "junctions",
+    "junction_density", "path_length", "path_ratio", "questions", "solver",
+    "nodes_expanded", "generate_ms", "solve_ms",
+)
+PARQUET_BATCH = 1000  # Rows per Parquet row group
+
+
+def maze_stats(task):
+    """Generate and solve one maze; returns its row of statistics (a dict keyed by COLUMNS)"""
+    seed, width, height, algorithm, solver = task
+    began = time.perf_counter()
+    grid = generate_maze(width, height, algorithm, seed)
+    generate_ms = (time.perf_counter() - began) * 1000
+
+    start = (grid.width - 2, grid.height - 2)
+    method = maze_solvers.pick_solver(grid) if solver == "auto" else solver
+    result = maze_solvers.solve(grid, start, GOAL, method)
+    path = result["path"]
+
+    open_cells = int(((grid.cells & WALL) == 0).sum())
+    degree = DEGREE[grid.cells]
+    junctions = int(((grid.cells & JUNCTION) != 0).sum())
+    # The game asks a question at every junction it steps onto, so a run
+    # along the shortest path answers one per junction on it
+    questions = sum(1 for x, y in path[1:] if grid.cells[y, x] & JUNCTION)
+    return {
+        "seed": seed,
+        "algorithm": algorithm,
+        "width": grid.width,
+        "height": grid.height,
+        "open_cells": open_cells,
+        "dead_ends": int(((degree == 1) & ((grid.cells & WALL) == 0)).sum()),
+        "junctions": junctions,
+        "junction_density": round(junctions / open_cells, 6) if open_cells else 0.0,
+        "path_length": len(path),
+        "path_ratio": round(len(path) / open_cells, 6) if open_cells else 0.0,
+        "questions": questions,
+        "solver": method,
+        "nodes_expanded": result["nodes_expanded"],
+        "generate_ms": round(generate_ms, 3),
+        "solve_ms": round(result["time_ms"], 3),
+    }
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='') if path != '-' else sys.stdout
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ParquetWriter:
+    """Buffers PARQUET_BATCH rows per row group; needs pyarrow"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow (pip install pyarrow), or write a .csv instead")
+        self.pyarrow = pyarrow
+        self.writer = None
+        self.path = path
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= PARQUET_BATCH:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        table = self.pyarrow.Table.from_pylist(self.rows)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        if self.writer:
+            self.writer.close()
+
+
+def open_writer(path):
+    if path.endswith('.parquet'):
+        return ParquetWriter(path)
+    return CsvWriter(path)
+
+
+def generate_corpus(count, width, height, algorithm=DEFAULT_ALGORITHM, solver="auto", first_seed=0,
+                    workers=None, on_row=None):
+    """Run maze_stats for seeds first_seed .. first_seed + count - 1 across a process pool.
+
+    ``on_row(row)`` is called in the parent for every finished maze, in
+    completion order (rows carry their seed). Returns the number of mazes.
+    """
+    tasks = [(seed, width, height, algorithm, solver) for seed in range(first_seed, first_seed + count)]
+    workers = workers or os.cpu_count() or 1
+    # Big chunks keep pickling overhead low, small enough ones keep all workers busy to the end
+    chunksize = max(1, min(64, count // (workers * 8)))
+    done = 0
+    if workers == 1:
+        rows = map(maze_stats, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        rows = pool.imap_unordered(maze_stats, tasks, chunksize)
+    try:
+        for row in rows:
+            done += 1
+            if on_row:
+                on_row(row)
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded mazes in parallel and write their statistics")
+    parser.add_argument('--count', type=int, default=1000, help="number of mazes")
+    parser.add_argument('--size', type=int, default=101, help="width and height (rounded up to odd)")
+    parser.add_argument('--width', type=int, help="overrides --size")
+    parser.add_argument('--height', type=int, help="overrides --size")
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default=DEFAULT_ALGORITHM)
+    parser.add_argument('--solver', choices=["auto"] + list(maze_solvers.SOLVERS), default="auto")
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument('--output', default='-', help="a .csv or .parquet file (default: CSV on stdout)")
+    args = parser.parse_args(argv)
+
+    width, height = odd_size(args.width or args.size, args.height or args.size)
+    writer = open_writer(args.output)
+    began = time.perf_counter()
+    last_report = began
+    written = 0
+
+    def on_row(row):
+        nonlocal last_report, written
+        writer.write(row)
+        written += 1
+        now = time.perf_counter()
+        if now - last_report >= 5:
+            last_report = now
+            print(f"{written}/{args.count} mazes", file=sys.stderr)
+
+    try:
+        count = generate_corpus(args.count, width, height, args.algorithm, args.solver, args.first_seed,
+                                args.workers, on_row)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - began
+    print(f"{count} mazes of {width}x{height} in {elapsed:.1f}s ({count / elapsed:.1f} mazes/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+import random
+import numpy as np
+from maze_grid import MazeGrid, WALL
+
+# Every generator works on the cell lattice: maze cells sit on odd grid
+# coordinates and the even coordinates between two cells are the walls that
+# get knocked out. Carving happens in a flat bytearray (much faster than
+# NumPy scalar writes) that is turned into a MazeGrid at the end.
+
+DEFAULT_ALGORITHM = "prim"
+
+
+def odd_size(width, height):
+    """Round maze dimensions up to odd numbers like the games always did"""
+    if width % 2 == 0: width += 1
+    if height % 2 == 0: height += 1
+    return width, height
+
+
+class _Carver:
+    """Flat wall buffer plus helpers to carve cells and passages by cell index"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cols = (width - 1) // 2
+        self.rows = (height - 1) // 2
+        self.total = self.cols * self.rows
+        self.buf = bytearray([WALL]) * (width * height)
+
+    def offset(self, cell):
+        cy, cx = divmod(cell, self.cols)
+        return (2 * cy + 1) * self.width + 2 * cx + 1
+
+    def carve_cell(self, cell):
+        self.buf[self.offset(cell)] = 0
+
+    def carve_passage(self, a, b):
+        """Open cell b and the wall between neighbouring cells a and b"""
+        oa = self.offset(a)
+        ob = self.offset(b)
+        self.buf[(oa + ob) // 2] = 0
+        self.buf[ob] = 0
+
+    def neighbours(self, cell):
+        cy, cx = divmod(cell, self.cols)
+        result = []
+        if cx > 0: result.append(cell - 1)
+        if cx < self.cols - 1: result.append(cell + 1)
+        if cy > 0: result.append(cell - self.cols)
+        if cy < self.rows - 1: result.append(cell + self.cols)
+        return result
+
+    def to_grid(self):
+        grid = MazeGrid(self.width, self.height)
+        grid.cells[:] = np.frombuffer(bytes(self.buf), dtype=np.uint8).reshape(self.height, self.width)
+        return grid
+
+
+def _progress_step(total):
+    # Report roughly 100 times per maze regardless of its size
+    return max(1, total // 100)
+
+
+def _prim(carver, rng, progress):
+    """Randomized Prim: grow from a random carved cell, O(1) swap-remove frontier"""
+    buf = carver.buf
+    offset = carver.offset
+    start = rng.randrange(carver.total)
+    carver.carve_cell(start)
+    frontier = [start]
+    done = 1
+    step = _progress_step(carver.total)
+    while frontier:
+        i = rng.randrange(len(frontier))
+        cell = frontier[i]
+        frontier[i] = frontier[-1]
+        frontier.pop()
+        neighbours = carver.neighbours(cell)
+        rng.shuffle(neighbours)
+        for n in neighbours:
+            if buf[offset(n)]:
+                carver.carve_passage(cell, n)
+                frontier.append(n)
+                done += 1
+                if progress and done % step == 0:
+                    progress(done, carver.total)
+
+
+def _backtracker(carver, rng, progress):
+    """Recursive backtracker (iterative depth-first search with an explicit stack)"""
+    buf = carver.buf
+    offset = carver.offset
+    start = rng.randrange(carver.total)
+    carver.carve_cell(start)
+    stack = [start]
+    done = 1
+    step = _progress_step(carver.total)
+    while stack:
+        cell = stack[-1]
+        unvisited = [n for n in carver.neighbours(cell) if buf[offset(n)]]
+        if not unvisited:
+            stack.pop()
+            continue
+        n = unvisited[rng.randrange(len(unvisited))]
+        carver.carve_passage(cell, n)
+        stack.append(n)
+        done += 1
+        if progress and done % step == 0:
+            progress(done, carver.total)
+
+
+def _kruskal(carver, rng, progress):
+    """Randomized Kruskal over all cell edges using union-find with path halving"""
+    cols, total = carver.cols, carver.total
+    parent = list(range(total))
+
+    def find(c):
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    edges = []
+    for cell in range(total):
+        if cell % cols < cols - 1:
+            edges.append((cell, cell + 1))
+        if cell + cols < total:
+            edges.append((cell, cell + cols))
+    rng.shuffle(edges)
+
+    carver.carve_cell(0)
+    done = 1
+    step = _progress_step(total)
+    for a, b in edges:
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        parent[rb] = ra
+        carver.carve_cell(a)
+        carver.carve_passage(a, b)
+        done += 1
+        if progress and done % step == 0:
+            progress(done, total)
+        if done == total:
+            break
+
+
+def _shuffle(items, rng, progress, done, total):
+    """rng.shuffle(items) (same order for the same seed) with progress calls along the way.
+
+    Shuffling a million cells takes most of a second, too long to go without
+    a chance to cancel.
+    """
+    if not progress:
+        rng.shuffle(items)
+        return
+    randbelow = rng._randbelow  # What Random.shuffle draws from
+    step = _progress_step(total)
+    for i in reversed(range(1, len(items))):
+        j = randbelow(i + 1)
+        items[i], items[j] = items[j], items[i]
+        if i % step == 0:
+            progress(done, total)
+
+
+def _wilson(carver, rng, progress):
+    """Wilson's algorithm: loop-erased random walks give a uniform spanning tree"""
+    total = carver.total
+    in_tree = bytearray(total)
+    exit_to = [0] * total
+    first = rng.randrange(total)
+    in_tree[first] = 1
+    carver.carve_cell(first)
+    done = 1
+    step = _progress_step(total)
+    # Walk from every cell in a shuffled order; cells already in the tree are skipped
+    order = list(range(total))
+    _shuffle(order, rng, progress, done, total)
+    for start in order:
+        if in_tree[start]:
+            continue
+        # Random walk until the tree is hit; overwriting exit_to erases loops implicitly
+        cell = start
+        walked = 0
+        while not in_tree[cell]:
+            neighbours = carver.neighbours(cell)
+            nxt = neighbours[rng.randrange(len(neighbours))]
+            exit_to[cell] = nxt
+            cell = nxt
+            # The first walks can take millions of steps: report (and let a job cancel) along the way
+            walked += 1
+            if progress and walked == step:
+                walked = 0
+                progress(done, total)
+        # Add the loop-erased path to the tree
+        cell = start
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            carver.carve_cell(cell)
+            carver.carve_passage(cell, exit_to[cell])
+            cell = exit_to[cell]
+            done += 1
+            if progress and done % step == 0:
+                progress(done, total)
+
+
+class EllerRows:
+    """Eller's algorithm producing the maze two grid rows at a time.
+
+    Only the set labels of the current cell row are kept, so any number of rows
+    can be produced in O(width) memory. ``next_rows(last)`` returns the grid row
+    through the cells and the wall row below it as bytearrays of ``width``.
+    """
+
+    def __init__(self, width, rng, merge_chance=0.5, drop_chance=0.5):
+        self.width = width
+        self.cols = (width - 1) // 2
+        self.rng = rng
+        self.merge_chance = merge_chance
+        self.drop_chance = drop_chance
+        self.sets = [None] * self.cols
+        self.next_set = 0
+
+    def next_rows(self, last=False):
+        rng, cols, sets = self.rng, self.cols, self.sets
+        cell_row = bytearray([WALL]) * self.width
+        below_row = bytearray([WALL]) * self.width
+
+        # Give cells that nothing dropped into a fresh set of their own
+        members = {}
+        for x in range(cols):
+            if sets[x] is None:
+                sets[x] = self.next_set
+                self.next_set += 1
+            members.setdefault(sets[x], []).append(x)
+            cell_row[2 * x + 1] = 0
+
+        # Randomly join neighbours from different sets (always on the last row)
+        for x in range(cols - 1):
+            a, b = sets[x], sets[x + 1]
+            if a == b or not (last or rng.random() < self.merge_chance):
+                continue
+            cell_row[2 * x + 2] = 0
+            # Relabel the smaller set so merging stays cheap
+            if len(members[a]) < len(members[b]):
+                a, b = b, a
+            for col in members[b]:
+                sets[col] = a
+            members[a].extend(members.pop(b))
+
+        if last:
+            return cell_row, below_row
+
+        # Every set drops at least one cell into the next row
+        next_sets = [None] * cols
+        for set_id, cells in members.items():
+            dropped = [x for x in cells if rng.random() < self.drop_chance]
+            if not dropped:
+                dropped = [cells[rng.randrange(len(cells))]]
+            for x in dropped:
+                below_row[2 * x + 1] = 0
+                next_sets[x] = set_id
+        self.sets = next_sets
+        return cell_row, below_row
+
+
+def _eller(carver, rng, progress):
+    """Eller's algorithm, one cell row at a time"""
+    rows = EllerRows(carver.width, rng)
+    width = carver.width
+    step = max(1, carver.rows // 100)
+    for cy in range(carver.rows):
+        cell_row, below_row = rows.next_rows(last=cy == carver.rows - 1)
+        y = 2 * cy + 1
+        carver.buf[y * width:(y + 1) * width] = cell_row
+        carver.buf[(y + 1) * width:(y + 2) * width] = below_row
+        if progress and cy % step == 0:
+            progress((cy + 1) * carver.cols, carver.total)
+
+
+GENERATORS = {
+    "prim": _prim,
+    "backtracker": _backtracker,
+    "kruskal": _kruskal,
+    "wilson": _wilson,
+    "eller": _eller,
+}
+
+ALGORITHMS = tuple(GENERATORS)
+
+
+def generate_maze(width, height, algorithm=DEFAULT_ALGORITHM, seed=None, progress=None):
+    """Generate a perfect maze as a MazeGrid.
+
+    Sizes are rounded up to odd numbers, the start (bottom-right) and goal
+    (top-left) cells are always open and the connectivity index (neighbour
+    nibble and junction flags) is already built.
+    The same (width, height, algorithm, seed) always gives the same maze.
+    ``progress(cells_done, cells_total)`` is called about 100 times.
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown maze algorithm '{algorithm}', choose from {', '.join(ALGORITHMS)}")
+    width, height = odd_size(width, height)
+    carver = _Carver(width, height)
+    GENERATORS[algorithm](carver, random.Random(seed), progress)
+    grid = carver.to_grid()
+
+    # Ensure start and end are open
+    grid.carve(width - 2, height - 2)
+    grid.carve(1, 1)
+    grid.build_connectivity()
+    return grid
@@ -0,0 +1,173 @@
+from functools import lru_cache
+import numpy as np
+
+# Cell flag bits (one uint8 per cell)
+WALL = 0x01
+JUNCTION = 0x02
+
+# High nibble: which 4-neighbours of an open cell are open too
+OPEN_LEFT = 0x10
+OPEN_RIGHT = 0x20
+OPEN_UP = 0x40
+OPEN_DOWN = 0x80
+OPEN_ANY = OPEN_LEFT | OPEN_RIGHT | OPEN_UP | OPEN_DOWN
+STEP_BITS = {(-1, 0): OPEN_LEFT, (1, 0): OPEN_RIGHT, (0, -1): OPEN_UP, (0, 1): OPEN_DOWN}
+
+# Number of open neighbours for every possible cell byte
+DEGREE = np.array([bin(value & OPEN_ANY).count('1') for value in range(256)], dtype=np.uint8)
+
+# Hard limit for the size inputs; a 2001x2001 grid is only ~4 MB per layer
+MIN_MAZE_SIZE = 5
+MAX_MAZE_SIZE = 2001
+
+
+class MazeGrid:
+    """Compact maze storage: one uint8 of flags per cell plus an explored layer.
+
+    ``cells`` holds the WALL/JUNCTION bits and the open-neighbour nibble, and
+    ``explored`` holds the fog of war opacity (0-255) for every cell, both as
+    ``(height, width)`` arrays so a row is ``cells[y]`` and a single cell is
+    ``cells[y, x]``. Call ``build_connectivity`` after carving.
+    """
+
+    def __init__(self, width, height, unexplored_opacity=0):
+        self.width = width
+        self.height = height
+        self.cells = np.full((height, width), WALL, dtype=np.uint8)
+        self.explored = np.full((height, width), unexplored_opacity, dtype=np.uint8)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a grid from a list of '#'/' ' strings or character lists"""
+        grid = cls(len(rows[0]), len(rows))
+        chars = np.array([list(row) for row in rows])
+        grid.cells[chars != '#'] = 0
+        grid.build_connectivity()
+        return grid
+
+    @classmethod
+    def from_cells(cls, cells, unexplored_opacity=0):
+        """Wrap an existing (height, width) uint8 cell array, e.g. a memmap, without copying it"""
+        grid = cls.__new__(cls)
+        grid.height, grid.width = cells.shape
+        grid.cells = cells
+        # np.zeros memory is only touched when written, so a huge fresh grid costs nothing yet
+        if unexplored_opacity:
+            grid.explored = np.full(cells.shape, unexplored_opacity, dtype=np.uint8)
+        else:
+            grid.explored = np.zeros(cells.shape, dtype=np.uint8)
+        return grid
+
+    @classmethod
+    def from_buffer(cls, width, height, data, unexplored_opacity=0):
+        """Rebuild a grid from ``cells.tobytes()`` (flags and connectivity are kept as is)"""
+        grid = cls(width, height, unexplored_opacity)
+        grid.cells[:] = np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+        return grid
+
+    def to_rows(self):
+        """Return the maze as a list of '#'/' ' strings (handy for debugging)"""
+        walls = (self.cells & WALL) != 0
+        return [''.join('#' if w else ' ' for w in row) for row in walls.tolist()]
+
+    @property
+    def nbytes(self):
+        return self.cells.nbytes + self.explored.nbytes
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_wall(self, x, y):
+        """Out-of-bounds cells count as walls"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return True
+        return bool(self.cells[y, x] & WALL)
+
+    def is_open(self, x, y):
+        return not self.is_wall(x, y)
+
+    def is_junction(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self.cells[y, x] & JUNCTION)
+
+    def can_step(self, x, y, dx, dy):
+        """True if (x, y) is open and so is its neighbour in direction (dx, dy)"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self.cells[y, x] & STEP_BITS[(dx, dy)])
+
+    def carve(self, x, y):
+        self.cells[y, x] &= ~WALL & 0xFF
+
+    def open_mask(self):
+        """Boolean array, True where the cell is a path"""
+        return (self.cells & WALL) == 0
+
+    def build_connectivity(self):
+        """Recompute the open-neighbour nibble and junction flags from the walls.
+
+        Junctions are open cells with more than 2 open neighbours. Runs as a
+        handful of whole-array operations, so it is cheap to redo after carving.
+        """
+        open_cells = self.open_mask()
+        padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = open_cells
+        mask = (padded[1:-1, :-2] * OPEN_LEFT | padded[1:-1, 2:] * OPEN_RIGHT |
+                padded[:-2, 1:-1] * OPEN_UP | padded[2:, 1:-1] * OPEN_DOWN).astype(np.uint8)
+        mask[~open_cells] = 0
+        junctions = DEGREE[mask] > 2
+        self.cells &= WALL
+        self.cells |= mask
+        self.cells[junctions] |= JUNCTION
+
+    def degree_map(self):
+        """Number of open neighbours of every cell (0 for walls)"""
+        return DEGREE[self.cells]
+
+    def junction_mask(self):
+        return (self.cells & JUNCTION) != 0
+
+    def reset_explored(self, opacity):
+        self.explored.fill(opacity)
+
+    def reveal(self, x, y, stencil):
+        """Raise explored opacity around (x, y) to at least the centred stencil.
+
+        One clipped ``np.maximum`` over a slice, so cost does not depend on how
+        many Python-level cells the stencil covers. Returns the touched cell
+        rectangle (x0, y0, x1, y1).
+        """
+        radius = stencil.shape[0] // 2
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        x1, y1 = min(self.width, x + radius + 1), min(self.height, y + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return x0, y0, x0, y0
+        window = self.explored[y0:y1, x0:x1]
+        np.maximum(window, stencil[y0 - y + radius:y1 - y + radius, x0 - x + radius:x1 - x + radius],
+                   out=window)
+        return x0, y0, x1, y1
+
+
+@lru_cache(maxsize=16)
+def fog_stencil(radius_px, softness, cell_size, visible, explored):
+    """Radial fog of war opacity per cell offset around the player, for ``MazeGrid.reveal``.
+
+    Cells within ``radius_px`` pixels get ``visible``, the fade zone out to
+    ``radius_px * softness`` fades from ``explored`` down to 0. Cached by its
+    arguments (and read-only, as the games share it), so it is only rebuilt
+    when the fog settings or the cell size change.
+    """
+    cell_size = max(cell_size, 1)
+    grid_radius = max(1, int(radius_px / cell_size))
+    offsets = np.arange(-grid_radius, grid_radius + 1)
+    distance = np.hypot(offsets[None, :], offsets[:, None]) * cell_size
+
+    stencil = np.zeros(distance.shape, dtype=np.uint8)
+    fade_zone = (distance > radius_px) & (distance <= radius_px * softness)
+    if fade_zone.any():
+        fade_factor = 1.0 - (distance[fade_zone] - radius_px) / (radius_px * (softness - 1))
+        stencil[fade_zone] = (explored * fade_factor).astype(np.uint8)
+    stencil[distance <= radius_px] = visible
+    stencil.flags.writeable = False
+    return stencil
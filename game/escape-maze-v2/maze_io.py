@@ -0,0 +1,176 @@
+import os
+import struct
+import numpy as np
+from maze_generators import odd_size
+from maze_grid import MazeGrid, WALL
+from maze_solvers import DistanceField
+
+# .maze file layout (little endian):
+#
+#   header   MAGIC, version, width, height, seed, algorithm and the
+#            (offset, length) of every section; offset 0 means "not stored"
+#   walls    np.packbits of the wall bit, row-major (always present)
+#   cells    the full uint8 cell flags (walls, junctions, connectivity
+#            nibble) so a load can memory-map them instead of rebuilding
+#   distance int32 BFS distance to the goal (1, 1) for every cell
+#
+# Sections are 64-byte aligned so they can be mapped straight into arrays.
+
+MAGIC = b'MAZE'
+VERSION = 1
+NO_SEED = 2 ** 64 - 1
+GOAL = (1, 1)
+_HEADER = struct.Struct('<4sHHIIQ16s6Q')
+_ALIGN = 64
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'escape-maze')
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def save_maze(path, grid, seed=None, algorithm="", distance_field=None, include_cells=True):
+    """Write a MazeGrid (and optionally its goal distance field) to a .maze file.
+
+    The write goes to a temporary file that is renamed into place, so readers
+    (and the cache) never see a half-written maze.
+    """
+    walls = np.packbits((grid.cells & WALL).astype(bool), axis=None).tobytes()
+    sections = [walls,
+                grid.cells.tobytes() if include_cells else b'',
+                distance_field.distances.tobytes() if distance_field is not None else b'']
+
+    layout = []
+    offset = _aligned(_HEADER.size)
+    for data in sections:
+        if data:
+            layout += [offset, len(data)]
+            offset = _aligned(offset + len(data))
+        else:
+            layout += [0, 0]
+
+    header = _HEADER.pack(MAGIC, VERSION, 0, grid.width, grid.height,
+                          NO_SEED if seed is None else seed,
+                          algorithm.encode('ascii')[:16], *layout)
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        for data, section_offset in zip(sections, layout[::2]):
+            if data:
+                f.seek(section_offset)
+                f.write(data)
+    os.replace(temp_path, path)
+
+
+def read_header(path):
+    """Dimensions, seed, algorithm and section table of a .maze file"""
+    with open(path, 'rb') as f:
+        raw = f.read(_HEADER.size)
+    if len(raw) < _HEADER.size:
+        raise ValueError(f"{path} is not a maze file (too short)")
+    magic, version, _, width, height, seed, algorithm, *layout = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a maze file")
+    if version != VERSION:
+        raise ValueError(f"{path} has unsupported maze file version {version}")
+    return {
+        "width": width,
+        "height": height,
+        "seed": None if seed == NO_SEED else seed,
+        "algorithm": algorithm.rstrip(b'\0').decode('ascii'),
+        "walls": tuple(layout[0:2]),
+        "cells": tuple(layout[2:4]),
+        "distance": tuple(layout[4:6]),
+    }
+
+
+def load_maze(path, use_mmap=True):
+    """Read a .maze file; returns (grid, distance_field or None, header dict).
+
+    With ``use_mmap`` the stored cells and distances are mapped copy-on-write
+    and used in place (the grid and the distance field read the mapping), so
+    even a 2001x2001 maze opens without reading or rebuilding anything up
+    front; the only new array is the zero-filled explored layer, which the OS
+    hands out lazily. Files without a cells section are unpacked from the
+    wall bits.
+    """
+    info = read_header(path)
+    width, height = info["width"], info["height"]
+
+    def section(name, dtype, count):
+        offset, length = info[name]
+        if use_mmap:
+            return np.memmap(path, dtype=dtype, mode='c', offset=offset, shape=(count,))
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return np.frombuffer(f.read(length), dtype=dtype).copy()
+
+    if info["cells"][0]:
+        flat_cells = section("cells", np.uint8, width * height)
+        grid = MazeGrid.from_cells(flat_cells.reshape(height, width))
+    else:
+        bits = section("walls", np.uint8, info["walls"][1])
+        walls = np.unpackbits(bits, count=width * height).reshape(height, width)
+        grid = MazeGrid.from_cells(walls * np.uint8(WALL))
+        grid.build_connectivity()
+        flat_cells = None
+
+    field = None
+    if info["distance"][0]:
+        distances = section("distance", np.int32, width * height)
+        # Memoryviews give the fast Python-int scalar reads DistanceField expects,
+        # straight from the mapping instead of a copy of the cells
+        cells = memoryview(flat_cells) if flat_cells is not None else None
+        field = DistanceField(grid, GOAL, memoryview(distances), cells)
+    return grid, field, info
+
+
+class MazeCache:
+    """Generated mazes on disk, keyed by (width, height, seed, algorithm).
+
+    Only mazes of at least ``min_size`` cells per side are worth caching (small
+    ones generate faster than a file opens); the ``max_entries`` most recently
+    used files are kept.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, min_size=301, max_entries=16):
+        self.directory = directory
+        self.min_size = min_size
+        self.max_entries = max_entries
+
+    def path(self, width, height, seed, algorithm):
+        width, height = odd_size(width, height)
+        return os.path.join(self.directory, f"{width}x{height}-{algorithm}-{seed}.maze")
+
+    def wants(self, width, height):
+        return max(width, height) >= self.min_size
+
+    def load(self, width, height, seed, algorithm):
+        """(grid, distance_field) from the cache, or None on a miss"""
+        path = self.path(width, height, seed, algorithm)
+        if not os.path.exists(path):
+            return None
+        try:
+            grid, field, _ = load_maze(path)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # Mark as recently used
+        return grid, field
+
+    def store(self, grid, seed, algorithm, distance_field=None):
+        if not self.wants(grid.width, grid.height):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        save_maze(self.path(grid.width, grid.height, seed, algorithm), grid, seed, algorithm, distance_field)
+        self.prune()
+
+    def prune(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                   if name.endswith('.maze')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,117 @@
+import multiprocessing
+import queue
+import threading
+import time
+from maze_generators import generate_maze
+from maze_grid import MazeGrid
+from maze_solvers import DistanceField
+
+# A generation job runs generate_maze (plus the goal distance field) in a
+# worker thread or a worker process. Everything it reports goes through one
+# message queue that the UI drains on its own schedule, so the Tk event queue
+# is never flooded and the result crosses a process boundary as plain bytes.
+
+PROGRESS_INTERVAL = 0.1  # Seconds between progress messages (about 10 Hz)
+GOAL = (1, 1)
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+class _ThrottledProgress:
+    """generate_maze progress callback: checks for cancel, forwards at most every PROGRESS_INTERVAL"""
+
+    def __init__(self, messages, cancel):
+        self.messages = messages
+        self.cancel = cancel
+        self.last = 0.0
+
+    def __call__(self, done, total):
+        if self.cancel.is_set():
+            raise GenerationCancelled()
+        now = time.perf_counter()
+        if now - self.last >= PROGRESS_INTERVAL:
+            self.last = now
+            self.messages.put(('progress', done, total))
+
+
+def _generate_worker(width, height, algorithm, seed, cache, messages, cancel):
+    """Job body (module level so a spawned process can run it)"""
+    try:
+        progress = _ThrottledProgress(messages, cancel)
+        grid = generate_maze(width, height, algorithm, seed, progress=progress)
+        progress(1, 1)  # Last chance to cancel before the distance field
+        field = DistanceField(grid, GOAL)
+        if cache:
+            try:
+                cache.store(grid, seed, algorithm, field)
+            except OSError:
+                pass  # A read-only or full disk only costs the cache
+        messages.put(('done', grid.width, grid.height, grid.cells.tobytes(), field.flat_distances.tobytes()))
+    except GenerationCancelled:
+        messages.put(('cancelled',))
+    except Exception as e:
+        messages.put(('error', str(e)))
+
+
+class GenerationJob:
+    """One maze being generated off the UI thread.
+
+    ``start`` launches the worker (a daemon thread, or a spawned process when
+    ``use_process`` is set so generation does not compete with Tk for the GIL).
+    With a ``maze_io.MazeCache`` the finished maze is also stored on disk.
+    The UI calls ``poll`` periodically; it returns the messages received since
+    the last call: ``('progress', done, total)``, ``('done', grid, field)``,
+    ``('cancelled',)`` or ``('error', message)``. ``cancel`` stops the job; a
+    process is terminated right away, a thread stops at its next progress check.
+    """
+
+    def __init__(self, width, height, algorithm, seed, use_process=False, cache=None):
+        self.args = (width, height, algorithm, seed, cache)
+        self.use_process = use_process
+        self.worker = None
+        self.finished = False
+        if use_process:
+            # Spawn rather than fork: the parent holds Tk and SDL state
+            context = multiprocessing.get_context('spawn')
+            self.messages = context.Queue()
+            self.cancel_event = context.Event()
+        else:
+            self.messages = queue.Queue()
+            self.cancel_event = threading.Event()
+
+    def start(self):
+        args = self.args + (self.messages, self.cancel_event)
+        if self.use_process:
+            self.worker = multiprocessing.get_context('spawn').Process(target=_generate_worker, args=args,
+                                                                       daemon=True)
+        else:
+            self.worker = threading.Thread(target=_generate_worker, args=args, daemon=True)
+        self.worker.start()
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.use_process and self.worker and self.worker.is_alive():
+            self.worker.terminate()
+        self.finished = True
+
+    def poll(self):
+        messages = []
+        while not self.finished:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                if self.use_process and not self.worker.is_alive() and self.messages.empty():
+                    messages.append(('error', f"worker exited with code {self.worker.exitcode}"))
+                    self.finished = True
+                break
+            if message[0] == 'done':
+                _, width, height, cells, distances = message
+                grid = MazeGrid.from_buffer(width, height, cells)
+                message = ('done', grid, DistanceField.from_buffer(grid, GOAL, distances))
+            if message[0] != 'progress':
+                self.finished = True
+            messages.append(message)
+        return messages
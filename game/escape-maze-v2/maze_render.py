@@ -0,0 +1,215 @@
+from collections import OrderedDict
+import numpy as np
+import pygame
+from maze_grid import WALL, JUNCTION
+
+# Cell colours used by MazeGame.render_game
+PATH_COLOR = (60, 60, 60)
+WALL_COLOR = (255, 255, 255)
+JUNCTION_COLOR = (100, 80, 120)  # Unvisited junction - brighter purple
+VISITED_JUNCTION_COLOR = (80, 60, 100)  # Visited junction - darker purple
+QUESTION_COLOR = (255, 255, 0)
+
+# Indexed by cell kind: 0 path, 1 wall, 2 junction, 3 visited junction
+PALETTE = np.array([PATH_COLOR, WALL_COLOR, JUNCTION_COLOR, VISITED_JUNCTION_COLOR], dtype=np.uint8)
+
+
+def radial_alpha(diameter, inner_radius, outer_radius, inner_alpha, fade_alpha):
+    """Alpha (diameter x diameter uint8) of a radial gradient around the centre pixel.
+
+    ``inner_alpha`` out to ``inner_radius``, then a linear fade from
+    ``fade_alpha`` down to 0 at ``outer_radius``; one vectorized pass instead
+    of drawing hundreds of concentric circles.
+    """
+    offsets = (np.arange(diameter) - diameter // 2).astype(np.float32)
+    distance = np.sqrt(offsets[:, None] ** 2 + offsets[None, :] ** 2)
+    if outer_radius > inner_radius:
+        # 1 at inner_radius falling to 0 at outer_radius
+        alpha = np.clip((outer_radius - distance) / (outer_radius - inner_radius), 0, 1) * fade_alpha
+    else:
+        alpha = np.zeros_like(distance)
+    alpha[distance <= inner_radius] = inner_alpha
+    return alpha.astype(np.uint8)
+
+
+def alpha_surface(alpha, color):
+    """SRCALPHA surface of one colour with per-pixel alpha from a (width, height) array"""
+    surface = pygame.Surface(alpha.shape, pygame.SRCALPHA)
+    surface.fill(tuple(color) + (255,))
+    pixels = pygame.surfarray.pixels_alpha(surface)
+    pixels[:] = alpha
+    del pixels  # Unlock the surface
+    return surface
+
+
+class MazeTileCache:
+    """Pre-rendered maze chunks, blitted with the camera offset every frame.
+
+    The static maze is rasterized into square chunks of about ``chunk_pixels``
+    pixels the first time they come into view. Chunks live in an LRU cache of
+    at most ``max_chunks`` surfaces, so a huge maze only keeps the chunks
+    around the camera. Cells that change after generation (junctions being
+    visited) are patched in place with ``invalidate_cell``.
+    """
+
+    def __init__(self, grid, cell_size, chunk_pixels=256, max_chunks=64):
+        self.grid = grid
+        self.cell_size = cell_size
+        self.chunk_cells = max(4, chunk_pixels // cell_size)
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()
+        self.font = pygame.font.Font(None, max(16, cell_size // 2))
+        self.question = self.font.render("?", True, QUESTION_COLOR)
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop every cached chunk (maze contents moved or were replaced)"""
+        self.chunks.clear()
+
+    def cell_kinds(self, cells, x0, y0, visited):
+        kinds = np.where(cells & WALL, 1, np.where(cells & JUNCTION, 2, 0)).astype(np.uint8)
+        h, w = cells.shape
+        for x, y in visited:
+            if x0 <= x < x0 + w and y0 <= y < y0 + h and kinds[y - y0, x - x0] == 2:
+                kinds[y - y0, x - x0] = 3
+        return kinds
+
+    def render_chunk(self, chunk_x, chunk_y, visited):
+        """Rasterize one chunk: colour one pixel per cell, scale up, add '?' marks"""
+        size = self.chunk_cells
+        x0, y0 = chunk_x * size, chunk_y * size
+        cells = self.grid.cells[y0:y0 + size, x0:x0 + size]
+        kinds = self.cell_kinds(cells, x0, y0, visited)
+        h, w = kinds.shape
+
+        small = pygame.surfarray.make_surface(PALETTE[kinds].transpose(1, 0, 2))
+        surface = pygame.transform.scale(small, (w * self.cell_size, h * self.cell_size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
+        rows, cols = np.nonzero(kinds == 2)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            self.draw_question(surface, col, row)
+        return surface
+
+    def draw_question(self, surface, col, row):
+        center = (col * self.cell_size + self.cell_size // 2, row * self.cell_size + self.cell_size // 2)
+        surface.blit(self.question, self.question.get_rect(center=center))
+
+    def get_chunk(self, chunk_x, chunk_y, visited):
+        key = (chunk_x, chunk_y)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.render_chunk(chunk_x, chunk_y, visited)
+        self.chunks[key] = surface
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def invalidate_cell(self, x, y, visited):
+        """Repaint a single cell in its chunk if that chunk is cached"""
+        size = self.chunk_cells
+        surface = self.chunks.get((x // size, y // size))
+        if surface is None:
+            return
+        col, row = x % size, y % size
+        kind = self.cell_kinds(self.grid.cells[y:y + 1, x:x + 1], x, y, visited)[0, 0]
+        rect = (col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+        surface.fill(tuple(PALETTE[kind].tolist()), rect)
+        if kind == 2:
+            self.draw_question(surface, col, row)
+
+    def draw(self, target, camera_x, camera_y, view_width, view_height, visited):
+        """Blit every chunk overlapping the camera view onto target"""
+        chunk_px = self.chunk_cells * self.cell_size
+        first_x = max(0, int(camera_x) // chunk_px)
+        first_y = max(0, int(camera_y) // chunk_px)
+        last_x = min((self.grid.width - 1) // self.chunk_cells, int(camera_x + view_width) // chunk_px)
+        last_y = min((self.grid.height - 1) // self.chunk_cells, int(camera_y + view_height) // chunk_px)
+        # Never let the LRU evict chunks that are still on screen
+        self.max_chunks = max(self.max_chunks, 2 * (last_x - first_x + 1) * (last_y - first_y + 1))
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                surface = self.get_chunk(chunk_x, chunk_y, visited)
+                target.blit(surface, (chunk_x * chunk_px - camera_x, chunk_y * chunk_px - camera_y))
+
+
+class MinimapSurface:
+    """One pixel per maze cell minimap, recoloured only where something changed.
+
+    Callers report changes with ``mark_dirty`` (a cell rectangle whose
+    explored opacity or junction state changed) or ``mark_all_dirty``.
+    ``scaled`` flushes the dirty rectangle into the surface through surfarray
+    and returns the surface scaled to the requested size; the scaled copy is
+    reused until the next change, so an idle minimap costs a single blit.
+    """
+
+    WALL_BASE = (200, 200, 200)
+    PATH_BASE = (60, 60, 60)
+    JUNCTION_BASE = (120, 100, 140)  # Unvisited junction - bright purple
+    VISITED_JUNCTION_BASE = (80, 60, 100)  # Visited junction - purple
+
+    def __init__(self, grid, fog_color, unexplored_opacity, visible_opacity):
+        self.grid = grid
+        self.fog_color = fog_color
+        self.unexplored_opacity = unexplored_opacity
+        self.visible_opacity = visible_opacity
+        self.surface = pygame.Surface((grid.width, grid.height))
+        self.scaled_cache = {}
+        self.dirty = None
+        self.mark_all_dirty()
+
+    def mark_all_dirty(self):
+        self.dirty = (0, 0, self.grid.width, self.grid.height)
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """Flag cells x0 <= x < x1, y0 <= y < y1 for recolouring"""
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.grid.width, x1), min(self.grid.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.dirty:
+            dx0, dy0, dx1, dy1 = self.dirty
+            x0, y0, x1, y1 = min(x0, dx0), min(y0, dy0), max(x1, dx1), max(y1, dy1)
+        self.dirty = (x0, y0, x1, y1)
+
+    def colors(self, x0, y0, x1, y1, visited):
+        """RGB colours (rows x cols x 3) for a rectangle of cells"""
+        cells = self.grid.cells[y0:y1, x0:x1]
+        explored = self.grid.explored[y0:y1, x0:x1]
+        base = np.empty(cells.shape + (3,), dtype=np.float32)
+        base[:] = self.PATH_BASE
+        base[(cells & WALL) != 0] = self.WALL_BASE
+        base[(cells & JUNCTION) != 0] = self.JUNCTION_BASE
+        for x, y in visited:
+            if x0 <= x < x1 and y0 <= y < y1 and cells[y - y0, x - x0] & JUNCTION:
+                base[y - y0, x - x0] = self.VISITED_JUNCTION_BASE
+
+        # Dim by exploration opacity, unexplored tiles become fog
+        alpha_factor = explored.astype(np.float32) / self.visible_opacity
+        image = (base * alpha_factor[..., None]).astype(np.uint8)
+        image[explored <= self.unexplored_opacity] = self.fog_color
+        return image
+
+    def flush(self, visited):
+        if not self.dirty:
+            return
+        x0, y0, x1, y1 = self.dirty
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        pixels[x0:x1, y0:y1] = self.colors(x0, y0, x1, y1, visited).transpose(1, 0, 2)
+        del pixels  # Unlock the surface
+        self.dirty = None
+        self.scaled_cache.clear()
+
+    def scaled(self, size, visited):
+        self.flush(visited)
+        surface = self.scaled_cache.get(size)
+        if surface is None:
+            surface = pygame.transform.scale(self.surface, size)
+            self.scaled_cache[size] = surface
+        return surface
@@ -0,0 +1,336 @@
+import heapq
+import time
+from array import array
+from collections import deque
+import numpy as np
+from maze_grid import OPEN_LEFT, OPEN_RIGHT, OPEN_UP, OPEN_DOWN, OPEN_ANY, DEGREE, STEP_BITS
+
+# Solvers work on flat cell indices (y * width + x) over a bytes copy of the
+# grid, reading moves straight from the connectivity nibble, so they never
+# build tuple keys or dicts and are safe to run on a snapshot off the UI thread.
+
+
+class _Flat:
+    """Snapshot of a MazeGrid as flat bytes plus the index offsets of each move.
+
+    ``cells`` can be passed in instead (anything indexable by flat cell index
+    giving an int, e.g. a memoryview of memory-mapped cells) to skip the copy.
+    """
+
+    def __init__(self, grid, cells=None):
+        self.width = grid.width
+        self.height = grid.height
+        self.size = grid.width * grid.height
+        self.cells = grid.cells.tobytes() if cells is None else cells
+        w = self.width
+        self.moves = ((OPEN_LEFT, -1), (OPEN_RIGHT, 1), (OPEN_UP, -w), (OPEN_DOWN, w))
+
+    def index(self, pos):
+        return pos[1] * self.width + pos[0]
+
+    def pos(self, index):
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def neighbours(self, index):
+        cell = self.cells[index]
+        return [index + step for bit, step in self.moves if cell & bit]
+
+    def path(self, parents, goal):
+        """Walk parent links back from goal; returns positions from start to goal"""
+        path = []
+        index = goal
+        while index != -1:
+            path.append(self.pos(index))
+            index = parents[index]
+        path.reverse()
+        return path
+
+
+def _parents(size):
+    return array('i', [-1]) * size
+
+
+def astar(flat, start, goal):
+    """A* with a Manhattan heuristic (the algorithm the games always used)"""
+    w = flat.width
+    gx, gy = goal % w, goal // w
+    g_cost = array('i', [-1]) * flat.size
+    parents = _parents(flat.size)
+    g_cost[start] = 0
+    queue = [(0, start)]
+    expanded = 0
+    while queue:
+        _, current = heapq.heappop(queue)
+        expanded += 1
+        if current == goal:
+            return flat.path(parents, goal), expanded
+        new_g = g_cost[current] + 1
+        for n in flat.neighbours(current):
+            if g_cost[n] == -1 or new_g < g_cost[n]:
+                g_cost[n] = new_g
+                parents[n] = current
+                y, x = divmod(n, w)
+                heapq.heappush(queue, (new_g + abs(x - gx) + abs(y - gy), n))
+    return [], expanded
+
+
+def bfs(flat, start, goal):
+    """Breadth-first search; no heap, so it is the cheapest per node"""
+    parents = _parents(flat.size)
+    parents[start] = start
+    queue = deque([start])
+    expanded = 0
+    while queue:
+        current = queue.popleft()
+        expanded += 1
+        if current == goal:
+            parents[start] = -1
+            return flat.path(parents, goal), expanded
+        for n in flat.neighbours(current):
+            if parents[n] == -1:
+                parents[n] = current
+                queue.append(n)
+    return [], expanded
+
+
+def bidirectional_bfs(flat, start, goal):
+    """BFS from both ends one layer at a time, stopping where the frontiers meet"""
+    # Each side's root is its own parent, every other cell starts at -1
+    parents = (_parents(flat.size), _parents(flat.size))
+    parents[0][start] = start
+    parents[1][goal] = goal
+    frontiers = [[start], [goal]]
+    expanded = 0
+    meet = start if start == goal else -1
+    while frontiers[0] and frontiers[1] and meet == -1:
+        # Always grow the smaller frontier
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = parents[side], parents[1 - side]
+        layer = []
+        for current in frontiers[side]:
+            expanded += 1
+            for n in flat.neighbours(current):
+                if own[n] != -1:
+                    continue
+                own[n] = current
+                if other[n] != -1:
+                    meet = n
+                    break
+                layer.append(n)
+            if meet != -1:
+                break
+        frontiers[side] = layer
+    if meet == -1:
+        return [], expanded
+
+    # Stitch start -> meet from the forward links and meet -> goal from the backward ones
+    path = []
+    for side in (0, 1):
+        links = parents[side]
+        half = []
+        index = meet
+        while True:
+            half.append(flat.pos(index))
+            if links[index] == index:
+                break
+            index = links[index]
+        path = half[::-1] if side == 0 else path + half[1:]
+    return path, expanded
+
+
+def dead_end_filling(flat, start, goal):
+    """Fill every dead end (except start and goal) until only the route is left"""
+    degree = bytearray(flat.cells.translate(DEGREE.tobytes()))
+    filled = bytearray(flat.size)
+    keep = (start, goal)
+    stack = [i for i, d in enumerate(degree) if d == 1 and i not in keep]
+    expanded = 0
+    while stack:
+        index = stack.pop()
+        if filled[index]:
+            continue
+        filled[index] = 1
+        expanded += 1
+        for n in flat.neighbours(index):
+            if filled[n]:
+                continue
+            degree[n] -= 1
+            if degree[n] == 1 and n not in keep:
+                stack.append(n)
+
+    # What is left is the solution (plus any loops); walk it with BFS
+    parents = _parents(flat.size)
+    parents[start] = start
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            parents[start] = -1
+            return flat.path(parents, goal), expanded
+        for n in flat.neighbours(current):
+            if not filled[n] and parents[n] == -1:
+                parents[n] = current
+                queue.append(n)
+    return [], expanded
+
+
+def wall_follower(flat, start, goal):
+    """Left-hand rule; the walked trace is reduced to a path by cancelling backtracks"""
+    moves = flat.moves
+    # Headings in clockwise order: up, right, down, left
+    order = (2, 1, 3, 0)
+    heading = 0
+    current = start
+    trail = [start]
+    on_trail = {start}
+    expanded = 0
+    limit = 4 * flat.size
+    while current != goal and expanded < limit:
+        expanded += 1
+        cell = flat.cells[current]
+        if not cell & OPEN_ANY:
+            return [], expanded
+        # Try left, straight, right, back relative to the heading
+        for turn in (-1, 0, 1, 2):
+            h = (heading + turn) % 4
+            bit, step = moves[order[h]]
+            if cell & bit:
+                heading = h
+                current += step
+                break
+        if current in on_trail:
+            while trail[-1] != current:
+                on_trail.discard(trail.pop())
+        else:
+            trail.append(current)
+            on_trail.add(current)
+    if current != goal:
+        return [], expanded
+    return [flat.pos(i) for i in trail], expanded
+
+
+class DistanceField:
+    """BFS distance from one goal cell to every cell of a maze.
+
+    Built once per maze, it answers "which way to the exit" and "how far" in
+    O(1) from any cell, and gives the shortest path from anywhere by simply
+    walking downhill. ``distances`` is a ``(height, width)`` int32 array with
+    -1 for walls and unreachable cells. ``cells`` is passed on to ``_Flat``.
+    """
+
+    def __init__(self, grid, goal, distances=None, cells=None):
+        self.goal = goal
+        self.width = grid.width
+        self.height = grid.height
+        flat = _Flat(grid, cells)
+        self.cells = flat.cells
+        if distances is None:
+            distances = self.bfs(flat, flat.index(goal))
+        # Scalar queries read the flat array (much faster than NumPy scalar indexing)
+        self.flat_distances = distances
+        self.distances = np.frombuffer(distances, dtype=np.int32).reshape(self.height, self.width)
+
+    @classmethod
+    def from_buffer(cls, grid, goal, data):
+        """Rebuild a field from ``flat_distances.tobytes()`` (e.g. sent by a worker process)"""
+        distances = array('i')
+        distances.frombytes(data)
+        return cls(grid, goal, distances)
+
+    @staticmethod
+    def bfs(flat, start):
+        dist = array('i', [-1]) * flat.size
+        moves = flat.moves
+        cells = flat.cells
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            cell = cells[current]
+            d = dist[current] + 1
+            for bit, step in moves:
+                if cell & bit and dist[current + step] == -1:
+                    dist[current + step] = d
+                    queue.append(current + step)
+        return dist
+
+    def distance(self, x, y):
+        """Steps from (x, y) to the goal, -1 for walls, unreachable or out of bounds"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        return self.flat_distances[y * self.width + x]
+
+    def next_step(self, x, y):
+        """Neighbour of (x, y) one step closer to the goal, or None (at the goal or stuck)"""
+        d = self.distance(x, y)
+        if d <= 0:
+            return None
+        index = y * self.width + x
+        cell = self.cells[index]
+        for (dx, dy), bit in STEP_BITS.items():
+            if cell & bit and self.flat_distances[index + dy * self.width + dx] == d - 1:
+                return x + dx, y + dy
+        return None
+
+    def path_from(self, x, y):
+        """Shortest path from (x, y) to the goal (empty if unreachable)"""
+        if self.distance(x, y) < 0:
+            return []
+        path = [(x, y)]
+        step = self.next_step(x, y)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(*step)
+        return path
+
+    def progress(self, x, y, start):
+        """Fraction (0-1) of the way from start to the goal that (x, y) has covered"""
+        total = self.distance(*start)
+        d = self.distance(x, y)
+        if total <= 0 or d < 0:
+            return 0.0
+        return max(0.0, 1 - d / total)
+
+
+SOLVERS = {
+    "astar": astar,
+    "bfs": bfs,
+    "bidirectional": bidirectional_bfs,
+    "dead_end": dead_end_filling,
+    "wall_follower": wall_follower,
+}
+
+DEFAULT_SOLVER = "astar"
+
+# Above this many cells the wall follower beats the searches on the games'
+# perfect mazes; below it bidirectional BFS is fastest and expands the fewest nodes
+WALL_FOLLOWER_MIN_CELLS = 201 * 201
+
+
+def pick_solver(grid):
+    """Fastest solver for a perfect maze of this size (measured with maze_bench)"""
+    if grid.width * grid.height > WALL_FOLLOWER_MIN_CELLS:
+        return "wall_follower"
+    return "bidirectional"
+
+
+def solve(grid, start, goal, method=DEFAULT_SOLVER):
+    """Solve a MazeGrid between two (x, y) cells.
+
+    Returns a dict with the path (list of (x, y) from start to goal, empty if
+    unreachable), ``nodes_expanded``, ``time_ms``, ``path_length`` and the
+    ``solver`` name, so callers can compare solvers on the same maze.
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"Unknown solver '{method}', choose from {', '.join(SOLVERS)}")
+    began = time.perf_counter()
+    flat = _Flat(grid)
+    path, expanded = SOLVERS[method](flat, flat.index(start), flat.index(goal))
+    return {
+        "solver": method,
+        "path": path,
+        "path_length": len(path),
+        "nodes_expanded": expanded,
+        "time_ms": (time.perf_counter() - began) * 1000,
+    }
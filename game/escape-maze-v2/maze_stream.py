@@ -0,0 +1,60 @@
+import random
+import numpy as np
+from maze_generators import EllerRows, odd_size
+from maze_grid import MazeGrid
+
+
+class StreamingMaze(MazeGrid):
+    """Endless maze that only keeps a fixed-height window of rows in memory.
+
+    Rows come from Eller's algorithm two at a time as the player heads down.
+    When the player gets more than ``behind_rows`` into the window, the rows
+    above are dropped and the same number of fresh rows is appended at the
+    bottom, so memory stays at ``width * window_rows`` whatever the depth.
+    Window row 0 is always absolute row ``rows_dropped``.
+    """
+
+    def __init__(self, width, window_rows, seed=None, unexplored_opacity=0, behind_rows=None):
+        width, window_rows = odd_size(width, window_rows)
+        super().__init__(width, window_rows, unexplored_opacity)
+        self.seed = seed
+        self.unexplored_opacity = unexplored_opacity
+        self.behind_rows = behind_rows if behind_rows is not None else window_rows // 3
+        self.rows_dropped = 0
+        self.rows = EllerRows(width, random.Random(seed))
+
+        # Row 0 is the outer wall, then cell rows and the wall rows below them
+        for y in range(1, window_rows - 1, 2):
+            self._fill_rows(y)
+        self.carve(1, 1)
+        self.build_connectivity()
+
+    def _fill_rows(self, y):
+        cell_row, below_row = self.rows.next_rows()
+        self.cells[y] = np.frombuffer(cell_row, dtype=np.uint8)
+        self.cells[y + 1] = np.frombuffer(below_row, dtype=np.uint8)
+        self.explored[y:y + 2] = self.unexplored_opacity
+
+    def scroll_for(self, row):
+        """Keep ``row`` (window coordinates) about behind_rows from the top.
+
+        Returns how many rows were dropped so callers can shift anything they
+        store in window coordinates (player, camera, visited junctions).
+        """
+        shift = row - self.behind_rows
+        shift -= shift % 2  # Keep cell rows on odd indices
+        if shift <= 0:
+            return 0
+        shift = min(shift, self.height - 1 - (self.height - 1) % 2)
+
+        # Slide the window up in place so views such as explored_map stay valid
+        self.cells[:-shift] = self.cells[shift:]
+        self.explored[:-shift] = self.explored[shift:]
+        for y in range(self.height - shift, self.height - 1, 2):
+            self._fill_rows(y)
+        self.rows_dropped += shift
+        self.build_connectivity()
+        return shift
+
+    def absolute_row(self, row):
+        return self.rows_dropped + row